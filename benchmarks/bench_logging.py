@@ -0,0 +1,67 @@
+"""
+Measure the per-call overhead of logging in the production profile.
+
+Run from the repository root:
+
+    uv run python benchmarks/bench_logging.py
+
+Logging is configured into a temporary directory with the production
+profile, so the ring-buffer sink is active. By default it captures INFO and
+above, so debug calls return before a record is built. To measure DEBUG
+capture for a module, set e.g.
+
+    PROMPT_CLIPBOARD__LOGGING__RING_BUFFER_MODULE_LEVELS='{"__main__": "DEBUG"}'
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+LOG_DIR = tempfile.mkdtemp(prefix="prompt-clipboard-bench-")
+os.environ["PROMPT_CLIPBOARD__LOGGING__DIR"] = LOG_DIR
+os.environ.setdefault("PROMPT_CLIPBOARD__LOGGING__PROFILE", "production")
+os.environ.setdefault("PROMPT_CLIPBOARD__LOGGING__LEVEL", "WARNING")
+
+from prompt_clipboard.config.logging import logger  # noqa: E402
+
+CALLS = 20_000
+PRESSED = {f"Key.key{i}" for i in range(4)}
+KEY = "Key.ctrl_l"
+
+
+def eager_fstring():
+    logger.debug(f"Pressed: {KEY}, Modifiers: {PRESSED}")
+
+
+def structured():
+    logger.debug("Key pressed", key=KEY, pressed=PRESSED)
+
+
+def lazy():
+    logger.opt(lazy=True).debug(
+        "Key pressed", key=lambda: KEY, pressed=lambda: sorted(PRESSED)
+    )
+
+
+def suppressed():
+    logger.trace("Key pressed", key=KEY)
+
+
+def main():
+    cases = {
+        "debug f-string": eager_fstring,
+        "debug structured": structured,
+        "debug lazy": lazy,
+        "below all sinks": suppressed,
+    }
+    print(f"profile={os.environ['PROMPT_CLIPBOARD__LOGGING__PROFILE']} calls={CALLS}")
+    for name, func in cases.items():
+        best = min(timeit.repeat(func, number=CALLS, repeat=5))
+        print(f"{name:<20} {best / CALLS * 1e6:8.2f} us/call")
+    logger.complete()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+"""
+Replay typing sessions against a headless overlay and measure latency.
+
+Run from the repository root:
+
+    uv run python benchmarks/overlay_latency.py
+    uv run python benchmarks/overlay_latency.py --prompts 50000 --sessions 40
+    uv run python benchmarks/overlay_latency.py --db ~/prompts.db --replay sessions.json
+
+The overlay runs under the offscreen Qt platform against a generated library
+(or a copy of --db, which is never modified). Each session opens the overlay
+as the hotkey does, then replays events through real key presses:
+
+    {"type": "open"}                   show the overlay and list all prompts
+    {"type": "text", "text": "sum"}    edit the search box until it holds text
+    {"type": "key", "key": "Down"}     Down, Up, Space or Return in focus
+
+Latency is measured from the first key press of an event until the list shows
+the results of the newest search (text edits and open) or the key handler
+returns. Percentiles are reported per event kind and checked against p95
+budgets; the exit code is 1 if any budget is exceeded.
+
+--replay reads a JSON list of {"name": ..., "events": [...]} sessions;
+--save writes the generated sessions in the same format for later replays.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+WORK_DIR = Path(tempfile.mkdtemp(prefix="prompt-clipboard-latency-"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# pynput needs a display at import time; the hotkey listener is not used here
+os.environ.setdefault("PYNPUT_BACKEND", "dummy")
+os.environ["PROMPT_CLIPBOARD__LOGGING__DIR"] = str(WORK_DIR / "logs")
+os.environ["PROMPT_CLIPBOARD__APP__SETTINGS_FILE"] = str(WORK_DIR / "settings.json")
+os.environ.setdefault("PROMPT_CLIPBOARD__LOGGING__LEVEL", "WARNING")
+os.environ.setdefault("PROMPT_CLIPBOARD__LOGGING__FILE_LEVEL", "WARNING")
+
+from PySide6.QtCore import QEventLoop, Qt, QTimer  # noqa: E402
+from PySide6.QtTest import QTest  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+from sqlmodel import Session  # noqa: E402
+
+from prompt_clipboard import main as overlay_module  # noqa: E402
+from prompt_clipboard.database import (  # noqa: E402
+    DatabaseManager,
+    Prompt,
+    PromptRelation,
+)
+from prompt_clipboard.db_executor import DatabaseExecutor  # noqa: E402
+from prompt_clipboard.settings_store import SettingsStore  # noqa: E402
+
+# p95 budgets in milliseconds; a frame at 60 Hz is ~16 ms
+BUDGETS = {"open": 100.0, "text": 50.0, "key": 16.0, "enter": 50.0}
+PERCENTILES = (50, 90, 95, 99)
+# Longest wait for a search result before the event is reported as timed out
+EVENT_TIMEOUT = 10.0
+
+KEYS = {
+    "Down": Qt.Key.Key_Down,
+    "Up": Qt.Key.Key_Up,
+    "Space": Qt.Key.Key_Space,
+    "Return": Qt.Key.Key_Return,
+}
+
+COMMON_WORDS = (
+    "the a of to and in for with on as by from into about write summarize "
+    "explain review translate list draft rewrite code text email report notes "
+    "python function test bug error data table query user customer product "
+    "meeting plan summary steps example short detailed formal friendly"
+).split()
+
+
+def generate_library(path: Path, count: int, rng: random.Random):
+    """Create a library of count prompts with Zipf-like usage and relations."""
+    syllables = ["ka", "lo", "mi", "ra", "te", "su", "no", "vi", "de", "po", "an"]
+    rare_words = list(
+        {
+            "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+            for _ in range(4000)
+        }
+    )
+    db_manager = DatabaseManager(str(path))
+    ids = []
+    with Session(db_manager.engine) as session:
+        for rank in range(count):
+            words = [
+                rng.choice(COMMON_WORDS if rng.random() < 0.6 else rare_words)
+                for _ in range(rng.randint(5, 80))
+            ]
+            pid = str(uuid.uuid4())
+            ids.append(pid)
+            session.add(
+                Prompt(
+                    id=pid,
+                    body=" ".join(words).capitalize(),
+                    usage_count=int(1000 / (rank + 1) ** 0.8) if rank % 3 else 0,
+                )
+            )
+        for _ in range(count // 5):
+            id1, id2 = sorted(rng.sample(ids, 2))
+            session.add(
+                PromptRelation(
+                    prompt_id_1=id1, prompt_id_2=id2, strength=rng.randint(1, 20)
+                )
+            )
+        session.commit()
+    db_manager.engine.dispose()
+
+
+def generate_sessions(db_manager, count: int, rng: random.Random) -> list[dict]:
+    """Typing sessions searching for words taken from random prompts."""
+    bodies = [body for _, body in db_manager.get_prompt_bodies()]
+    sessions = []
+    for number in range(count):
+        words = rng.choice(bodies).lower().split()
+        start = rng.randrange(len(words))
+        query = " ".join(words[start : start + rng.randint(1, 3)])
+        events = [{"type": "open"}]
+        typed = ""
+        for char in query:
+            typed += char
+            events.append({"type": "text", "text": typed})
+            if rng.random() < 0.05 and len(typed) > 1:  # Typo and correction
+                events.append({"type": "text", "text": typed + "x"})
+                events.append({"type": "text", "text": typed})
+        events.append({"type": "key", "key": "Down"})
+        for _ in range(rng.randint(0, 3)):
+            for _ in range(rng.randint(1, 4)):
+                events.append({"type": "key", "key": "Down"})
+            events.append({"type": "key", "key": "Space"})
+        if rng.random() < 0.3:
+            events.append({"type": "key", "key": "Up"})
+        events.append({"type": "key", "key": "Return"})
+        sessions.append({"name": f"session-{number}", "events": events})
+    return sessions
+
+
+class _AcceptingFillDialog(overlay_module.TemplateFillDialog):
+    """Template variable dialog that accepts its defaults without blocking."""
+
+    def exec(self):
+        return True
+
+
+class Replayer:
+    """Drives an Overlay with key presses and times each event."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.app = QApplication.instance() or QApplication([])
+        overlay_module.TemplateFillDialog = _AcceptingFillDialog
+        self.db_executor = DatabaseExecutor(db_manager)
+        self.db_executor.start()
+        self.overlay = overlay_module.Overlay(
+            db_manager, None, SettingsStore(db_manager), self.db_executor
+        )
+        self._shown_seq = 0
+        # Waits without spinning, so the database thread gets the CPU
+        self._loop = QEventLoop()
+        self._timeout = QTimer()
+        self._timeout.setSingleShot(True)
+        self._timeout.timeout.connect(self._loop.quit)
+        show_results = self.overlay._show_results
+
+        def timed_show_results(seq, text, results):
+            show_results(seq, text, results)
+            self._shown_seq = max(self._shown_seq, seq)
+            if self._shown_seq >= self.overlay._search_seq:
+                self._loop.quit()
+
+        # Search callbacks look the method up on the instance when bound
+        self.overlay._show_results = timed_show_results
+        self.latencies = {kind: [] for kind in BUDGETS}
+        self.timeouts = 0
+
+    def wait_for_indexes(self):
+        """Let the background search indexes finish before measuring."""
+        deadline = time.perf_counter() + 120
+        while not (self.overlay.similarity.ready and self.overlay.completions.ready):
+            if time.perf_counter() > deadline:
+                break
+            time.sleep(0.05)
+
+    def _wait_for_results(self) -> bool:
+        if self._shown_seq < self.overlay._search_seq:
+            self._timeout.start(int(EVENT_TIMEOUT * 1000))
+            self._loop.exec()
+            self._timeout.stop()
+        return self._shown_seq >= self.overlay._search_seq
+
+    def _open(self):
+        self.overlay.present()
+
+    def _edit_text(self, text: str):
+        search = self.overlay.search
+        search.setFocus()
+        current = search.text()
+        common = 0
+        while common < min(len(current), len(text)) and current[common] == text[common]:
+            common += 1
+        for _ in range(len(current) - common):
+            QTest.keyClick(search, Qt.Key.Key_Backspace)
+        if text[common:]:
+            QTest.keyClicks(search, text[common:])
+
+    def _press(self, name: str):
+        if name == "Down" and self.overlay.search.hasFocus():
+            self.overlay.completer.popup().hide()
+        widget = self.app.focusWidget() or self.overlay.search
+        QTest.keyClick(widget, KEYS[name])
+
+    def run_event(self, event: dict):
+        kind = event["type"]
+        started = time.perf_counter()
+        if kind == "open":
+            self._open()
+        elif kind == "text":
+            self._edit_text(event["text"])
+        elif kind == "key":
+            self._press(event["key"])
+            if event["key"] == "Return":
+                kind = "enter"
+        else:
+            raise ValueError(f"Unknown event type: {kind}")
+
+        if kind in ("open", "text") and not self._wait_for_results():
+            self.timeouts += 1
+            return
+        self.latencies[kind].append((time.perf_counter() - started) * 1000)
+
+    def replay(self, sessions: list[dict]):
+        for session in sessions:
+            for event in session["events"]:
+                self.run_event(event)
+            self.overlay.hide()
+            self.app.processEvents()
+
+    def close(self):
+        self.db_executor.stop()
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    rank = max(
+        0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1)
+    )
+    return sorted_values[rank]
+
+
+def report(latencies: dict, budgets: dict, timeouts: int) -> bool:
+    header = f"{'event':<7} {'count':>6}" + "".join(
+        f" {f'p{pct}':>8}" for pct in PERCENTILES
+    )
+    print(header + f" {'max':>8} {'budget':>10}  result")
+    passed = timeouts == 0
+    for kind, values in latencies.items():
+        if not values:
+            continue
+        values = sorted(values)
+        p95 = percentile(values, 95)
+        ok = p95 <= budgets[kind]
+        passed = passed and ok
+        print(
+            f"{kind:<7} {len(values):>6}"
+            + "".join(f" {percentile(values, pct):>8.2f}" for pct in PERCENTILES)
+            + f" {values[-1]:>8.2f} {budgets[kind]:>7.1f} ms  {'PASS' if ok else 'FAIL'}"
+        )
+    if timeouts:
+        print(f"{timeouts} event(s) timed out after {EVENT_TIMEOUT:.0f} s")
+    print("PASS" if passed else "FAIL")
+    return passed
+
+
+def parse_budget(text: str) -> tuple[str, float]:
+    kind, _, value = text.partition("=")
+    if kind not in BUDGETS:
+        raise argparse.ArgumentTypeError(f"unknown event kind: {kind}")
+    return kind, float(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--prompts", type=int, default=20_000)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--db", type=Path, help="library to copy instead of generating")
+    parser.add_argument("--replay", type=Path, help="JSON sessions to replay")
+    parser.add_argument("--save", type=Path, help="write the replayed sessions here")
+    parser.add_argument(
+        "--budget",
+        type=parse_budget,
+        action="append",
+        default=[],
+        metavar="KIND=MS",
+        help="p95 budget override, e.g. text=30 (kinds: open, text, key, enter)",
+    )
+    args = parser.parse_args()
+    budgets = {**BUDGETS, **dict(args.budget)}
+    rng = random.Random(args.seed)
+
+    db_path = WORK_DIR / "prompts.db"
+    started = time.perf_counter()
+    if args.db:
+        shutil.copyfile(args.db, db_path)
+    else:
+        generate_library(db_path, args.prompts, rng)
+    db_manager = DatabaseManager(str(db_path))
+
+    if args.replay:
+        sessions = json.loads(args.replay.read_text(encoding="utf-8"))
+    else:
+        sessions = generate_sessions(db_manager, args.sessions, rng)
+    if args.save:
+        args.save.write_text(json.dumps(sessions, indent=1), encoding="utf-8")
+
+    replayer = Replayer(db_manager)
+    replayer.wait_for_indexes()
+    print(
+        f"library={len(db_manager.get_prompt_bodies())} prompts "
+        f"sessions={len(sessions)} "
+        f"events={sum(len(s['events']) for s in sessions)} "
+        f"setup={time.perf_counter() - started:.1f}s"
+    )
+    try:
+        replayer.replay(sessions)
+    finally:
+        replayer.close()
+    passed = report(replayer.latencies, budgets, replayer.timeouts)
+    shutil.rmtree(WORK_DIR, ignore_errors=True)
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
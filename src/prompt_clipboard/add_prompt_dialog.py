@@ -15,6 +15,7 @@ class AddPromptDialog(QDialog):
     def __init__(self, db_manager: DatabaseManager, parent=None):
         super().__init__(parent)
         self.db_manager = db_manager
+        self.prompt_id = None
         self._setup_ui()
 
     def _setup_ui(self):
@@ -38,8 +39,12 @@ class AddPromptDialog(QDialog):
         body = self.body_edit.toPlainText().strip()
         if body:
             try:
-                self.db_manager.add_prompt(body)
-                logger.debug("Prompt added via dialog", body_length=len(body))
+                self.prompt_id = self.db_manager.add_prompt(body)
+                logger.debug(
+                    "Prompt added via dialog",
+                    prompt_id=self.prompt_id,
+                    body_length=len(body),
+                )
                 self.accept()
             except Exception as e:
                 logger.error("Failed to add prompt via dialog", error=str(e))
@@ -0,0 +1,153 @@
+"""
+Online database backups using the SQLite backup API.
+
+Snapshots are copied a few pages at a time from a background thread, so the
+live database stays usable while a backup runs. Each snapshot is gzip
+compressed into the backup directory and only the newest ones are kept.
+"""
+
+import contextlib
+import gzip
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from prompt_clipboard.config import settings
+from prompt_clipboard.config.logging import logger
+from prompt_clipboard.database import DatabaseManager
+from prompt_clipboard.db_executor import DatabaseExecutor
+
+SNAPSHOT_PREFIX = "prompt_clip-"
+SNAPSHOT_SUFFIX = ".db.gz"
+
+
+def list_snapshots(backup_dir: Path) -> list[Path]:
+    """Get snapshots in the backup directory, newest first."""
+    return sorted(
+        backup_dir.glob(f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}"),
+        key=lambda p: p.name,
+        reverse=True,
+    )
+
+
+def _copy_database(source: Path, destination: Path, pages: int, sleep: float):
+    """Copy a live database with the online backup API in small steps."""
+    src = sqlite3.connect(source)
+    dst = sqlite3.connect(destination)
+    try:
+        src.backup(dst, pages=pages, sleep=sleep)
+    finally:
+        dst.close()
+        src.close()
+
+
+def create_snapshot(db_path: Path, backup_dir: Path, keep: int) -> Path:
+    """Write a compressed snapshot of db_path and rotate old snapshots."""
+    started = time.perf_counter()
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    snapshot = backup_dir / f"{SNAPSHOT_PREFIX}{timestamp}{SNAPSHOT_SUFFIX}"
+
+    # Created on first use rather than when settings are loaded
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=backup_dir) as tmp_dir:
+        tmp_db = Path(tmp_dir) / "snapshot.db"
+        _copy_database(
+            db_path,
+            tmp_db,
+            settings.backup.pages_per_step,
+            settings.backup.step_sleep,
+        )
+        partial = snapshot.with_name(snapshot.name + ".part")
+        with open(tmp_db, "rb") as f_in, gzip.open(partial, "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        partial.replace(snapshot)
+
+    for old in list_snapshots(backup_dir)[keep:]:
+        old.unlink(missing_ok=True)
+
+    logger.info(
+        "Backup created",
+        snapshot=str(snapshot),
+        size=snapshot.stat().st_size,
+        duration_ms=round((time.perf_counter() - started) * 1000),
+    )
+    return snapshot
+
+
+def restore_snapshot(
+    db_manager: DatabaseManager,
+    snapshot: Path,
+    db_executor: DatabaseExecutor | None = None,
+):
+    """Replace the live database contents with a snapshot.
+
+    Database work queued on db_executor is held back while the file is
+    replaced. The restored database journals under a new node id, since
+    peers have already seen the clocks it goes back to.
+    """
+    with tempfile.TemporaryDirectory(dir=snapshot.parent) as tmp_dir:
+        tmp_db = Path(tmp_dir) / "restore.db"
+        with gzip.open(snapshot, "rb") as f_in, open(tmp_db, "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out)
+
+        paused = db_executor.paused() if db_executor else contextlib.nullcontext()
+        with paused, db_manager._write_lock:
+            clock = db_manager.clock
+            # Release pooled connections before overwriting pages underneath them
+            db_manager.engine.dispose()
+            _copy_database(tmp_db, Path(db_manager.db_path), pages=-1, sleep=0)
+            db_manager.start_new_node(clock)
+            db_manager.reset_caches()
+
+    logger.info("Backup restored", snapshot=str(snapshot))
+
+
+class BackupScheduler:
+    """Background thread that takes a snapshot every interval."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.backup_dir = settings.backup.dir
+        self.interval = settings.backup.interval_hours * 3600
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _seconds_until_due(self) -> float:
+        snapshots = list_snapshots(self.backup_dir)
+        if not snapshots:
+            return 0
+        age = time.time() - snapshots[0].stat().st_mtime
+        return max(0.0, self.interval - age)
+
+    def _run(self):
+        while not self._stop.wait(self._seconds_until_due()):
+            try:
+                create_snapshot(self.db_path, self.backup_dir, settings.backup.keep)
+            except Exception as e:
+                logger.error("Scheduled backup failed", error=str(e))
+                # Avoid a tight retry loop on persistent failures
+                if self._stop.wait(self.interval):
+                    break
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="backup-scheduler", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            "Backup scheduler started",
+            backup_dir=str(self.backup_dir),
+            interval_hours=settings.backup.interval_hours,
+        )
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
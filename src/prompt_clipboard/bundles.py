@@ -0,0 +1,222 @@
+"""
+Frequent prompt bundles mined from the multi-select copy history.
+
+Every multi-prompt copy from the overlay is stored in SelectionHistory in
+selection order. The history is kept in memory as distinct selections with
+counts, and FP-growth finds sets of prompts copied together at least
+min_support times. A bundle is offered in the order its prompts were most
+often selected in.
+
+Only history rows newer than the last one seen are loaded on refresh. Mining
+then reruns over the compact counts, which stay small because the same
+combinations are copied again and again.
+"""
+
+import threading
+from collections import Counter
+
+from prompt_clipboard.change_queue import ChangeQueue
+from prompt_clipboard.config.logging import logger
+from prompt_clipboard.database import DatabaseManager
+
+# Longer selections (e.g. Ctrl+A over a search) are not treated as bundles
+MAX_SELECTION_SIZE = 10
+# Largest itemset FP-growth expands, bounding its cost per selection
+MAX_BUNDLE_SIZE = 6
+
+
+class _Node:
+    """FP-tree node: an item with the weight of the paths through it."""
+
+    __slots__ = ("item", "count", "parent", "children")
+
+    def __init__(self, item, parent):
+        self.item = item
+        self.count = 0
+        self.parent = parent
+        self.children = {}
+
+
+def _build_tree(transactions, min_support: int):
+    """Build an FP-tree of weighted transactions.
+
+    Returns the support of each frequent item and the tree nodes per item.
+    """
+    counts = Counter()
+    for items, count in transactions:
+        for item in items:
+            counts[item] += count
+    frequent = {item: n for item, n in counts.items() if n >= min_support}
+    root = _Node(None, None)
+    nodes = {}  # {item: [nodes]}, the header table
+    for items, count in transactions:
+        # Shared prefixes of frequent-first paths keep the tree small
+        path = sorted(
+            (item for item in items if item in frequent),
+            key=lambda item: (-frequent[item], item),
+        )
+        node = root
+        for item in path:
+            child = node.children.get(item)
+            if child is None:
+                child = node.children[item] = _Node(item, node)
+                nodes.setdefault(item, []).append(child)
+            child.count += count
+            node = child
+    return frequent, nodes
+
+
+def fp_growth(
+    transactions, min_support: int, max_size: int = MAX_BUNDLE_SIZE
+) -> dict[frozenset, int]:
+    """Find itemsets contained in at least min_support transactions.
+
+    transactions is an iterable of (items, count). Returns {itemset: support}
+    for itemsets of up to max_size items.
+    """
+    itemsets = {}
+
+    def mine(transactions, suffix: frozenset):
+        frequent, nodes = _build_tree(transactions, min_support)
+        for item, support in frequent.items():
+            itemset = suffix | {item}
+            itemsets[itemset] = support
+            if len(itemset) >= max_size:
+                continue
+            # Conditional pattern base: the prefix paths leading to item
+            base = []
+            for node in nodes[item]:
+                path = []
+                parent = node.parent
+                while parent.item is not None:
+                    path.append(parent.item)
+                    parent = parent.parent
+                if path:
+                    base.append((path, node.count))
+            if base:
+                mine(base, itemset)
+
+    mine(list(transactions), frozenset())
+    return itemsets
+
+
+class Bundle:
+    """Prompts often copied together, in their usual selection order."""
+
+    __slots__ = ("prompt_ids", "support")
+
+    def __init__(self, prompt_ids: tuple[str, ...], support: int):
+        self.prompt_ids = prompt_ids
+        self.support = support
+
+
+class BundleMiner:
+    """Top prompt bundles, refreshed incrementally from the selection history."""
+
+    def __init__(
+        self, db_manager: DatabaseManager, min_support: int = 3, limit: int = 3
+    ):
+        self.db_manager = db_manager
+        self.min_support = min_support
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._selections = Counter()  # {ordered prompt ids: times copied}
+        self._last_id = 0  # Newest SelectionHistory row folded in
+        self._bundles = []
+        self._changes = ChangeQueue("bundle-changes", self._apply_changes)
+        db_manager.add_listener(self._changes.put)
+
+    def configure(self, min_support: int, limit: int):
+        """Change the mining thresholds and re-mine the loaded history."""
+        with self._lock:
+            self.min_support = min_support
+            self.limit = limit
+            self._mine()
+
+    def start(self):
+        """Load the history and mine it on a background thread."""
+        threading.Thread(target=self.refresh, name="bundle-miner", daemon=True).start()
+
+    def record(self, prompt_ids: list[str]):
+        """Store a multi-prompt copy and refresh the bundles."""
+        if not 2 <= len(prompt_ids) <= MAX_SELECTION_SIZE:
+            return
+        self.db_manager.record_selection(prompt_ids)
+        self.refresh()
+
+    def refresh(self):
+        try:
+            with self._lock:
+                rows = self.db_manager.get_selection_history(self._last_id)
+                for row_id, prompt_ids in rows:
+                    self._last_id = row_id
+                    prompt_ids = tuple(dict.fromkeys(prompt_ids))
+                    if 2 <= len(prompt_ids) <= MAX_SELECTION_SIZE:
+                        self._selections[prompt_ids] += 1
+                if rows:
+                    self._mine()
+        except Exception as e:
+            logger.error("Failed to refresh prompt bundles", error=str(e))
+
+    def _mine(self):
+        itemsets = fp_growth(
+            ((set(ids), count) for ids, count in self._selections.items()),
+            self.min_support,
+        )
+        items = {item for itemset in itemsets for item in itemset}
+        # Keep closed itemsets: a subset copied exactly as often adds nothing.
+        # Support only falls as items are added, so one more item is enough.
+        closed = [
+            (itemset, support)
+            for itemset, support in itemsets.items()
+            if len(itemset) > 1
+            and not any(
+                itemsets.get(itemset | {item}) == support for item in items - itemset
+            )
+        ]
+        # Rank by selections saved: each copy of n prompts spares n - 1 picks
+        closed.sort(
+            key=lambda pair: (pair[1] * (len(pair[0]) - 1), len(pair[0])),
+            reverse=True,
+        )
+        self._bundles = [
+            Bundle(self._usual_order(itemset), support)
+            for itemset, support in closed[: self.limit]
+        ]
+        logger.debug(
+            "Prompt bundles mined",
+            selections_count=len(self._selections),
+            itemsets_count=len(itemsets),
+            bundles_count=len(self._bundles),
+        )
+
+    def _usual_order(self, itemset: frozenset) -> tuple[str, ...]:
+        """Get the most frequent selection order of the itemset's prompts."""
+        orders = Counter()
+        for ids, count in self._selections.items():
+            if itemset.issubset(ids):
+                orders[tuple(pid for pid in ids if pid in itemset)] += count
+        return orders.most_common(1)[0][0]
+
+    def top(self) -> list[Bundle]:
+        return self._bundles
+
+    def _apply_changes(self, changes):
+        """Drop deleted prompts and re-mine once; runs on the change queue."""
+        deleted = {pid for event, pid in changes if event == "deleted"}
+        if deleted:
+            with self._lock:
+                if any(pid in deleted for ids in self._selections for pid in ids):
+                    selections = Counter()
+                    for ids, count in self._selections.items():
+                        remaining = tuple(pid for pid in ids if pid not in deleted)
+                        if len(remaining) > 1:
+                            selections[remaining] += count
+                    self._selections = selections
+                    self._mine()
+        if any(event == "reset" for event, _ in changes):
+            with self._lock:
+                self._selections.clear()
+                self._last_id = 0
+                self._bundles = []
+            self.start()
@@ -0,0 +1,47 @@
+"""
+Hand-off of prompt change notifications to a consumer's own thread.
+
+DatabaseManager calls its listeners on the thread that wrote, while holding
+up that writer. Indexes that need to look prompts up after a change register
+a ChangeQueue instead: the listener only enqueues the event, and a daemon
+thread passes everything queued so far to the handler as one ordered batch,
+so a burst of writes costs the index a single lookup.
+"""
+
+import queue
+import threading
+
+from prompt_clipboard.config.logging import logger
+
+
+class ChangeQueue:
+    """Delivers (event, prompt_id) batches to handler on a dedicated thread."""
+
+    def __init__(self, name: str, handler):
+        self.name = name
+        self._handler = handler
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def put(self, event: str, pid: str | None):
+        """Queue a change; usable directly as a DatabaseManager listener."""
+        self._queue.put((event, pid))
+
+    def _run(self):
+        while True:
+            changes = [self._queue.get()]
+            while True:
+                try:
+                    changes.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._handler(changes)
+            except Exception as e:
+                logger.error(
+                    "Prompt change handler failed",
+                    queue=self.name,
+                    changes_count=len(changes),
+                    error=str(e),
+                )
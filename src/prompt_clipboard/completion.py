@@ -0,0 +1,243 @@
+"""
+Search box autocompletion from the library vocabulary.
+
+Casefolded terms are kept in a sorted list, so the terms starting with a
+prefix are one contiguous slice found by bisection. Each term is weighted by
+the prompts containing it plus their usage counts, so words from frequently
+used prompts come first. Top completions are cached per prefix; a change only
+drops the cached prefixes of the terms whose weight changed.
+
+The index is built and then updated per prompt from DatabaseManager change
+notifications, all on the index's own ChangeQueue thread: changes made while
+a rebuild reads the library are applied after it, not overwritten by it.
+Usage changes only read the counts.
+"""
+
+import bisect
+import heapq
+import re
+import threading
+from collections import Counter
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PySide6.QtWidgets import QCompleter, QLineEdit
+
+from prompt_clipboard.change_queue import ChangeQueue
+from prompt_clipboard.config.logging import logger
+from prompt_clipboard.database import DatabaseManager
+
+_TOKEN_RE = re.compile(r"\w{2,}")
+
+# Shortest prefix completed; single letters would match most of the vocabulary
+MIN_PREFIX_LENGTH = 2
+# Completions shown in the popup
+MAX_COMPLETIONS = 8
+# Cached prefix results; short prefixes are the expensive ones to recompute
+MAX_CACHED_PREFIXES = 4096
+
+
+def _terms(body: str) -> set[str]:
+    return set(_TOKEN_RE.findall(body.casefold()))
+
+
+class CompletionIndex:
+    """Weighted, prefix-searchable vocabulary of the prompt library."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+        self._lock = threading.Lock()
+        self._sorted = []  # all terms, sorted
+        self._weights = Counter()  # {term: sum of (1 + usage) of its prompts}
+        self._prompt_terms = {}  # {prompt_id: set of terms}
+        self._usage = {}  # {prompt_id: usage count included in weights}
+        self._cache = {}  # {prefix: top completions}
+        self.ready = False
+        self._changes = ChangeQueue("completion-changes", self._apply_changes)
+        db_manager.add_listener(self._changes.put)
+
+    def start(self):
+        """Build the index on its change queue thread."""
+        self._changes.put("reset", None)
+
+    def rebuild(self):
+        try:
+            prompts = self.db_manager.get_all_prompts()
+            weights = Counter()
+            prompt_terms = {}
+            usage = {}
+            for prompt in prompts:
+                terms = _terms(prompt.body)
+                prompt_terms[prompt.id] = terms
+                usage[prompt.id] = prompt.usage_count
+                for term in terms:
+                    weights[term] += 1 + prompt.usage_count
+            with self._lock:
+                self._weights = weights
+                self._prompt_terms = prompt_terms
+                self._usage = usage
+                self._sorted = sorted(weights)
+                self._cache.clear()
+                self.ready = True
+            logger.info(
+                "Completion index built",
+                prompts_count=len(prompts),
+                terms_count=len(weights),
+            )
+        except Exception as e:
+            logger.error("Failed to build completion index", error=str(e))
+
+    def _adjust(self, terms, delta: int):
+        """Change term weights, keeping the sorted list and cache in step."""
+        for term in terms:
+            for length in range(MIN_PREFIX_LENGTH, len(term) + 1):
+                self._cache.pop(term[:length], None)
+            weight = self._weights[term] + delta
+            if weight > 0:
+                if term not in self._weights:
+                    bisect.insort(self._sorted, term)
+                self._weights[term] = weight
+            else:
+                del self._weights[term]
+                position = bisect.bisect_left(self._sorted, term)
+                if position < len(self._sorted) and self._sorted[position] == term:
+                    del self._sorted[position]
+
+    def _remove(self, pid: str):
+        terms = self._prompt_terms.pop(pid, None)
+        if terms:
+            self._adjust(terms, -(1 + self._usage.pop(pid, 0)))
+
+    def _add(self, pid: str, body: str, usage_count: int):
+        terms = _terms(body)
+        self._prompt_terms[pid] = terms
+        self._usage[pid] = usage_count
+        self._adjust(terms, 1 + usage_count)
+
+    def _apply_changes(self, changes):
+        """Re-read changed prompts; runs on the change queue."""
+        resets = [i for i, (event, _) in enumerate(changes) if event == "reset"]
+        if resets:
+            # Earlier changes are in the rebuilt index; later ones still apply
+            self.rebuild()
+            changes = changes[resets[-1] + 1 :]
+        if not self.ready:
+            return
+        changed = {}  # {prompt_id: whether its body may have changed}
+        for event, pid in changes:
+            if event in ("added", "updated", "deleted"):
+                changed[pid] = True
+            elif event == "usage":
+                changed.setdefault(pid, False)
+        if not changed:
+            return
+
+        # Deleted prompts are simply missing
+        prompts = self.db_manager.get_prompts(
+            [pid for pid, body_changed in changed.items() if body_changed]
+        )
+        prompts = {prompt.id: prompt for prompt in prompts}
+        usage = self.db_manager.get_usage_counts(
+            [pid for pid, body_changed in changed.items() if not body_changed]
+        )
+        with self._lock:
+            for pid, body_changed in changed.items():
+                if body_changed:
+                    self._remove(pid)
+                    prompt = prompts.get(pid)
+                    if prompt is not None:
+                        self._add(pid, prompt.body, prompt.usage_count)
+                    continue
+                terms = self._prompt_terms.get(pid)
+                if pid not in usage:
+                    continue  # Deleted since; its "deleted" event follows
+                delta = usage[pid] - self._usage.get(pid, 0)
+                if terms and delta:
+                    self._usage[pid] = usage[pid]
+                    self._adjust(terms, delta)
+
+    def complete(self, prefix: str, limit: int = MAX_COMPLETIONS) -> list[str]:
+        """Get the highest weighted terms starting with prefix."""
+        prefix = prefix.casefold()
+        if not self.ready or len(prefix) < MIN_PREFIX_LENGTH:
+            return []
+
+        with self._lock:
+            cached = self._cache.get(prefix)
+            if cached is not None:
+                return cached[:limit]
+
+            start = bisect.bisect_left(self._sorted, prefix)
+            end = bisect.bisect_left(self._sorted, prefix + "\uffff", start)
+            weights = self._weights
+            result = heapq.nlargest(
+                MAX_COMPLETIONS, self._sorted[start:end], key=weights.__getitem__
+            )
+            if len(self._cache) >= MAX_CACHED_PREFIXES:
+                self._cache.clear()
+            self._cache[prefix] = result
+        return result[:limit]
+
+
+class CompletionModel(QAbstractListModel):
+    """List model holding the current completions."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._terms = []
+
+    def set_terms(self, terms: list[str]):
+        self.beginResetModel()
+        self._terms = terms
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._terms)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.isValid() and role in (
+            Qt.ItemDataRole.DisplayRole,
+            Qt.ItemDataRole.EditRole,
+        ):
+            return self._terms[index.row()]
+        return None
+
+
+class SearchCompleter(QCompleter):
+    """Completes the last word typed in a search box."""
+
+    def __init__(self, index: CompletionIndex, line_edit: QLineEdit):
+        super().__init__(line_edit)
+        self.index = index
+        self.line_edit = line_edit
+        self._model = CompletionModel(self)
+        self.setModel(self._model)
+        # Rows are already ranked; show them as they are
+        self.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.setWidget(line_edit)
+        line_edit.textEdited.connect(self._on_text_edited)
+        self.activated[str].connect(self._insert_completion)
+
+    @staticmethod
+    def _last_word(text: str) -> str:
+        if not text or text[-1].isspace():
+            return ""
+        word = text.split()[-1].lstrip('-"')
+        # Tags and field filters have their own vocabulary
+        if word.startswith("#") or ":" in word:
+            return ""
+        return word
+
+    def _on_text_edited(self, text: str):
+        prefix = self._last_word(text)
+        terms = self.index.complete(prefix) if prefix else []
+        if not terms or terms == [prefix.casefold()]:
+            self._model.set_terms([])
+            self.popup().hide()
+            return
+        self._model.set_terms(terms)
+        self.complete()
+
+    def _insert_completion(self, term: str):
+        text = self.line_edit.text()
+        prefix = self._last_word(text)
+        self.line_edit.setText(f"{text[: len(text) - len(prefix)]}{term} ")
@@ -7,9 +7,13 @@ This module provides a centralized logging setup with best practices:
 - File logging with rotation and retention
 - Proper log levels and formatting
 - Error handling and context support
+- Production profile with per-module levels and an in-memory ring buffer
 """
 
 import sys
+import threading
+from collections import deque
+from datetime import datetime
 
 from loguru import logger
 
@@ -18,6 +22,76 @@ from .settings import settings
 # Remove default handler to avoid duplicate logs
 logger.remove()
 
+# Number of ring buffer dumps kept in the log directory
+MAX_DEBUG_DUMPS = 10
+
+RING_BUFFER_FORMAT = (
+    "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | "
+    "{name}:{function}:{line} | {message} | {extra}\n"
+)
+
+
+def _format_record(record) -> str:
+    return RING_BUFFER_FORMAT.format(**record)
+
+
+class RingBufferSink:
+    """
+    Keep the last N log records in memory and write them to disk on errors.
+
+    Records cost a deque append until something goes wrong, so the context
+    leading up to an error is available without a verbose log file. Loguru
+    builds a record for every call at or above the lowest level any sink
+    accepts, so the ring captures INFO by default and DEBUG only for the
+    modules it is configured for.
+    """
+
+    def __init__(self, capacity: int, dump_dir, trigger_level: str = "ERROR"):
+        self.dump_dir = dump_dir
+        self._buffer = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._trigger_no = logger.level(trigger_level).no
+
+    def write(self, message):
+        # Keep raw records; formatting is deferred until a dump is written
+        record = message.record
+        with self._lock:
+            self._buffer.append(record)
+        if record["level"].no >= self._trigger_no:
+            self.dump()
+
+    def dump(self):
+        """Write buffered records to a new dump file and clear the buffer."""
+        with self._lock:
+            records = list(self._buffer)
+            self._buffer.clear()
+        if not records:
+            return None
+
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        path = self.dump_dir / f"debug-dump-{timestamp}.log"
+        path.write_text("".join(map(_format_record, records)), encoding="utf-8")
+
+        dumps = sorted(self.dump_dir.glob("debug-dump-*.log"))
+        for old in dumps[:-MAX_DEBUG_DUMPS]:
+            old.unlink(missing_ok=True)
+        return path
+
+
+def _sink_options(level: str, module_levels: dict[str, str] | None = None) -> dict:
+    """Build level and filter options applying per-module level overrides."""
+    if module_levels is None:
+        module_levels = settings.logging.module_levels
+    if not module_levels:
+        return {"level": level}
+
+    # The sink must accept the most verbose override; the filter narrows the rest
+    levels = [level, *module_levels.values()]
+    return {
+        "level": min(levels, key=lambda name: logger.level(name).no),
+        "filter": {"": level, **module_levels},
+    }
+
 
 def setup_logging():
     """
@@ -27,16 +101,18 @@ def setup_logging():
     - Console handler for development with colored output
     - File handler with JSON serialization for production
     - Error file handler for critical errors only
+    - Ring buffer of recent records dumped on errors (production profile)
     """
+    production = settings.logging.profile == "production"
 
     # Console handler - for development/debugging
     logger.add(
         sys.stderr,
-        level=settings.logging.level,
+        **_sink_options(settings.logging.level),
         format=settings.logging.console_format,
         colorize=True,  # Enable colors in console
-        backtrace=True,  # Show full traceback on errors
-        diagnose=True,  # Show variable values in tracebacks (disable in production for security)
+        backtrace=not production,  # Show full traceback on errors
+        diagnose=not production,  # Show variable values in tracebacks
         enqueue=True,  # Thread-safe logging
         catch=True,  # Catch and log logging errors
     )
@@ -44,7 +120,7 @@ def setup_logging():
     # File handler - structured JSON logging
     logger.add(
         settings.log_file_path,
-        level=settings.logging.file_level,
+        **_sink_options(settings.logging.file_level),
         serialize=True,  # JSON serialization
         rotation="10 MB",  # Rotate when file reaches 10MB
         retention="30 days",  # Keep logs for 30 days
@@ -67,6 +143,20 @@ def setup_logging():
         catch=True,
     )
 
+    # Ring buffer - cheap in-memory capture written out only when an error occurs
+    if production and settings.logging.ring_buffer_size > 0:
+        logger.add(
+            RingBufferSink(settings.logging.ring_buffer_size, settings.logging.dir),
+            **_sink_options(
+                settings.logging.ring_buffer_level,
+                settings.logging.ring_buffer_module_levels,
+            ),
+            format="{message}",
+            backtrace=False,
+            diagnose=False,
+            catch=True,
+        )
+
     # Add custom log level for application-specific events if needed
     # logger.level("AUDIT", no=25, color="<yellow>", icon="🔍")
 
@@ -78,6 +168,7 @@ def setup_logging():
         "Logging system initialized",
         log_file=str(settings.log_file_path),
         log_level=settings.logging.level,
+        log_profile=settings.logging.profile,
     )
 
 
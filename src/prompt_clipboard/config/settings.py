@@ -30,6 +30,29 @@ class LoggingSettings(BaseModel):
     file_level: str = Field(default="INFO", description="File log level")
     dir: Path = Field(default=data_dir / "logs", description="Log directory")
     file: str = Field(default="prompt_clipboard.log", description="Main log filename")
+    profile: str = Field(
+        default="development",
+        description="Logging profile: development (verbose tracebacks) or production",
+    )
+    module_levels: dict[str, str] = Field(
+        default_factory=dict,
+        description="Per-module level overrides, e.g. {'prompt_clipboard.hotkey': 'WARNING'}",
+    )
+    ring_buffer_size: int = Field(
+        default=2000,
+        ge=0,
+        description="Records kept in memory and dumped on errors in production (0 disables)",
+    )
+    ring_buffer_level: str = Field(
+        default="INFO", description="Lowest level captured by the ring buffer"
+    )
+    ring_buffer_module_levels: dict[str, str] = Field(
+        default_factory=dict,
+        description=(
+            "Per-module ring buffer levels, e.g. {'prompt_clipboard.sync': 'DEBUG'}; "
+            "any DEBUG entry makes every debug call build its record"
+        ),
+    )
     console_format: str = Field(
         default=(
             "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
@@ -41,7 +64,7 @@ class LoggingSettings(BaseModel):
         description="Console log format",
     )
 
-    @field_validator("level", "file_level")
+    @field_validator("level", "file_level", "ring_buffer_level")
     @classmethod
     def validate_log_level(cls, v: str) -> str:
         """Validate log level is one of the standard levels."""
@@ -50,6 +73,23 @@ class LoggingSettings(BaseModel):
             raise ValueError(f"Log level must be one of: {', '.join(valid_levels)}")
         return v.upper()
 
+    @field_validator("profile")
+    @classmethod
+    def validate_profile(cls, v: str) -> str:
+        """Validate logging profile name."""
+        valid_profiles = ["development", "production"]
+        if v.lower() not in valid_profiles:
+            raise ValueError(
+                f"Logging profile must be one of: {', '.join(valid_profiles)}"
+            )
+        return v.lower()
+
+    @field_validator("module_levels", "ring_buffer_module_levels")
+    @classmethod
+    def validate_module_levels(cls, v: dict[str, str]) -> dict[str, str]:
+        """Validate per-module override levels."""
+        return {module: cls.validate_log_level(level) for module, level in v.items()}
+
     @field_validator("dir")
     @classmethod
     def validate_log_dir(cls, v: Path) -> Path:
@@ -64,6 +104,10 @@ class DatabaseSettings(BaseModel):
     path: Path = Field(
         default=data_dir / "prompt_clip.db", description="Database file path"
     )
+    mounts: list[Path] = Field(
+        default_factory=list,
+        description="Read-only libraries searched alongside the database",
+    )
 
     @field_validator("path")
     @classmethod
@@ -73,6 +117,78 @@ class DatabaseSettings(BaseModel):
         return v
 
 
+class BackupSettings(BaseModel):
+    """Settings for scheduled database backups."""
+
+    dir: Path = Field(default=data_dir / "backups", description="Snapshot directory")
+    enabled: bool = Field(default=True, description="Enable scheduled backups")
+    interval_hours: float = Field(
+        default=24, gt=0, description="Hours between scheduled backups"
+    )
+    keep: int = Field(default=7, ge=1, description="Number of snapshots to keep")
+    pages_per_step: int = Field(
+        default=64, ge=1, description="Database pages copied per backup step"
+    )
+    step_sleep: float = Field(
+        default=0.005, ge=0, description="Seconds to yield between backup steps"
+    )
+
+
+class ProfilingSettings(BaseModel):
+    """Settings for the pipeline sampling profiler."""
+
+    enabled: bool = Field(
+        default=False, description="Profile the overlay pipeline (same as --profile)"
+    )
+    dir: Path = Field(
+        default=data_dir / "logs" / "profiles", description="Profile output directory"
+    )
+    interval: float = Field(
+        default=0.001, gt=0, description="Seconds between stack samples"
+    )
+    keep: int = Field(default=10, ge=1, description="Number of sessions to keep")
+
+
+class MemorySettings(BaseModel):
+    """Settings for trimming memory while the overlay is hidden."""
+
+    idle_trim_minutes: float = Field(
+        default=10,
+        ge=0,
+        description="Minutes the overlay stays hidden before memory is trimmed (0 disables)",
+    )
+    hot_queries: int = Field(
+        default=8, ge=0, description="Cached search results kept when trimming"
+    )
+
+
+class MaintenanceSettings(BaseModel):
+    """Settings for database maintenance while the app is idle."""
+
+    enabled: bool = Field(default=True, description="Enable idle maintenance")
+    idle_minutes: float = Field(
+        default=5, gt=0, description="Minutes without overlay use before maintenance"
+    )
+    interval_hours: float = Field(
+        default=24, gt=0, description="Hours between completed maintenance runs"
+    )
+    vacuum_pages_per_step: int = Field(
+        default=128, ge=1, description="Free pages released per incremental_vacuum"
+    )
+    vacuum_free_ratio: float = Field(
+        default=0.1,
+        ge=0,
+        le=1,
+        description="Free page share that triggers the one-off VACUUM enabling auto_vacuum",
+    )
+    step_sleep: float = Field(
+        default=0.05, ge=0, description="Seconds to yield between maintenance steps"
+    )
+    busy_timeout: float = Field(
+        default=1, ge=0, description="Seconds a step waits for a locked database"
+    )
+
+
 class AppSettings(BaseModel):
     """General application settings."""
 
@@ -83,6 +199,10 @@ class AppSettings(BaseModel):
         default="Summarize the following notes: {{notes}}",
         description="Default seed prompt when database is empty",
     )
+    settings_file: Path = Field(
+        default=data_dir / "settings.json",
+        description="JSON file with user preferences layered under the database",
+    )
 
 
 class Settings(BaseSettings):
@@ -91,6 +211,14 @@ class Settings(BaseSettings):
     app: AppSettings = AppSettings()
     logging: LoggingSettings = LoggingSettings()
     database: DatabaseSettings = DatabaseSettings()
+    backup: BackupSettings = BackupSettings()
+    profiling: ProfilingSettings = ProfilingSettings()
+    memory: MemorySettings = MemorySettings()
+    maintenance: MaintenanceSettings = MaintenanceSettings()
+    preferences: dict[str, str] = Field(
+        default_factory=dict,
+        description="Preference overrides, e.g. PROMPT_CLIPBOARD__PREFERENCES__HOTKEY",
+    )
 
     model_config = SettingsConfigDict(
         env_prefix="PROMPT_CLIPBOARD__",
@@ -1,17 +1,63 @@
+import heapq
+import json
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from pathlib import Path
 
 from loguru import logger
-from sqlmodel import Field, Session, SQLModel, create_engine, select
+from sqlalchemy import UniqueConstraint, and_, not_, text
+from sqlmodel import (
+    Field,
+    Session,
+    SQLModel,
+    create_engine,
+    delete,
+    func,
+    insert,
+    select,
+    update,
+)
+
+from prompt_clipboard.query_cache import QueryCache, normalize_query
+from prompt_clipboard.revisions import (
+    SNAPSHOT_INTERVAL,
+    apply_delta,
+    decode_snapshot,
+    encode_delta,
+    encode_snapshot,
+)
+from prompt_clipboard.pack import PACK_SUFFIX, PromptPack
+from prompt_clipboard.search_query import (
+    MEMORY_FIELDS,
+    PREFIX_END,
+    SQL_FIELDS,
+    Filter,
+    SearchQuery,
+    parse_query,
+)
+from prompt_clipboard.tag_index import TagIndex
+
+# Maximum number of bound parameters per IN (...) clause
+IN_CHUNK_SIZE = 500
+# Candidate sets up to this size are filtered by id lookups rather than scans
+SMALL_POOL_SIZE = 4 * IN_CHUNK_SIZE
+
+
+def _chunked(ids: list[str]):
+    """Split ids into slices that fit an IN (...) clause."""
+    for i in range(0, len(ids), IN_CHUNK_SIZE):
+        yield ids[i : i + IN_CHUNK_SIZE]
 
 
 # SQLModel
 class Prompt(SQLModel, table=True):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     body: str
-    usage_count: int = Field(default=0)
+    usage_count: int = Field(default=0, index=True)
     created_at: str = Field(
-        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+        default_factory=lambda: datetime.now(timezone.utc).isoformat(), index=True
     )
     updated_at: str = Field(
         default_factory=lambda: datetime.now(timezone.utc).isoformat()
@@ -39,12 +85,151 @@ class Setting(SQLModel, table=True):
     )
 
 
+class Tag(SQLModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    name: str = Field(unique=True)
+
+
+class PromptTag(SQLModel, table=True):
+    prompt_id: str = Field(foreign_key="prompt.id", primary_key=True)
+    tag_id: int = Field(foreign_key="tag.id", primary_key=True)
+
+
+class ChangeLog(SQLModel, table=True):
+    """Append-only journal of prompt mutations, replayed by sync."""
+
+    __table_args__ = (UniqueConstraint("node_id", "clock"),)
+
+    id: int | None = Field(default=None, primary_key=True)
+    node_id: str  # database that originally made the change
+    clock: int  # Lamport clock of the change on its origin node
+    op: str  # add, update, delete, usage, usage_reset, relation, tags
+    prompt_id: str = Field(index=True)
+    related_id: str | None = None  # second prompt of a relation change
+    # New body for add/update, tag names for tags, JSON totals for usage_reset
+    body: str | None = None
+    # Relation strength increment; for usage, the origin node's running total
+    delta: int = Field(default=0)
+    created_at: str = Field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+
+
+class PromptRevision(SQLModel, table=True):
+    """Prompt body history: full snapshots or deltas against the previous revision."""
+
+    __table_args__ = (UniqueConstraint("prompt_id", "revision"),)
+
+    id: int | None = Field(default=None, primary_key=True)
+    prompt_id: str = Field(index=True)
+    revision: int  # 1-based, increasing per prompt
+    is_snapshot: bool = Field(default=False)
+    data: bytes  # compressed body (snapshot) or delta, see revisions.py
+    body_length: int
+    created_at: str = Field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+
+
+class PromptSignature(SQLModel, table=True):
+    """MinHash signature of a prompt body, used to find near-duplicates."""
+
+    prompt_id: str = Field(primary_key=True)
+    body_hash: str  # hash of the body the signature was computed from
+    signature: bytes
+
+
+class SelectionHistory(SQLModel, table=True):
+    """Prompts copied together from the overlay, in selection order."""
+
+    id: int | None = Field(default=None, primary_key=True)
+    prompt_ids: str  # comma-separated, in the order they were selected
+    created_at: str = Field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+
+
+class MaintenanceRun(SQLModel, table=True):
+    """One run of the idle maintenance scheduler, see maintenance.py."""
+
+    id: int | None = Field(default=None, primary_key=True)
+    started_at: str = Field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+    duration_ms: int
+    size_before: int  # database file size in bytes
+    size_after: int
+    steps: str  # comma-separated steps that completed
+    interrupted: bool = Field(default=False)
+    integrity: str | None = None  # quick_check result, if it ran
+
+
+# Journal operations that carry a prompt body
+BODY_OPS = ("add", "update")
+
+# Usage entries hold running totals, so all but the newest per node are redundant
+COMPACT_JOURNAL_SQL = """
+DELETE FROM changelog
+WHERE op = 'usage' AND EXISTS (
+    SELECT 1 FROM changelog AS newer
+    WHERE newer.op = 'usage'
+      AND newer.prompt_id = changelog.prompt_id
+      AND newer.node_id = changelog.node_id
+      AND newer.clock > changelog.clock
+)
+"""
+
+# Setting key holding this database's journal node id
+NODE_ID_SETTING = "sync.node_id"
+# Setting key holding the lowest clock to continue from, set when the node changes
+CLOCK_SETTING = "sync.clock"
+
+# Indexes added after the first release; create_all skips existing tables
+PROMPT_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_prompt_usage_count ON prompt (usage_count)",
+    "CREATE INDEX IF NOT EXISTS ix_prompt_created_at ON prompt (created_at)",
+)
+
+# Threads searching mounted libraries concurrently
+MOUNT_SEARCH_WORKERS = 4
+
+
 class DatabaseManager:
-    def __init__(self, db_path):
+    def __init__(self, db_path, read_only: bool = False):
         self.db_path = db_path
+        self.read_only = read_only
+        self._listeners = []
+        # Bumped on every prompt mutation; tags cached query results
+        self.generation = 0
+        self.query_cache = QueryCache()
+        self._search_bodies = None  # {prompt_id: lower-cased body}
+        self._tag_index = None  # TagIndex, built on first use
+        # Guards building the two indexes above; queries run on several threads
+        self._index_lock = threading.Lock()
+        # Serializes journaled writes, which may come from several threads
+        self._write_lock = threading.RLock()
+        self.mounts = {}  # {name: read-only library searched alongside this one}
+        self._mount_pool = None
         try:
-            self.engine = create_engine(f"sqlite:///{db_path}")
+            if read_only:
+                # SQLite itself refuses writes; the schema is used as it is
+                self.engine = create_engine(
+                    f"sqlite:///file:{Path(db_path).resolve()}?mode=ro&uri=true",
+                    connect_args={"check_same_thread": False},
+                )
+                self.node_id = None
+                self.clock = 0
+                logger.info("Database opened read-only", db_path=str(db_path))
+                return
+            # Connections are used from the DatabaseExecutor thread as well
+            self.engine = create_engine(
+                f"sqlite:///{db_path}", connect_args={"check_same_thread": False}
+            )
             SQLModel.metadata.create_all(self.engine)
+            with self.engine.begin() as connection:
+                for statement in PROMPT_INDEXES:
+                    connection.execute(text(statement))
+            self._init_journal()
             logger.info("Database initialized successfully", db_path=str(db_path))
         except Exception as e:
             logger.error(
@@ -52,28 +237,222 @@ class DatabaseManager:
             )
             raise
 
+    def _init_journal(self):
+        """Load the node id and clock, journaling pre-existing data once."""
+        with Session(self.engine) as session:
+            setting = session.get(Setting, NODE_ID_SETTING)
+            if setting is None:
+                setting = Setting(key=NODE_ID_SETTING, value=str(uuid.uuid4()))
+                session.add(setting)
+                session.commit()
+            self.node_id = setting.value
+            self.clock = session.exec(select(func.max(ChangeLog.clock))).one() or 0
+            floor = session.get(Setting, CLOCK_SETTING)
+            if floor is not None:
+                self.clock = max(self.clock, int(floor.value))
+
+            if self.clock == 0 and session.exec(select(Prompt)).first():
+                # Databases created before journaling: record their state as changes
+                prompts = session.exec(select(Prompt)).all()
+                for prompt in prompts:
+                    self._journal(session, "add", prompt.id, body=prompt.body)
+                self._journal_usage(
+                    session, {p.id: p.usage_count for p in prompts if p.usage_count}
+                )
+                for rel in session.exec(select(PromptRelation)).all():
+                    self._journal(
+                        session,
+                        "relation",
+                        rel.prompt_id_1,
+                        related_id=rel.prompt_id_2,
+                        delta=rel.strength,
+                    )
+                session.commit()
+                logger.info("Change journal initialized", clock=self.clock)
+
+    def start_new_node(self, min_clock: int = 0):
+        """Journal further changes under a fresh node id.
+
+        Needed when the file went back to an older state of its node, e.g. a
+        restored backup: peers have already seen that node's later clocks and
+        would skip new changes journaled under them. The clock continues from
+        at least min_clock so new changes still win over ones seen before.
+        """
+        with self._write_lock, Session(self.engine) as session:
+            node_id = str(uuid.uuid4())
+            clock = max(self.clock, min_clock)
+            for key, value in ((NODE_ID_SETTING, node_id), (CLOCK_SETTING, str(clock))):
+                setting = session.get(Setting, key) or Setting(key=key, value=value)
+                setting.value = value
+                setting.updated_at = datetime.now(timezone.utc).isoformat()
+                session.add(setting)
+            session.commit()
+            previous, self.node_id, self.clock = self.node_id, node_id, clock
+        logger.info(
+            "Journal node changed",
+            previous_node_id=previous,
+            node_id=self.node_id,
+            clock=self.clock,
+        )
+
+    def _journal(self, session, op: str, pid: str, **fields):
+        """Append a local change to the journal within the caller's transaction."""
+        if self.read_only:
+            raise PermissionError(f"Database is read-only: {self.db_path}")
+        self.clock += 1
+        session.add(
+            ChangeLog(
+                node_id=self.node_id, clock=self.clock, op=op, prompt_id=pid, **fields
+            )
+        )
+
+    def _journal_usage(self, session, counts: dict[str, int]):
+        """Journal usage increments as this node's new running totals.
+
+        Only the newest total per (node, prompt) matters, so older usage
+        entries can be dropped by COMPACT_JOURNAL_SQL without affecting sync.
+        """
+        for chunk in _chunked(list(counts)):
+            totals = dict(
+                session.exec(
+                    select(ChangeLog.prompt_id, func.max(ChangeLog.delta))
+                    .where(
+                        ChangeLog.node_id == self.node_id,
+                        ChangeLog.op == "usage",
+                        ChangeLog.prompt_id.in_(chunk),
+                    )
+                    .group_by(ChangeLog.prompt_id)
+                ).all()
+            )
+            for pid in chunk:
+                total = totals.get(pid, 0) + counts[pid]
+                self._journal(session, "usage", pid, delta=total)
+
+    def _usage_totals(self, session, pid: str) -> dict[str, int]:
+        """Get the running usage total of a prompt per origin node."""
+        return dict(
+            session.exec(
+                select(ChangeLog.node_id, func.max(ChangeLog.delta))
+                .where(ChangeLog.prompt_id == pid, ChangeLog.op == "usage")
+                .group_by(ChangeLog.node_id)
+            ).all()
+        )
+
+    def close(self):
+        self.engine.dispose()
+
+    def trim_memory(self, keep_queries: int = 8):
+        """Release memory that is rebuilt on demand.
+
+        Keeps the keep_queries most recent cached search results, drops the
+        lower-cased body index and closes pooled connections, which frees
+        their SQLite page caches. Mounted libraries are trimmed as well.
+        """
+        self.query_cache.shrink(keep_queries)
+        self._search_bodies = None
+        self.engine.dispose()
+        for library in self.mounts.values():
+            if isinstance(library, PromptPack):
+                library.release_pages()
+            else:
+                library.trim_memory(keep_queries)
+        logger.debug("Database memory trimmed", cached_queries=len(self.query_cache))
+
+    def reset_caches(self):
+        """Drop connections and in-memory state after the file was replaced."""
+        self.engine.dispose()
+        self._search_bodies = None
+        self._tag_index = None
+        self.query_cache.clear()
+        self._init_journal()
+        self._notify("reset", None)
+
+    def add_listener(self, callback):
+        """Register callback(event, prompt_id) invoked after prompt mutations.
+
+        The "reset" event (with prompt_id None) means all prompts may have changed.
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, event: str, pid: str | None):
+        self.generation += 1
+        for callback in list(self._listeners):
+            try:
+                callback(event, pid)
+            except Exception as e:
+                logger.error(
+                    "Prompt change listener failed",
+                    event=event,
+                    prompt_id=pid,
+                    error=str(e),
+                )
+
     def add_prompt(self, body):
         try:
-            with Session(self.engine) as session:
+            with self._write_lock, Session(self.engine) as session:
                 prompt = Prompt(body=body)
                 session.add(prompt)
+                self._journal(session, "add", prompt.id, body=body)
                 session.commit()
                 session.refresh(prompt)
                 logger.debug("Prompt added", prompt_id=prompt.id, body_length=len(body))
+                self._set_search_body(prompt.id, body)
+                self._notify("added", prompt.id)
                 return prompt.id
         except Exception as e:
             logger.error("Failed to add prompt", error=str(e), body_length=len(body))
             raise
 
+    def add_prompts(self, prompts) -> list[str]:
+        """Add prompts in one transaction, e.g. from an import.
+
+        prompts yields (body, usage_count, created_at, tags) tuples; a None
+        created_at means now. Listeners get a single "reset" event instead of
+        one "added" event per prompt. Returns the ids of the new prompts.
+        """
+        added = []  # [(prompt_id, body)]
+        try:
+            with self._write_lock, Session(self.engine) as session:
+                for body, usage_count, created_at, tags in prompts:
+                    prompt = Prompt(body=body, usage_count=usage_count)
+                    if created_at is not None:
+                        prompt.created_at = created_at
+                    session.add(prompt)
+                    self._journal(session, "add", prompt.id, body=body)
+                    if usage_count:
+                        self._journal_usage(session, {prompt.id: usage_count})
+                    names = sorted({TagIndex.normalize(tag) for tag in tags} - {""})
+                    if names:
+                        self._write_tags(session, prompt.id, names)
+                        self._journal(session, "tags", prompt.id, body=",".join(names))
+                    added.append((prompt.id, body))
+                session.commit()
+        except Exception as e:
+            logger.error("Failed to add prompts", error=str(e))
+            raise
+
+        if added:
+            for pid, body in added:
+                self._set_search_body(pid, body)
+            # Rebuilt lazily from the tag tables
+            self._tag_index = None
+            self._notify("reset", None)
+        logger.info("Prompts added", prompts_count=len(added))
+        return [pid for pid, _ in added]
+
     def update_prompt(self, pid, body):
         try:
-            with Session(self.engine) as session:
+            with self._write_lock, Session(self.engine) as session:
                 prompt = session.get(Prompt, pid)
                 if prompt:
+                    self._add_revision(session, prompt, body)
                     prompt.body = body
                     prompt.updated_at = datetime.now(timezone.utc).isoformat()
+                    self._journal(session, "update", pid, body=body)
                     session.commit()
                     logger.debug("Prompt updated", prompt_id=pid, body_length=len(body))
+                    self._set_search_body(pid, body)
+                    self._notify("updated", pid)
                 else:
                     logger.warning("Prompt not found for update", prompt_id=pid)
         except Exception as e:
@@ -81,80 +460,472 @@ class DatabaseManager:
             raise
 
     def increment_usage(self, pid):
-        with Session(self.engine) as session:
-            prompt = session.get(Prompt, pid)
-            if prompt:
-                prompt.usage_count += 1
-                session.commit()
+        self.increment_usage_many({pid: 1})
+
+    def increment_usage_many(self, counts: dict[str, int]):
+        """Add usage counts for several prompts in a single transaction."""
+        with self._write_lock, Session(self.engine) as session:
+            updated = []
+            for prompt in self._get_prompts_by_ids(session, list(counts)):
+                prompt.usage_count += counts[prompt.id]
+                updated.append(prompt.id)
+            self._journal_usage(session, {pid: counts[pid] for pid in updated})
+            session.commit()
+        for pid in updated:
+            self._notify("usage", pid)
 
     def delete_prompt(self, pid):
+        if not self.delete_prompts([pid]):
+            logger.warning("Prompt not found for deletion", prompt_id=pid)
+
+    def delete_prompts(self, ids: list[str], progress=None) -> int:
+        """Delete prompts with their relations, tags, revisions and signatures.
+
+        Runs one transaction of set-based deletes. progress(done, total) is
+        called after each chunk of ids. Returns the number of prompts deleted.
+        """
+        ids = list(dict.fromkeys(ids))
+        deleted = []
+        relations_count = 0
         try:
-            with Session(self.engine) as session:
-                # First, delete all relations involving this prompt
-                relations = session.exec(
-                    select(PromptRelation).where(
-                        (PromptRelation.prompt_id_1 == pid)
-                        | (PromptRelation.prompt_id_2 == pid)
-                    )
-                ).all()
+            with self._write_lock, Session(self.engine) as session:
+                for done, chunk in enumerate(_chunked(ids), start=1):
+                    found = session.exec(
+                        select(Prompt.id).where(Prompt.id.in_(chunk))
+                    ).all()
+                    if found:
+                        relations_count += session.execute(
+                            delete(PromptRelation).where(
+                                PromptRelation.prompt_id_1.in_(found)
+                                | PromptRelation.prompt_id_2.in_(found)
+                            )
+                        ).rowcount
+                        for table in (PromptTag, PromptRevision, PromptSignature):
+                            session.execute(
+                                delete(table).where(table.prompt_id.in_(found))
+                            )
+                        session.execute(delete(Prompt).where(Prompt.id.in_(found)))
+                        for pid in found:
+                            self._journal(session, "delete", pid)
+                        deleted.extend(found)
+                    if progress is not None:
+                        progress(min(len(ids), done * IN_CHUNK_SIZE), len(ids))
+                session.commit()
+        except Exception as e:
+            logger.error(
+                "Failed to delete prompts", prompts_count=len(ids), error=str(e)
+            )
+            raise
 
-                relations_count = len(relations)
-                for relation in relations:
-                    session.delete(relation)
+        tag_index = self._tag_index
+        for pid in deleted:
+            self._set_search_body(pid, None)
+            if tag_index is not None:
+                tag_index.remove(pid)
+            self._notify("deleted", pid)
+        logger.info(
+            "Prompts deleted",
+            prompts_count=len(deleted),
+            relations_deleted=relations_count,
+        )
+        return len(deleted)
 
-                # Then delete the prompt itself
-                prompt = session.get(Prompt, pid)
-                if prompt:
-                    session.delete(prompt)
-                    session.commit()
-                    logger.info(
-                        "Prompt deleted",
-                        prompt_id=pid,
-                        relations_deleted=relations_count,
-                    )
-                else:
-                    logger.warning("Prompt not found for deletion", prompt_id=pid)
+    def retag_prompts(self, ids: list[str], add=(), remove=(), progress=None) -> int:
+        """Add and remove tags on many prompts in one transaction.
+
+        Moving prompts from one tag to another is remove=[old], add=[new].
+        progress(done, total) is called after each chunk of ids. Returns the
+        number of prompts whose tags changed.
+        """
+        add = {TagIndex.normalize(tag) for tag in add} - {""}
+        remove = {TagIndex.normalize(tag) for tag in remove} - {""}
+        add -= remove
+        tag_index = self._get_tag_index()
+        ids = list(dict.fromkeys(ids))
+        changed = {}  # {prompt_id: sorted tag names}
+        try:
+            with self._write_lock, Session(self.engine) as session:
+                tag_ids = dict(
+                    session.exec(
+                        select(Tag.name, Tag.id).where(Tag.name.in_(add | remove))
+                    ).all()
+                )
+                for name in sorted(add - tag_ids.keys()):
+                    tag = Tag(name=name)
+                    session.add(tag)
+                    session.flush()
+                    tag_ids[name] = tag.id
+
+                for done, chunk in enumerate(_chunked(ids), start=1):
+                    found = session.exec(
+                        select(Prompt.id).where(Prompt.id.in_(chunk))
+                    ).all()
+                    additions = []
+                    for pid in found:
+                        current = set(tag_index.tags_of(pid))
+                        names = (current | add) - remove
+                        if names == current:
+                            continue
+                        changed[pid] = sorted(names)
+                        additions.extend(
+                            {"prompt_id": pid, "tag_id": tag_ids[name]}
+                            for name in add - current
+                        )
+                        # Sorted like set_prompt_tags, so journal entries are deterministic
+                        self._journal(session, "tags", pid, body=",".join(changed[pid]))
+                    removed_ids = [tag_ids[name] for name in remove if name in tag_ids]
+                    if removed_ids:
+                        session.execute(
+                            delete(PromptTag).where(
+                                PromptTag.prompt_id.in_(found),
+                                PromptTag.tag_id.in_(removed_ids),
+                            )
+                        )
+                    if additions:
+                        session.execute(insert(PromptTag), additions)
+                    if progress is not None:
+                        progress(min(len(ids), done * IN_CHUNK_SIZE), len(ids))
+                session.commit()
         except Exception as e:
-            logger.error("Failed to delete prompt", prompt_id=pid, error=str(e))
+            logger.error(
+                "Failed to retag prompts", prompts_count=len(ids), error=str(e)
+            )
+            raise
+
+        for pid, names in changed.items():
+            tag_index.set_tags(pid, names)
+            self._notify("tagged", pid)
+        logger.info(
+            "Prompts retagged",
+            prompts_count=len(changed),
+            added=sorted(add),
+            removed=sorted(remove),
+        )
+        return len(changed)
+
+    def reset_usage(self, ids: list[str], progress=None) -> int:
+        """Set the usage count of prompts to zero in one transaction.
+
+        progress(done, total) is called after each chunk of ids. Returns the
+        number of prompts whose count was reset.
+        """
+        ids = list(dict.fromkeys(ids))
+        reset = []
+        try:
+            with self._write_lock, Session(self.engine) as session:
+                for done, chunk in enumerate(_chunked(ids), start=1):
+                    counts = session.exec(
+                        select(Prompt.id, Prompt.usage_count).where(
+                            Prompt.id.in_(chunk), Prompt.usage_count != 0
+                        )
+                    ).all()
+                    if counts:
+                        session.execute(
+                            update(Prompt)
+                            .where(Prompt.id.in_([pid for pid, _ in counts]))
+                            .values(usage_count=0)
+                        )
+                        # Records the totals seen, so only those are cancelled
+                        for pid, _ in counts:
+                            totals = self._usage_totals(session, pid)
+                            self._journal(
+                                session, "usage_reset", pid, body=json.dumps(totals)
+                            )
+                        reset.extend(pid for pid, _ in counts)
+                    if progress is not None:
+                        progress(min(len(ids), done * IN_CHUNK_SIZE), len(ids))
+                session.commit()
+        except Exception as e:
+            logger.error("Failed to reset usage", prompts_count=len(ids), error=str(e))
             raise
 
+        for pid in reset:
+            self._notify("usage", pid)
+        logger.info("Usage counts reset", prompts_count=len(reset))
+        return len(reset)
+
     def get_all_prompts(self):
         with Session(self.engine) as session:
             return session.exec(
                 select(Prompt).order_by(Prompt.usage_count.desc(), Prompt.created_at)
             ).all()
 
+    def get_prompt(self, pid):
+        with Session(self.engine) as session:
+            return session.get(Prompt, pid)
+
+    def get_prompts(self, ids: list[str]):
+        """Get prompts by ids, preserving the order of ids."""
+        with Session(self.engine) as session:
+            return self._get_prompts_by_ids(session, ids)
+
+    def get_usage_counts(self, ids: list[str]) -> dict[str, int]:
+        """Get {prompt_id: usage_count} for the prompts of ids that exist."""
+        counts = {}
+        with Session(self.engine) as session:
+            for chunk in _chunked(ids):
+                counts.update(
+                    session.exec(
+                        select(Prompt.id, Prompt.usage_count).where(
+                            Prompt.id.in_(chunk)
+                        )
+                    ).all()
+                )
+        return counts
+
+    def get_prompt_bodies(self) -> list[tuple[str, str]]:
+        with Session(self.engine) as session:
+            return session.exec(select(Prompt.id, Prompt.body)).all()
+
+    def get_prompts_page(self, offset: int, limit: int, query: str | None = None):
+        """Get one page of prompts in display order, optionally filtered by a query."""
+        parsed = parse_query(query) if query else None
+        with Session(self.engine) as session:
+            if parsed:
+                ids = self._query_ids(session, parsed)
+                return self._get_prompts_by_ids(session, ids[offset : offset + limit])
+            return session.exec(
+                select(Prompt)
+                .order_by(Prompt.usage_count.desc(), Prompt.created_at)
+                .offset(offset)
+                .limit(limit)
+            ).all()
+
+    def prompt_matches(self, pid: str, query: str | None) -> bool:
+        """Check whether a prompt is listed by get_prompts_page for a query."""
+        parsed = parse_query(query) if query else None
+        if not parsed:
+            return True
+        with Session(self.engine) as session:
+            return pid in self._query_ids(session, parsed)
+
+    def _get_prompts_by_ids(self, session, ids):
+        """Load prompts for ids, preserving the order of ids."""
+        by_id = {}
+        for i in range(0, len(ids), IN_CHUNK_SIZE):
+            chunk = ids[i : i + IN_CHUNK_SIZE]
+            for prompt in session.exec(select(Prompt).where(Prompt.id.in_(chunk))):
+                by_id[prompt.id] = prompt
+        return [by_id[pid] for pid in ids if pid in by_id]
+
+    def _set_search_body(self, pid: str, body: str | None):
+        """Keep the in-memory search body index in sync with a mutation."""
+        if self._search_bodies is None:
+            return
+        if body is None:
+            self._search_bodies.pop(pid, None)
+        else:
+            self._search_bodies[pid] = body.lower()
+
+    def _get_tag_index(self) -> TagIndex:
+        with self._index_lock:
+            if self._tag_index is None:
+                tag_index = TagIndex()
+                tags = {}
+                with Session(self.engine) as session:
+                    for pid, name in session.exec(
+                        select(PromptTag.prompt_id, Tag.name).join(
+                            Tag, Tag.id == PromptTag.tag_id
+                        )
+                    ):
+                        tags.setdefault(pid, []).append(name)
+                for pid, names in tags.items():
+                    tag_index.set_tags(pid, names)
+                self._tag_index = tag_index
+            return self._tag_index
+
+    def _load_search_bodies(self, session) -> dict[str, str]:
+        """Get the body index, building it if it was never loaded or trimmed.
+
+        Callers keep the returned dict: trim_memory may drop the attribute
+        at any time, and mutations may pop entries, so look ids up with get.
+        """
+        with self._index_lock:
+            if self._search_bodies is None:
+                # Filter on Python side for proper Unicode support
+                # SQLite's LOWER() doesn't work correctly with Cyrillic and other non-ASCII characters
+                rows = session.exec(select(Prompt.id, Prompt.body))
+                self._search_bodies = {pid: body.lower() for pid, body in rows}
+            return self._search_bodies
+
+    def _order_ids(self, session, ids, *clauses) -> list[str]:
+        """Sort a set of prompt ids in display order (most used first).
+
+        Extra SQL clauses drop ids that don't satisfy them.
+        """
+        rows = []
+        ids = list(ids)
+        for i in range(0, len(ids), IN_CHUNK_SIZE):
+            chunk = ids[i : i + IN_CHUNK_SIZE]
+            rows.extend(
+                session.exec(
+                    select(Prompt.id, Prompt.usage_count, Prompt.created_at).where(
+                        Prompt.id.in_(chunk), *clauses
+                    )
+                ).all()
+            )
+        rows.sort(key=lambda row: (-row[1], row[2]))
+        return [row[0] for row in rows]
+
+    @staticmethod
+    def _filter_clause(query_filter: Filter):
+        """Translate a uses:/created: filter to a predicate on an indexed column."""
+        op, value = query_filter.op, query_filter.value
+        if query_filter.field == "uses":
+            column = Prompt.usage_count
+        else:
+            # Partial ISO dates compare as prefixes: created:<=2026-03 includes March
+            column = Prompt.created_at
+            if op == "=":
+                clause = and_(column >= value, column < value + PREFIX_END)
+                return not_(clause) if query_filter.negated else clause
+            if op in ("<=", ">"):
+                value += PREFIX_END
+                op = "<" if op == "<=" else ">="
+
+        clause = {
+            "<": column < value,
+            "<=": column <= value,
+            ">": column > value,
+            ">=": column >= value,
+            "=": column == value,
+        }[op]
+        return not_(clause) if query_filter.negated else clause
+
+    def _query_ids(self, session, query: SearchQuery) -> list[str]:
+        """Get ids matching a parsed query, in display order.
+
+        Clauses run on the cheapest engine first, each narrowing the next:
+        1. #tags: bitmap AND in the tag index
+        2. uses:/created:: SQL predicates on indexed columns
+        3. words and phrases: the in-memory body index; cached and narrowed
+           while typing when nothing else restricts the candidates
+        4. len: and exclusions: in-memory checks of the survivors
+        """
+        pool = None  # unordered candidate set
+        ordered = None  # candidates in display order
+        if query.tags:
+            pool = self._get_tag_index().ids_with_all(query.tags)
+            if not pool:
+                return []
+
+        sql_filters = [f for f in query.filters if f.field in SQL_FIELDS]
+        if sql_filters:
+            clauses = [self._filter_clause(f) for f in sql_filters]
+            if pool is not None and len(pool) <= SMALL_POOL_SIZE:
+                # Look up the few tagged prompts instead of scanning the index
+                ordered = self._order_ids(session, pool, *clauses)
+            else:
+                ordered = session.exec(
+                    select(Prompt.id)
+                    .where(*clauses)
+                    .order_by(Prompt.usage_count.desc(), Prompt.created_at)
+                ).all()
+                if pool is not None:
+                    ordered = [pid for pid in ordered if pid in pool]
+            pool = None
+
+        if query.terms:
+            if ordered is None and pool is None:
+                ordered = self._matching_ids(session, query.terms)
+            else:
+                bodies = self._load_search_bodies(session)
+                candidates = ordered if ordered is not None else pool
+                matched = [
+                    pid
+                    for pid in candidates
+                    if all(term in bodies.get(pid, "") for term in query.terms)
+                ]
+                if ordered is not None:
+                    ordered = matched
+                else:
+                    pool = set(matched)
+
+        memory_filters = [f for f in query.filters if f.field in MEMORY_FIELDS]
+        if memory_filters or query.excluded or query.excluded_tags:
+            bodies = self._load_search_bodies(session)
+            excluded_ids = set()
+            for tag in query.excluded_tags:
+                excluded_ids |= self._get_tag_index().ids_with_all([tag])
+
+            def keep(pid):
+                body = bodies.get(pid)
+                return (
+                    body is not None
+                    and pid not in excluded_ids
+                    and not any(term in body for term in query.excluded)
+                    and all(f.matches(len(body)) for f in memory_filters)
+                )
+
+            if ordered is None and pool is None:
+                ordered = session.exec(
+                    select(Prompt.id).order_by(
+                        Prompt.usage_count.desc(), Prompt.created_at
+                    )
+                ).all()
+            if ordered is not None:
+                ordered = [pid for pid in ordered if keep(pid)]
+            else:
+                pool = {pid for pid in pool if keep(pid)}
+
+        if ordered is None:
+            ordered = self._order_ids(session, pool) if pool else []
+        return ordered
+
+    def _matching_ids(self, session, words) -> list[str]:
+        """Get ids of all prompts containing all words, most used first."""
+        key = normalize_query(words)
+        ids = self.query_cache.get(key, self.generation)
+        if ids is not None:
+            return ids
+
+        # Narrow a cached result for a shorter query when possible
+        base = None
+        bodies = self._search_bodies
+        if bodies is not None:
+            base = self.query_cache.find_base(key, self.generation)
+        if base is None:
+            bodies = self._load_search_bodies(session)
+            candidates = session.exec(
+                select(Prompt.id).order_by(Prompt.usage_count.desc(), Prompt.created_at)
+            ).all()
+        else:
+            candidates = base
+
+        ids = [
+            pid
+            for pid in candidates
+            if all(word in bodies.get(pid, "") for word in key)
+        ]
+
+        self.query_cache.put(key, ids, self.generation)
+        logger.debug(
+            "Search candidates computed",
+            words_count=len(key),
+            incremental=base is not None,
+            matched_count=len(ids),
+        )
+        return ids
+
     def search_prompts(self, q, limit=50):
-        """Search prompts by words (all words must be present, order doesn't matter)."""
-        search_text = q.strip().lower()
-        if not search_text:
-            return []
+        """Search prompts with a query (see search_query.py for the syntax).
 
-        # Split by whitespace to get individual words
-        words = search_text.split()
-        if not words:
+        Bare words must all be present, in any order.
+        """
+        query = parse_query(q)
+        if not query:
             return []
 
         try:
             with Session(self.engine) as session:
-                # Get all prompts and filter on Python side for proper Unicode support
-                # SQLite's LOWER() doesn't work correctly with Cyrillic and other non-ASCII characters
-                all_prompts = session.exec(
-                    select(Prompt).order_by(Prompt.usage_count.desc())
-                ).all()
-
-                # Filter prompts that contain all words (case-insensitive)
-                matched = []
-                for prompt in all_prompts:
-                    body_lower = prompt.body.lower()
-                    if all(word in body_lower for word in words):
-                        matched.append(prompt)
-                        if len(matched) >= limit:
-                            break
+                ids = self._query_ids(session, query)
+                matched = self._get_prompts_by_ids(session, ids[:limit])
 
                 if not matched:
                     logger.debug(
-                        "No prompts matched search", query=q, words_count=len(words)
+                        "No prompts matched search",
+                        query=q,
+                        terms_count=len(query.terms),
                     )
                     return []
 
@@ -221,6 +992,108 @@ class DatabaseManager:
             logger.error("Search failed", query=q, error=str(e))
             raise
 
+    def mount(self, path, name: str | None = None) -> str:
+        """Attach a read-only library searched by search_federated.
+
+        path is a database file or a prompt pack (.pack). Returns the name
+        results from the library are labelled with.
+        """
+        name = name or Path(path).stem
+        base, suffix = name, 2
+        while name in self.mounts:
+            name = f"{base}-{suffix}"
+            suffix += 1
+        if Path(path).suffix == PACK_SUFFIX:
+            self.mounts[name] = PromptPack(path)
+        else:
+            self.mounts[name] = DatabaseManager(path, read_only=True)
+        if self._mount_pool is None:
+            self._mount_pool = ThreadPoolExecutor(
+                max_workers=MOUNT_SEARCH_WORKERS, thread_name_prefix="mount-search"
+            )
+        self.generation += 1
+        logger.info("Library mounted", name=name, path=str(path))
+        return name
+
+    def unmount(self, name: str):
+        library = self.mounts.pop(name, None)
+        if library is not None:
+            library.close()
+            self.generation += 1
+            logger.info("Library unmounted", name=name)
+
+    def _search_mount(self, name: str, library, q: str, limit: int):
+        try:
+            return library.search_prompts(q, limit=limit)
+        except Exception as e:
+            logger.error("Mounted library search failed", name=name, error=str(e))
+            return []
+
+    def search_federated(self, q, limit=50):
+        """Search this library and all mounts concurrently.
+
+        Each library contributes its top `limit` matches; these are merged in
+        display order (most used first) and cut to `limit`. Returns
+        (matched, related_map, cross_refs, sources) like search_prompts, where
+        sources maps ids of prompts from mounted libraries to the mount name,
+        or [] when nothing matched.
+        """
+        if not self.mounts:
+            result = self.search_prompts(q, limit=limit)
+            return (*result, {}) if result else []
+
+        futures = {
+            name: self._mount_pool.submit(self._search_mount, name, library, q, limit)
+            for name, library in self.mounts.items()
+        }
+        # The writable library is searched on the calling thread meanwhile
+        results = {None: self.search_prompts(q, limit=limit)}
+        for name, future in futures.items():
+            results[name] = future.result()
+
+        ranked = []
+        related_map = {}
+        cross_refs = {}
+        sources = {}
+        for name, result in results.items():
+            if not result:
+                continue
+            matched, related, cross = result
+            ranked.append([(prompt, name) for prompt in matched])
+            related_map.update(related)
+            cross_refs.update(cross)
+            if name is not None:
+                for pairs in (*related.values(), *cross.values()):
+                    for prompt, _ in pairs:
+                        sources.setdefault(prompt.id, name)
+
+        matched = []
+        seen = set()
+        for prompt, name in heapq.merge(
+            *ranked, key=lambda item: (-item[0].usage_count, item[0].created_at)
+        ):
+            if prompt.id in seen:
+                continue  # The same prompt in several libraries: first one wins
+            seen.add(prompt.id)
+            matched.append(prompt)
+            if name is None:
+                sources.pop(prompt.id, None)
+            else:
+                sources[prompt.id] = name
+            if len(matched) >= limit:
+                break
+        if not matched:
+            return []
+
+        logger.debug(
+            "Federated search completed",
+            query=q,
+            libraries_count=len(results),
+            matched_count=len(matched),
+            mounted_count=len(sources),
+        )
+        return matched, related_map, cross_refs, sources
+
     def get_all_prompts_grouped(self):
         """Get all prompts ordered by usage count."""
         return self.get_all_prompts()
@@ -231,7 +1104,7 @@ class DatabaseManager:
             return
 
         try:
-            with Session(self.engine) as session:
+            with self._write_lock, Session(self.engine) as session:
                 relations_updated = 0
                 relations_created = 0
 
@@ -239,6 +1112,7 @@ class DatabaseManager:
                 for i in range(len(prompt_ids)):
                     for j in range(i + 1, len(prompt_ids)):
                         id1, id2 = sorted([prompt_ids[i], prompt_ids[j]])
+                        self._journal(session, "relation", id1, related_id=id2, delta=1)
 
                         # Check if relation exists
                         existing = session.exec(
@@ -272,6 +1146,492 @@ class DatabaseManager:
             )
             raise
 
+    def _add_revision(
+        self, session, prompt: Prompt, body: str, created_at: str | None = None
+    ):
+        """Record the body a prompt is about to be changed to.
+
+        History starts lazily: the first edit also snapshots the original body.
+        """
+        if body == prompt.body:
+            return
+        revisions = session.exec(
+            select(PromptRevision.revision, PromptRevision.is_snapshot)
+            .where(PromptRevision.prompt_id == prompt.id)
+            .order_by(PromptRevision.revision.desc())
+            .limit(SNAPSHOT_INTERVAL)
+        ).all()
+        if not revisions:
+            session.add(
+                PromptRevision(
+                    prompt_id=prompt.id,
+                    revision=1,
+                    is_snapshot=True,
+                    data=encode_snapshot(prompt.body),
+                    body_length=len(prompt.body),
+                    created_at=prompt.updated_at,
+                )
+            )
+            revisions = [(1, True)]
+
+        # Snapshot once the chain since the last snapshot is full
+        is_snapshot = not any(snapshot for _, snapshot in revisions)
+        data = encode_snapshot(body)
+        if not is_snapshot:
+            delta = encode_delta(prompt.body, body)
+            is_snapshot = len(delta) >= len(data)
+            data = data if is_snapshot else delta
+        session.add(
+            PromptRevision(
+                prompt_id=prompt.id,
+                revision=revisions[0][0] + 1,
+                is_snapshot=is_snapshot,
+                data=data,
+                body_length=len(body),
+                **({"created_at": created_at} if created_at else {}),
+            )
+        )
+
+    def get_prompt_revisions(self, pid: str) -> list[tuple[int, str, int]]:
+        """Get (revision, created_at, body_length) of a prompt, newest first."""
+        with Session(self.engine) as session:
+            return session.exec(
+                select(
+                    PromptRevision.revision,
+                    PromptRevision.created_at,
+                    PromptRevision.body_length,
+                )
+                .where(PromptRevision.prompt_id == pid)
+                .order_by(PromptRevision.revision.desc())
+            ).all()
+
+    def get_revision_body(self, pid: str, revision: int) -> str | None:
+        """Rebuild a past body from the nearest snapshot and following deltas."""
+        with Session(self.engine) as session:
+            base = session.exec(
+                select(func.max(PromptRevision.revision)).where(
+                    PromptRevision.prompt_id == pid,
+                    PromptRevision.is_snapshot,
+                    PromptRevision.revision <= revision,
+                )
+            ).one()
+            if base is None:
+                return None
+            chain = session.exec(
+                select(PromptRevision)
+                .where(
+                    PromptRevision.prompt_id == pid,
+                    PromptRevision.revision >= base,
+                    PromptRevision.revision <= revision,
+                )
+                .order_by(PromptRevision.revision)
+            ).all()
+        body = decode_snapshot(chain[0].data)
+        for entry in chain[1:]:
+            body = apply_delta(body, entry.data)
+        return body
+
+    def get_prompt_signatures(self) -> dict[str, tuple[str, bytes]]:
+        """Get stored {prompt_id: (body_hash, signature)}."""
+        with Session(self.engine) as session:
+            return {
+                sig.prompt_id: (sig.body_hash, sig.signature)
+                for sig in session.exec(select(PromptSignature))
+            }
+
+    def save_prompt_signatures(
+        self, signatures: list[tuple[str, str, bytes]], stale_ids: list[str]
+    ):
+        """Store (prompt_id, body_hash, signature) rows and drop stale ones."""
+        replaced = [pid for pid, _, _ in signatures] + stale_ids
+        # Serialized with deletes, which would otherwise race and orphan rows
+        with self._write_lock, Session(self.engine) as session:
+            for i in range(0, len(replaced), IN_CHUNK_SIZE):
+                chunk = replaced[i : i + IN_CHUNK_SIZE]
+                session.execute(
+                    delete(PromptSignature).where(PromptSignature.prompt_id.in_(chunk))
+                )
+            session.add_all(
+                PromptSignature(prompt_id=pid, body_hash=digest, signature=signature)
+                for pid, digest, signature in signatures
+            )
+            session.commit()
+
+    def merge_prompts(self, keep_id: str, merge_ids: list[str]):
+        """Fold prompts into one: usage, relations and tags move to keep_id.
+
+        The merged prompts are deleted afterwards.
+        """
+        merge_ids = [pid for pid in dict.fromkeys(merge_ids) if pid != keep_id]
+        if not merge_ids:
+            return
+        merged = set(merge_ids)
+        tag_index = self._get_tag_index()
+        names = set(tag_index.tags_of(keep_id))
+        for pid in merge_ids:
+            names.update(tag_index.tags_of(pid))
+        names = sorted(names)
+
+        try:
+            with self._write_lock, Session(self.engine) as session:
+                keep = session.get(Prompt, keep_id)
+                if keep is None:
+                    logger.warning("Prompt not found for merge", prompt_id=keep_id)
+                    return
+                others = self._get_prompts_by_ids(session, merge_ids)
+                usage = sum(prompt.usage_count for prompt in others)
+                if usage:
+                    keep.usage_count += usage
+                    self._journal_usage(session, {keep_id: usage})
+
+                relations = session.exec(
+                    select(PromptRelation).where(
+                        PromptRelation.prompt_id_1.in_(merge_ids)
+                        | PromptRelation.prompt_id_2.in_(merge_ids)
+                    )
+                ).all()
+                for relation in relations:
+                    partner = (
+                        relation.prompt_id_2
+                        if relation.prompt_id_1 in merged
+                        else relation.prompt_id_1
+                    )
+                    session.delete(relation)
+                    if partner == keep_id or partner in merged:
+                        continue
+                    id1, id2 = sorted([keep_id, partner])
+                    self._journal(
+                        session,
+                        "relation",
+                        id1,
+                        related_id=id2,
+                        delta=relation.strength,
+                    )
+                    existing = session.exec(
+                        select(PromptRelation).where(
+                            (PromptRelation.prompt_id_1 == id1)
+                            & (PromptRelation.prompt_id_2 == id2)
+                        )
+                    ).first()
+                    if existing:
+                        existing.strength += relation.strength
+                        existing.updated_at = datetime.now(timezone.utc).isoformat()
+                    else:
+                        session.add(
+                            PromptRelation(
+                                prompt_id_1=id1,
+                                prompt_id_2=id2,
+                                strength=relation.strength,
+                            )
+                        )
+                    # Make the new row visible to later iterations
+                    session.flush()
+
+                self._write_tags(session, keep_id, names)
+                self._journal(session, "tags", keep_id, body=",".join(names))
+                for table in (PromptTag, PromptRevision, PromptSignature):
+                    session.execute(delete(table).where(table.prompt_id.in_(merge_ids)))
+                for prompt in others:
+                    session.delete(prompt)
+                    self._journal(session, "delete", prompt.id)
+                session.commit()
+        except Exception as e:
+            logger.error(
+                "Failed to merge prompts",
+                prompt_id=keep_id,
+                merged_ids=merge_ids,
+                error=str(e),
+            )
+            raise
+
+        tag_index.set_tags(keep_id, names)
+        for prompt in others:
+            tag_index.remove(prompt.id)
+            self._set_search_body(prompt.id, None)
+            self._notify("deleted", prompt.id)
+        self._notify("usage", keep_id)
+        self._notify("tagged", keep_id)
+        logger.info(
+            "Prompts merged",
+            prompt_id=keep_id,
+            merged_count=len(others),
+            usage_added=usage,
+        )
+
+    def get_all_tags(self) -> list[str]:
+        return self._get_tag_index().all_tags()
+
+    def get_prompt_tags(self, pid: str) -> list[str]:
+        return self._get_tag_index().tags_of(pid)
+
+    def _write_tags(self, session, pid: str, names: list[str]):
+        """Replace the tag rows of a prompt, creating missing tags."""
+        session.execute(delete(PromptTag).where(PromptTag.prompt_id == pid))
+        for name in names:
+            tag = session.exec(select(Tag).where(Tag.name == name)).first()
+            if tag is None:
+                tag = Tag(name=name)
+                session.add(tag)
+                session.flush()
+            session.add(PromptTag(prompt_id=pid, tag_id=tag.id))
+
+    def set_prompt_tags(self, pid: str, tags: list[str]):
+        """Replace the tags of a prompt."""
+        names = sorted({TagIndex.normalize(tag) for tag in tags} - {""})
+        try:
+            with self._write_lock, Session(self.engine) as session:
+                if session.get(Prompt, pid) is None:
+                    logger.warning("Prompt not found for tagging", prompt_id=pid)
+                    return
+                self._write_tags(session, pid, names)
+                self._journal(session, "tags", pid, body=",".join(names))
+                session.commit()
+            self._get_tag_index().set_tags(pid, names)
+            logger.debug("Prompt tags updated", prompt_id=pid, tags=names)
+            self._notify("tagged", pid)
+        except Exception as e:
+            logger.error("Failed to update prompt tags", prompt_id=pid, error=str(e))
+            raise
+
+    def record_selection(self, prompt_ids: list[str]):
+        """Store an ordered multi-prompt copy for bundle mining."""
+        with self._write_lock, Session(self.engine) as session:
+            session.add(SelectionHistory(prompt_ids=",".join(prompt_ids)))
+            session.commit()
+
+    def get_selection_history(self, after_id: int = 0) -> list[tuple[int, list[str]]]:
+        """Get (id, ordered prompt ids) of selections recorded after after_id."""
+        with Session(self.engine) as session:
+            rows = session.exec(
+                select(SelectionHistory.id, SelectionHistory.prompt_ids)
+                .where(SelectionHistory.id > after_id)
+                .order_by(SelectionHistory.id)
+            ).all()
+        return [(row_id, prompt_ids.split(",")) for row_id, prompt_ids in rows]
+
+    def add_maintenance_run(self, run: MaintenanceRun):
+        with self._write_lock, Session(self.engine) as session:
+            session.add(run)
+            session.commit()
+            session.refresh(run)
+
+    def get_last_maintenance_run(self) -> MaintenanceRun | None:
+        """Get the newest maintenance run that was not interrupted."""
+        with Session(self.engine) as session:
+            return session.exec(
+                select(MaintenanceRun)
+                .where(not_(MaintenanceRun.interrupted))
+                .order_by(MaintenanceRun.id.desc())
+            ).first()
+
+    def get_journal_clocks(self) -> dict[str, int]:
+        """Get the highest journaled clock per origin node."""
+        with Session(self.engine) as session:
+            return dict(
+                session.exec(
+                    select(ChangeLog.node_id, func.max(ChangeLog.clock)).group_by(
+                        ChangeLog.node_id
+                    )
+                ).all()
+            )
+
+    def get_changes_since(self, clocks: dict[str, int]) -> list[ChangeLog]:
+        """Get journal entries newer than the given per-node clocks."""
+        changes = []
+        with Session(self.engine) as session:
+            for node_id, clock in self.get_journal_clocks().items():
+                seen = clocks.get(node_id, 0)
+                if clock <= seen:
+                    continue
+                changes.extend(
+                    session.exec(
+                        select(ChangeLog)
+                        .where(ChangeLog.node_id == node_id, ChangeLog.clock > seen)
+                        .order_by(ChangeLog.clock)
+                    ).all()
+                )
+        # Lamport order keeps each prompt's changes causally ordered
+        changes.sort(key=lambda c: (c.clock, c.node_id))
+        return changes
+
+    def apply_changes(self, changes: list[ChangeLog]) -> int:
+        """Replay journal entries from another database.
+
+        Conflict rules:
+        - bodies and tags: last writer wins by (clock, node_id)
+        - deletes win over any other change to the same prompt
+        - usage counts and relation strengths are added together; a usage
+          reset cancels the per-node usage it had seen, not concurrent uses
+        """
+        if not changes:
+            return 0
+
+        events = []  # (event, prompt_id, body) to publish after commit
+        try:
+            with self._write_lock, Session(self.engine) as session:
+                for change in changes:
+                    self.clock = max(self.clock, change.clock)
+                    events.extend(self._apply_change(session, change))
+                    session.add(
+                        ChangeLog(
+                            **change.model_dump(exclude={"id"}),
+                        )
+                    )
+                session.commit()
+        except Exception as e:
+            logger.error(
+                "Failed to apply changes", changes_count=len(changes), error=str(e)
+            )
+            raise
+
+        for event, pid, body in events:
+            if event in ("added", "updated", "deleted"):
+                self._set_search_body(pid, body)
+            if event in ("tagged", "deleted"):
+                # Rebuilt lazily from the tag tables
+                self._tag_index = None
+            self._notify(event, pid)
+        logger.info(
+            "Changes applied",
+            changes_count=len(changes),
+            prompts_changed=len({pid for _, pid, _ in events}),
+        )
+        return len(changes)
+
+    def _is_deleted(self, session, pid: str) -> bool:
+        return (
+            session.exec(
+                select(ChangeLog.id).where(
+                    ChangeLog.prompt_id == pid, ChangeLog.op == "delete"
+                )
+            ).first()
+            is not None
+        )
+
+    def _latest_change(self, session, pid: str, ops) -> ChangeLog | None:
+        """Get the newest journal entry of pid among ops, by (clock, node_id)."""
+        return session.exec(
+            select(ChangeLog)
+            .where(ChangeLog.prompt_id == pid, ChangeLog.op.in_(ops))
+            .order_by(ChangeLog.clock.desc(), ChangeLog.node_id.desc())
+        ).first()
+
+    def _apply_change(self, session, change: ChangeLog) -> list[tuple]:
+        pid = change.prompt_id
+        if change.op == "delete":
+            session.execute(delete(PromptTag).where(PromptTag.prompt_id == pid))
+            session.execute(
+                delete(PromptRevision).where(PromptRevision.prompt_id == pid)
+            )
+            session.execute(
+                delete(PromptSignature).where(PromptSignature.prompt_id == pid)
+            )
+            session.execute(
+                delete(PromptRelation).where(
+                    (PromptRelation.prompt_id_1 == pid)
+                    | (PromptRelation.prompt_id_2 == pid)
+                )
+            )
+            prompt = session.get(Prompt, pid)
+            if prompt:
+                session.delete(prompt)
+                return [("deleted", pid, None)]
+            return []
+
+        if self._is_deleted(session, pid) or (
+            change.related_id and self._is_deleted(session, change.related_id)
+        ):
+            return []
+
+        if change.op in BODY_OPS:
+            latest = self._latest_change(session, pid, BODY_OPS)
+            if latest and (latest.clock, latest.node_id) > (
+                change.clock,
+                change.node_id,
+            ):
+                return []
+            prompt = session.get(Prompt, pid)
+            if prompt is None:
+                session.add(
+                    Prompt(
+                        id=pid,
+                        body=change.body,
+                        created_at=change.created_at,
+                        updated_at=change.created_at,
+                    )
+                )
+                return [("added", pid, change.body)]
+            self._add_revision(session, prompt, change.body, change.created_at)
+            prompt.body = change.body
+            prompt.updated_at = change.created_at
+            return [("updated", pid, change.body)]
+
+        if change.op == "tags":
+            latest = self._latest_change(session, pid, ("tags",))
+            if latest and (latest.clock, latest.node_id) > (
+                change.clock,
+                change.node_id,
+            ):
+                return []
+            if session.get(Prompt, pid) is None:
+                return []
+            self._write_tags(session, pid, [n for n in change.body.split(",") if n])
+            return [("tagged", pid, None)]
+
+        if change.op in ("usage", "usage_reset"):
+            prompt = session.get(Prompt, pid)
+            if prompt is None:
+                return []
+            totals = self._usage_totals(session, pid)
+            resets = session.exec(
+                select(ChangeLog.body).where(
+                    ChangeLog.prompt_id == pid, ChangeLog.op == "usage_reset"
+                )
+            ).all()
+            if change.op == "usage":
+                totals[change.node_id] = max(
+                    totals.get(change.node_id, 0), change.delta
+                )
+            else:
+                resets.append(change.body)
+            # Each reset cancels the per-node totals it had seen
+            cancelled = {}
+            for body in resets:
+                for node_id, total in json.loads(body).items():
+                    cancelled[node_id] = max(cancelled.get(node_id, 0), total)
+            prompt.usage_count = sum(
+                max(0, total - cancelled.get(node_id, 0))
+                for node_id, total in totals.items()
+            )
+            return [("usage", pid, None)]
+
+        if change.op == "relation":
+            if not (
+                session.get(Prompt, pid) and session.get(Prompt, change.related_id)
+            ):
+                return []
+            existing = session.exec(
+                select(PromptRelation).where(
+                    (PromptRelation.prompt_id_1 == pid)
+                    & (PromptRelation.prompt_id_2 == change.related_id)
+                )
+            ).first()
+            if existing:
+                existing.strength += change.delta
+                existing.updated_at = change.created_at
+            else:
+                session.add(
+                    PromptRelation(
+                        prompt_id_1=pid,
+                        prompt_id_2=change.related_id,
+                        strength=change.delta,
+                    )
+                )
+            return []
+
+        logger.warning("Unknown change skipped", op=change.op, prompt_id=pid)
+        return []
+
     def is_empty(self):
         with Session(self.engine) as session:
             return not session.exec(select(Prompt)).first()
@@ -281,6 +1641,10 @@ class DatabaseManager:
             setting = session.get(Setting, key)
             return setting.value if setting else default
 
+    def get_all_settings(self) -> dict[str, str]:
+        with Session(self.engine) as session:
+            return {s.key: s.value for s in session.exec(select(Setting))}
+
     def set_setting(self, key: str, value: str):
         with Session(self.engine) as session:
             setting = session.get(Setting, key)
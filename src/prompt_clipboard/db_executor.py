@@ -0,0 +1,152 @@
+"""
+Asynchronous facade running DatabaseManager work on a single owner thread.
+
+GUI slots submit callables and get a Future back; results can be delivered to
+a callback on the GUI thread through a queued Qt signal. Usage increments are
+fire-and-forget: they are accumulated in memory and written by one batched
+transaction once the worker gets to them, so bursts of activations cost a
+single commit.
+"""
+
+import queue
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from PySide6.QtCore import QObject, Signal
+
+from prompt_clipboard.config.logging import logger
+from prompt_clipboard.database import DatabaseManager
+
+_STOP = object()
+
+
+class DatabaseExecutor(QObject):
+    """Owner thread for database calls made on behalf of the GUI."""
+
+    # Emitted from the worker thread, delivered on the GUI thread
+    _finished = Signal(object, object)  # callback, future
+
+    def __init__(self, db_manager: DatabaseManager):
+        super().__init__()
+        self.db_manager = db_manager
+        self._queue = queue.SimpleQueue()
+        self._usage_lock = threading.Lock()
+        self._pending_usage = Counter()
+        self._usage_flush_queued = False
+        self._thread = None
+        self._finished.connect(self._deliver)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="db-executor", daemon=True
+        )
+        self._thread.start()
+        logger.info("Database executor started")
+
+    def _run(self):
+        while True:
+            task = self._queue.get()
+            if task is _STOP:
+                break
+            future, fn, args, kwargs = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                logger.error(
+                    "Database task failed",
+                    task=getattr(fn, "__name__", repr(fn)),
+                    error=str(e),
+                )
+                future.set_exception(e)
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Run fn(*args, **kwargs) on the executor thread."""
+        future = Future()
+        if self._thread is None:
+            future.set_exception(RuntimeError("Database executor is not running"))
+            return future
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def call(self, fn, *args, callback=None, **kwargs) -> Future:
+        """Like submit(), but pass the result to callback on the GUI thread.
+
+        The callback is skipped if the call failed; the error is logged.
+        """
+        future = self.submit(fn, *args, **kwargs)
+        if callback is not None:
+            future.add_done_callback(lambda f: self._finished.emit(callback, f))
+        return future
+
+    def _deliver(self, callback, future: Future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        try:
+            callback(future.result())
+        except Exception as e:
+            logger.error("Database result callback failed", error=str(e))
+
+    def increment_usage(self, pid: str):
+        """Count a prompt use; written asynchronously, coalesced with others."""
+        with self._usage_lock:
+            self._pending_usage[pid] += 1
+            if self._usage_flush_queued:
+                return
+            self._usage_flush_queued = True
+        self.submit(self._flush_usage)
+
+    def _flush_usage(self):
+        with self._usage_lock:
+            counts, self._pending_usage = self._pending_usage, Counter()
+            self._usage_flush_queued = False
+        if counts:
+            self.db_manager.increment_usage_many(counts)
+            logger.debug(
+                "Usage counts written",
+                prompts_count=len(counts),
+                uses_count=sum(counts.values()),
+            )
+
+    @contextmanager
+    def paused(self):
+        """Keep the worker idle for the duration of the block.
+
+        Queued work, including pending usage counts, finishes first. Calls
+        submitted meanwhile run after the block. Must not be used from a task.
+        """
+        if self._thread is None:
+            yield
+            return
+        idle = threading.Event()
+        resume = threading.Event()
+
+        def hold():
+            idle.set()
+            resume.wait()
+
+        self.submit(self._flush_usage)
+        self.submit(hold)
+        idle.wait()
+        try:
+            yield
+        finally:
+            resume.set()
+
+    def stop(self, timeout: float = 5):
+        """Finish queued work, including pending usage counts, and stop."""
+        if self._thread is None:
+            return
+        self.submit(self._flush_usage)
+        self._queue.put(_STOP)
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            logger.warning("Database executor did not stop in time", timeout=timeout)
+        else:
+            logger.info("Database executor stopped")
+        self._thread = None
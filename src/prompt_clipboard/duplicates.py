@@ -0,0 +1,194 @@
+"""
+Near-duplicate prompt detection with MinHash signatures and LSH.
+
+Bodies are cut into overlapping word shingles. Each prompt gets a MinHash
+signature using one-permutation hashing: every shingle is hashed once and
+kept if it is the minimum of one of NUM_BINS bins, with empty bins filled
+from their neighbors (rotation densification). The share of equal bins
+between two signatures estimates the Jaccard similarity of their shingle sets.
+
+Signatures are split into LSH bands; prompts sharing any band bucket become
+candidates and only those are compared, so finding clusters is roughly
+linear in library size. Signatures are stored in the database and recomputed
+only for prompts whose body changed since the last run.
+"""
+
+import hashlib
+import operator
+import re
+from array import array
+
+from prompt_clipboard.config.logging import logger
+from prompt_clipboard.database import DatabaseManager
+
+SHINGLE_WORDS = 3
+NUM_BINS = 128
+# 8 rows per band: pairs above ~0.7 similarity become candidates, and a pair
+# at 0.8 is found with ~95% probability
+LSH_BANDS = 16
+DEFAULT_THRESHOLD = 0.8
+# Prompts signed between progress reports
+PROGRESS_STEP = 500
+
+_TOKEN_RE = re.compile(r"\w+")
+_HASH_MAX = (1 << 64) - 1
+# Offset added per bin a value is borrowed across while densifying
+_ROTATION = 0x9E3779B97F4A7C15
+
+
+def _hash(text: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def body_hash(body: str) -> str:
+    return hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def shingles(body: str) -> set[str]:
+    words = _TOKEN_RE.findall(body.casefold())
+    if len(words) <= SHINGLE_WORDS:
+        return {" ".join(words)} if words else set()
+    return {
+        " ".join(words[i : i + SHINGLE_WORDS])
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    }
+
+
+def signature(body: str) -> array:
+    """Compute the one-permutation MinHash signature of a body."""
+    bins = [None] * NUM_BINS
+    for shingle in shingles(body):
+        value = _hash(shingle)
+        index = value % NUM_BINS
+        if bins[index] is None or value < bins[index]:
+            bins[index] = value
+
+    result = array("Q", [_HASH_MAX] * NUM_BINS)
+    filled = [i for i, value in enumerate(bins) if value is not None]
+    if not filled:
+        return result
+    # Empty bins borrow from the next filled bin to the right
+    next_filled = filled[0] + NUM_BINS
+    for i in range(NUM_BINS - 1, -1, -1):
+        if bins[i] is not None:
+            next_filled = i
+            result[i] = bins[i]
+        else:
+            distance = next_filled - i
+            source = bins[next_filled % NUM_BINS]
+            result[i] = (source + distance * _ROTATION) & _HASH_MAX
+    return result
+
+
+def similarity(a, b) -> float:
+    """Estimate the Jaccard similarity of two signatures."""
+    return sum(map(operator.eq, a, b)) / NUM_BINS
+
+
+class _DisjointSet:
+    def __init__(self):
+        self._parent = {}
+
+    def find(self, item):
+        parent = self._parent.setdefault(item, item)
+        while parent != item:
+            grandparent = self._parent.setdefault(parent, parent)
+            self._parent[item] = grandparent
+            item, parent = parent, grandparent
+        return item
+
+    def items(self):
+        return list(self._parent)
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self._parent[root_b] = root_a
+
+
+class DuplicateFinder:
+    """Finds clusters of near-duplicate prompts."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+
+    def refresh_signatures(self, progress=None) -> dict[str, array]:
+        """Bring stored signatures up to date; returns {prompt_id: signature}.
+
+        progress(done, total) is called every PROGRESS_STEP prompts.
+        """
+        stored = self.db_manager.get_prompt_signatures()
+        signatures = {}
+        changed = []
+        bodies = self.db_manager.get_prompt_bodies()
+        for done, (pid, body) in enumerate(bodies, start=1):
+            if progress is not None and done % PROGRESS_STEP == 0:
+                progress(done, len(bodies))
+            digest = body_hash(body)
+            entry = stored.get(pid)
+            if entry is not None and entry[0] == digest:
+                signatures[pid] = array("Q", entry[1])
+                continue
+            sig = signature(body)
+            signatures[pid] = sig
+            changed.append((pid, digest, sig.tobytes()))
+
+        stale = [pid for pid in stored if pid not in signatures]
+        if changed or stale:
+            self.db_manager.save_prompt_signatures(changed, stale)
+        logger.debug(
+            "Prompt signatures refreshed",
+            prompts_count=len(signatures),
+            computed=len(changed),
+            removed=len(stale),
+        )
+        return signatures
+
+    def find_clusters(
+        self, threshold: float = DEFAULT_THRESHOLD, progress=None
+    ) -> list[list[str]]:
+        """Get groups of prompt ids whose bodies are near-duplicates.
+
+        Largest clusters come first; prompts within a cluster are in no order.
+        progress(done, total) reports the signature pass, the slow part.
+        """
+        # Tuples compare faster than arrays of unsigned values
+        signatures = {
+            pid: tuple(sig) for pid, sig in self.refresh_signatures(progress).items()
+        }
+        rows = NUM_BINS // LSH_BANDS
+        buckets = {}
+        for pid, sig in signatures.items():
+            if sig[0] == _HASH_MAX:
+                continue  # No words to compare
+            for band in range(LSH_BANDS):
+                key = (band, tuple(sig[band * rows : (band + 1) * rows]))
+                buckets.setdefault(key, []).append(pid)
+
+        # Compare each bucket member with the bucket's first member only
+        groups = _DisjointSet()
+        compared = set()
+        for members in buckets.values():
+            first = members[0]
+            for other in members[1:]:
+                pair = (first, other)
+                if pair in compared:
+                    continue
+                compared.add(pair)
+                if similarity(signatures[first], signatures[other]) >= threshold:
+                    groups.union(first, other)
+
+        clusters = {}
+        for pid in groups.items():
+            clusters.setdefault(groups.find(pid), []).append(pid)
+        result = [members for members in clusters.values() if len(members) > 1]
+        result.sort(key=len, reverse=True)
+        logger.info(
+            "Duplicate clusters found",
+            prompts_count=len(signatures),
+            candidate_pairs=len(compared),
+            clusters_count=len(result),
+        )
+        return result
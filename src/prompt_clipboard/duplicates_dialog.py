@@ -0,0 +1,173 @@
+from concurrent.futures import Future
+
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import (
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QMessageBox,
+    QProgressDialog,
+    QPushButton,
+    QTreeWidget,
+    QTreeWidgetItem,
+    QVBoxLayout,
+)
+
+from prompt_clipboard.config.logging import logger
+from prompt_clipboard.database import DatabaseManager
+from prompt_clipboard.db_executor import DatabaseExecutor
+from prompt_clipboard.duplicates import DuplicateFinder
+
+
+class DuplicatesDialog(QDialog):
+    """Lists clusters of near-duplicate prompts and merges them."""
+
+    # Emitted from the scanning thread, delivered on the GUI thread
+    _scan_progress = Signal(int, int)  # done, total
+    _scan_finished = Signal(object)  # future of the prompt clusters
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        parent=None,
+        db_executor: DatabaseExecutor | None = None,
+    ):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.db_executor = db_executor
+        self.finder = DuplicateFinder(db_manager)
+        self.merged = False
+        self._setup_ui()
+        self._scan_progress.connect(self._on_scan_progress)
+        self._scan_finished.connect(self._show_clusters)
+        self._start_scan()
+
+    def _setup_ui(self):
+        self.setWindowTitle("Near-Duplicate Prompts")
+        self.setModal(True)
+        self.resize(800, 500)
+
+        layout = QVBoxLayout(self)
+
+        self.summary = QLabel(self)
+        layout.addWidget(self.summary)
+
+        self.tree = QTreeWidget(self)
+        self.tree.setHeaderLabels(["Prompt", "Uses"])
+        self.tree.setColumnWidth(0, 680)
+        layout.addWidget(self.tree)
+
+        btn_layout = QHBoxLayout()
+        self.merge_btn = QPushButton("Merge Cluster", self)
+        self.merge_btn.setToolTip(
+            "Keep the selected prompt (or the most used one) and fold the others "
+            "into it"
+        )
+        self.close_btn = QPushButton("Close", self)
+        btn_layout.addStretch()
+        btn_layout.addWidget(self.merge_btn)
+        btn_layout.addWidget(self.close_btn)
+        layout.addLayout(btn_layout)
+
+        self.merge_btn.clicked.connect(self._on_merge)
+        self.close_btn.clicked.connect(self.accept)
+
+    def _start_scan(self):
+        """Find clusters off the GUI thread, showing progress meanwhile."""
+        self.tree.clear()
+        self.merge_btn.setEnabled(False)
+        self.summary.setText("Looking for near-duplicate prompts...")
+        self.progress = QProgressDialog(
+            "Looking for near-duplicate prompts...", None, 0, 0, self
+        )
+        self.progress.setWindowTitle("Please Wait")
+        self.progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.progress.setMinimumDuration(500)
+        if self.db_executor is None:
+            future = Future()
+            try:
+                future.set_result(self._scan())
+            except Exception as e:
+                future.set_exception(e)
+            self._show_clusters(future)
+            return
+        future = self.db_executor.submit(self._scan)
+        future.add_done_callback(self._scan_finished.emit)
+
+    def _scan(self) -> list[list]:
+        """Get the prompts of each cluster, most used first."""
+        clusters = []
+        for cluster in self.finder.find_clusters(progress=self._scan_progress.emit):
+            prompts = self.db_manager.get_prompts(cluster)
+            if len(prompts) >= 2:
+                prompts.sort(key=lambda p: p.usage_count, reverse=True)
+                clusters.append(prompts)
+        return clusters
+
+    def _on_scan_progress(self, done: int, total: int):
+        self.progress.setMaximum(total)
+        self.progress.setValue(done)
+
+    def _show_clusters(self, future: Future):
+        self.progress.close()
+        try:
+            clusters = future.result()
+        except Exception as e:
+            logger.error("Failed to find duplicate prompts", error=str(e))
+            QMessageBox.critical(self, "Error", f"Failed to find duplicates: {e}")
+            clusters = []
+
+        for prompts in clusters:
+            parent = QTreeWidgetItem(self.tree, [f"{len(prompts)} similar prompts"])
+            parent.setData(0, Qt.ItemDataRole.UserRole, None)
+            for prompt in prompts:
+                child = QTreeWidgetItem(
+                    parent,
+                    [prompt.body.replace("\n", " ")[:200], str(prompt.usage_count)],
+                )
+                child.setToolTip(0, prompt.body[:2000])
+                child.setData(0, Qt.ItemDataRole.UserRole, prompt.id)
+            parent.setExpanded(True)
+
+        count = self.tree.topLevelItemCount()
+        self.summary.setText(
+            f"{count} cluster(s) of near-duplicate prompts."
+            if count
+            else "No near-duplicate prompts found."
+        )
+        self.merge_btn.setEnabled(count > 0)
+
+    def _on_merge(self):
+        current = self.tree.currentItem()
+        if current is None:
+            QMessageBox.warning(self, "Warning", "Select a cluster to merge.")
+            return
+
+        parent = current.parent() or current
+        ids = [
+            parent.child(i).data(0, Qt.ItemDataRole.UserRole)
+            for i in range(parent.childCount())
+        ]
+        # Children are ordered by usage, so the first one is the default keeper
+        keep_id = current.data(0, Qt.ItemDataRole.UserRole) or ids[0]
+
+        reply = QMessageBox.question(
+            self,
+            "Confirm Merge",
+            f"Keep the selected prompt and merge {len(ids) - 1} other(s) into it?\n"
+            "Their usage, relations and tags move to the kept prompt.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        try:
+            self.db_manager.merge_prompts(keep_id, ids)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to merge prompts: {e}")
+            return
+        self.merged = True
+        self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(parent))
+        count = self.tree.topLevelItemCount()
+        self.summary.setText(f"{count} cluster(s) of near-duplicate prompts.")
+        self.merge_btn.setEnabled(count > 0)
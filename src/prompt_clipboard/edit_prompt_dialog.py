@@ -1,7 +1,10 @@
 from PySide6.QtWidgets import (
+    QComboBox,
     QDialog,
     QDialogButtonBox,
     QFormLayout,
+    QHBoxLayout,
+    QPushButton,
     QTextEdit,
 )
 
@@ -36,8 +39,44 @@ class EditPromptDialog(QDialog):
         buttons.rejected.connect(self.reject)
 
         layout.addRow("Prompt:", self.body_edit)
+
+        # Past versions; restoring loads one into the editor to save as new
+        revisions = self.db_manager.get_prompt_revisions(self.prompt_id)
+        if revisions:
+            self.history_combo = QComboBox(self)
+            for revision, created_at, body_length in revisions:
+                self.history_combo.addItem(
+                    f"#{revision} — {created_at[:19].replace('T', ' ')} "
+                    f"({body_length} chars)",
+                    revision,
+                )
+            restore_btn = QPushButton("Restore", self)
+            restore_btn.clicked.connect(self._on_restore_revision)
+            history_layout = QHBoxLayout()
+            history_layout.addWidget(self.history_combo, 1)
+            history_layout.addWidget(restore_btn)
+            layout.addRow("History:", history_layout)
+
         layout.addRow(buttons)
 
+    def _on_restore_revision(self):
+        revision = self.history_combo.currentData()
+        try:
+            body = self.db_manager.get_revision_body(self.prompt_id, revision)
+        except Exception as e:
+            logger.error(
+                "Failed to load prompt revision",
+                prompt_id=self.prompt_id,
+                revision=revision,
+                error=str(e),
+            )
+            return
+        if body is not None:
+            self.body_edit.setPlainText(body)
+            logger.debug(
+                "Prompt revision loaded", prompt_id=self.prompt_id, revision=revision
+            )
+
     def _on_accept(self):
         body = self.body_edit.toPlainText().strip()
         if body:
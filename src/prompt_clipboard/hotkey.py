@@ -2,38 +2,73 @@ from pynput import keyboard
 from PySide6.QtCore import QObject, Signal
 
 from prompt_clipboard.config.logging import logger
+from prompt_clipboard.profiling import profiler
+from prompt_clipboard.quick_slots import SLOTS_SETTING, load_slot_targets
+
+MODIFIER_NAMES = {
+    "ctrl": keyboard.Key.ctrl,
+    "alt": keyboard.Key.alt,
+    "shift": keyboard.Key.shift,
+    "meta": keyboard.Key.cmd,
+}
+
+# Left/right variants reported by the listener, mapped to the generic key
+_MODIFIER_KEYS = {
+    getattr(keyboard.Key, name): generic
+    for generic, names in (
+        (keyboard.Key.ctrl, ("ctrl", "ctrl_l", "ctrl_r")),
+        (keyboard.Key.alt, ("alt", "alt_l", "alt_r", "alt_gr")),
+        (keyboard.Key.shift, ("shift", "shift_l", "shift_r")),
+        (keyboard.Key.cmd, ("cmd", "cmd_l", "cmd_r")),
+    )
+    for name in names
+    if hasattr(keyboard.Key, name)
+}
+
+
+def parse_hotkey(sequence: str) -> tuple[frozenset, str | None]:
+    """Split "Ctrl+Alt+1" into ({Key.ctrl, Key.alt}, "1")."""
+    modifiers = set()
+    trigger_key = None
+    for part in sequence.split("+"):
+        part_lower = part.strip().lower()
+        if part_lower in MODIFIER_NAMES:
+            modifiers.add(MODIFIER_NAMES[part_lower])
+        else:
+            trigger_key = part_lower
+    return frozenset(modifiers), trigger_key
 
 
 class HotkeyManager(QObject):
     """Manages global hotkey detection and emits signal when triggered."""
 
     hotkey_pressed = Signal()
+    slot_triggered = Signal(str)  # quick slot hotkey, as configured
 
     def __init__(self, hotkey_sequence: str = "Ctrl+Alt+I"):
         super().__init__()
         self.listener = None
         self.hotkey_sequence = hotkey_sequence
         self._parse_hotkey(hotkey_sequence)
+        # {(modifiers, key): quick slot hotkey}, swapped whole on changes
+        self._slot_table = {}
 
     def _parse_hotkey(self, sequence: str):
         """Parse hotkey sequence string into modifiers and key."""
-        parts = sequence.split("+")
-        self.modifiers = set()
-        self.trigger_key = None
-
-        modifier_map = {
-            "ctrl": keyboard.Key.ctrl,
-            "alt": keyboard.Key.alt,
-            "shift": keyboard.Key.shift,
-            "meta": keyboard.Key.cmd,
-        }
-
-        for part in parts:
-            part_lower = part.strip().lower()
-            if part_lower in modifier_map:
-                self.modifiers.add(modifier_map[part_lower])
-            else:
-                self.trigger_key = part.strip().lower()
+        modifiers, self.trigger_key = parse_hotkey(sequence)
+        self.modifiers = set(modifiers)
+
+    def set_slot_hotkeys(self, hotkeys):
+        """Precompute the quick slot lookup used by the listener."""
+        table = {}
+        for hotkey in hotkeys:
+            modifiers, key = parse_hotkey(hotkey)
+            if not key or not modifiers:
+                logger.warning("Quick slot hotkey needs a modifier", hotkey=hotkey)
+                continue
+            table[(modifiers, key)] = hotkey
+        self._slot_table = table
+        logger.debug("Quick slot hotkeys set", hotkeys_count=len(table))
 
     def update_hotkey(self, hotkey_sequence: str):
         """Update hotkey sequence and restart listener."""
@@ -42,35 +77,50 @@ class HotkeyManager(QObject):
         self._parse_hotkey(hotkey_sequence)
         self.start()
 
+    def on_setting_changed(self, key: str, value: str):
+        """React to settings store changes."""
+        if key == "hotkey" and value != self.hotkey_sequence:
+            self.update_hotkey(value)
+        elif key == SLOTS_SETTING:
+            self.set_slot_hotkeys(load_slot_targets(value))
+
     def start(self):
         pressed = set()
+        held_modifiers = set()  # generic modifier keys currently held
 
         def _on_press(k):
             pressed.add(k)
-            logger.debug(f"Pressed: {k}, Modifiers: {pressed}")
-
+            modifier = _MODIFIER_KEYS.get(k)
+            if modifier is not None:
+                held_modifiers.add(modifier)
+            # Keys typed in other apps are never logged, only matched hotkeys
             try:
-                # Check if all required modifiers are pressed
-                if not self.modifiers.issubset(pressed):
+                key_char = getattr(k, "char", None)
+                key_char = key_char.lower() if key_char else None
+
+                # Check if all required modifiers are pressed and the trigger key matches
+                if key_char == self.trigger_key and self.modifiers.issubset(pressed):
+                    logger.debug("Hotkey triggered", hotkey=self.hotkey_sequence)
+                    with profiler.section("hotkey"):
+                        self.hotkey_pressed.emit()
                     return
 
-                # Check if trigger key matches
-                key_char = None
-                if hasattr(k, "char") and k.char:
-                    key_char = k.char.lower()
-                elif isinstance(k, keyboard.KeyCode):
-                    key_char = getattr(k, "char", "").lower()
-
-                if key_char == self.trigger_key:
-                    logger.debug("Hotkey triggered!")
-                    self.hotkey_pressed.emit()
+                # Quick slots: a single dict lookup; plain typing never gets here
+                if held_modifiers and key_char:
+                    slot = self._slot_table.get((frozenset(held_modifiers), key_char))
+                    if slot is not None:
+                        logger.debug("Quick slot triggered", hotkey=slot)
+                        with profiler.section("hotkey"):
+                            self.slot_triggered.emit(slot)
             except Exception as e:
-                logger.error(f"Error in hotkey check: {e}")
+                logger.error("Error in hotkey check", error=str(e))
 
         def _on_release(k):
-            logger.debug(f"Released: {k}")
             if k in pressed:
                 pressed.remove(k)
+            modifier = _MODIFIER_KEYS.get(k)
+            if modifier is not None:
+                held_modifiers.discard(modifier)
 
         self.listener = keyboard.Listener(on_press=_on_press, on_release=_on_release)
         self.listener.start()
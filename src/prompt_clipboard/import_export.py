@@ -0,0 +1,99 @@
+"""
+JSON import/export of the prompt library, and export to read-only packs.
+
+Format (version 1):
+
+    {
+        "version": 1,
+        "prompts": [
+            {"body": "...", "usage_count": 3, "created_at": "...", "tags": ["work"]}
+        ]
+    }
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+from prompt_clipboard.config.logging import logger
+from prompt_clipboard.database import DatabaseManager
+from prompt_clipboard.pack import write_pack
+
+EXPORT_VERSION = 1
+
+
+def export_prompts(db_manager: DatabaseManager, path: Path) -> int:
+    """Write all prompts with their tags to a JSON file. Returns the count."""
+    prompts = [
+        {
+            "body": prompt.body,
+            "usage_count": prompt.usage_count,
+            "created_at": prompt.created_at,
+            "tags": db_manager.get_prompt_tags(prompt.id),
+        }
+        for prompt in db_manager.get_all_prompts()
+    ]
+    data = {"version": EXPORT_VERSION, "prompts": prompts}
+    Path(path).write_text(
+        json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+    logger.info("Prompts exported", path=str(path), prompts_count=len(prompts))
+    return len(prompts)
+
+
+def export_pack(db_manager: DatabaseManager, path: Path) -> int:
+    """Write all prompts with their tags to a prompt pack. Returns the count."""
+    prompts = (
+        (
+            prompt.id,
+            prompt.body,
+            prompt.usage_count,
+            prompt.created_at,
+            db_manager.get_prompt_tags(prompt.id),
+        )
+        for prompt in db_manager.get_all_prompts()
+    )
+    return write_pack(Path(path), prompts)
+
+
+def _parse_created_at(value) -> str | None:
+    """Get an ISO timestamp from an export, or None if it is missing or invalid."""
+    try:
+        return datetime.fromisoformat(str(value)).isoformat()
+    except ValueError:
+        return None
+
+
+def import_prompts(db_manager: DatabaseManager, path: Path) -> int:
+    """Add prompts from a JSON export, skipping bodies already present.
+
+    Usage counts, creation times and tags of imported prompts are kept. All
+    prompts are added in one transaction. Returns the number of prompts added.
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if data.get("version") != EXPORT_VERSION:
+        raise ValueError(f"Unsupported export version: {data.get('version')}")
+
+    existing = {body for _, body in db_manager.get_prompt_bodies()}
+    prompts = []
+    for entry in data.get("prompts", []):
+        body = str(entry.get("body", "")).strip()
+        if not body or body in existing:
+            continue
+        try:
+            usage_count = max(0, int(entry.get("usage_count") or 0))
+        except (TypeError, ValueError):
+            usage_count = 0
+        prompts.append(
+            (
+                body,
+                usage_count,
+                _parse_created_at(entry.get("created_at")),
+                [str(tag) for tag in entry.get("tags") or []],
+            )
+        )
+        existing.add(body)
+
+    added = len(db_manager.add_prompts(prompts))
+    logger.info("Prompts imported", path=str(path), prompts_added=added)
+    return added
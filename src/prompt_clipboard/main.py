@@ -1,10 +1,12 @@
 import sys
+from functools import partial
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QItemSelection, QItemSelectionModel, Qt, QTimer, Signal
 from PySide6.QtGui import QClipboard
 from PySide6.QtWidgets import (
     QApplication,
     QHBoxLayout,
+    QInputDialog,
     QLineEdit,
     QListWidget,
     QListWidgetItem,
@@ -14,12 +16,43 @@ from PySide6.QtWidgets import (
 )
 
 from prompt_clipboard.add_prompt_dialog import AddPromptDialog
+from prompt_clipboard.backup import BackupScheduler
+from prompt_clipboard.bundles import BundleMiner
+from prompt_clipboard.completion import CompletionIndex, SearchCompleter
 from prompt_clipboard.config import settings
 from prompt_clipboard.config.logging import logger
 from prompt_clipboard.database import DatabaseManager
+from prompt_clipboard.db_executor import DatabaseExecutor
 from prompt_clipboard.hotkey import HotkeyManager
+from prompt_clipboard.maintenance import MaintenanceScheduler
+from prompt_clipboard.memory import read_rss, release_freed_memory, to_mb
+from prompt_clipboard.prompt_delegate import (
+    BadgeRole,
+    BundleRole,
+    MarkerRole,
+    PreviewRole,
+    PromptItemDelegate,
+    UsageRole,
+)
+from prompt_clipboard.profiling import profiler
 from prompt_clipboard.prompt_manager_window import PromptManagerWindow
+from prompt_clipboard.quick_slots import (
+    BUNDLE_TARGET,
+    PROMPT_TARGET,
+    QUERY_TARGET,
+    SLOTS_SETTING,
+    QuickSlots,
+    load_slot_targets,
+)
+from prompt_clipboard.search_query import parse_query
+from prompt_clipboard.settings_store import SettingsStore
 from prompt_clipboard.settings_window import SettingsWindow
+from prompt_clipboard.similarity import SimilarityIndex
+from prompt_clipboard.template_fill_dialog import TemplateFillDialog
+from prompt_clipboard.templates import TemplateCache, resolve_variables
+
+# Separator row between groups of related search results
+GROUP_SEPARATOR = "─" * 60
 
 
 # Clipboard helper
@@ -31,23 +64,59 @@ def copy_to_clipboard(text):
 
 # Overlay UI
 class Overlay(QWidget):
-    def __init__(self, db_manager, hotkey_manager):
+    visibility_changed = Signal(bool)
+
+    def __init__(self, db_manager, hotkey_manager, settings_store, db_executor):
         super().__init__()
         self.db_manager = db_manager
+        # Database work from slots runs here so the GUI never waits on SQLite
+        self.db_executor = db_executor
+        self._search_seq = 0  # Results of older searches are dropped
         self.hotkey_manager = hotkey_manager
-        # Track selection order
-        self.selection_order = []  # List of item widgets in order of selection
+        self.settings_store = settings_store
+        self.search_limit = settings_store.get_int("search_limit", 50)
+        self.similar_limit = settings_store.get_int("similar_limit", 3)
+        settings_store.changed.connect(self.on_setting_changed)
+        self.templates = TemplateCache(db_manager)
+        self.quick_slots = QuickSlots(db_manager, self.templates)
+        self.quick_slots.load(settings_store.get(SLOTS_SETTING))
+        self.similarity = SimilarityIndex(db_manager)
+        self.similarity.start()
+        self.completions = CompletionIndex(db_manager)
+        self.completions.start()
+        self.bundle_miner = BundleMiner(
+            db_manager,
+            min_support=settings_store.get_int("bundle_min_support", 3),
+            limit=settings_store.get_int("bundle_limit", 3),
+        )
+        self.bundle_miner.start()
+        # Bundles shown as rows, in display order: [[(prompt_id, body)]]
+        self._bundle_rows = []
+        # Selected prompts in selection order: {prompt_id: (prompt_id, body)}
+        self.selection_order = {}
+        # Mounted library names of displayed prompts: {prompt_id: name}
+        self._sources = {}
+        self._reset_similar_state()
         # frameless, always-on-top
         self.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.Tool)
         self.setWindowTitle(settings.app.name)
         self.setMinimumSize(400, 300)  # Set minimum size instead of fixed
         self.resize(900, 525)  # Set initial size
         self.search = QLineEdit(self)
-        self.search.setPlaceholderText("Search prompts...")
+        self.search.setPlaceholderText(
+            'Search prompts... (#tag, "phrase", -word, uses:>5, created:<2026-01, len:<500)'
+        )
+        self.completer = SearchCompleter(self.completions, self.search)
         self.list = QListWidget(self)
         self.list.setSelectionMode(QListWidget.SelectionMode.MultiSelection)
+        self.list.setUniformItemSizes(True)
+        self.delegate = PromptItemDelegate(self.list)
+        self.list.setItemDelegate(self.delegate)
+        self.list.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.list.setToolTip(
-            "Используйте Space для выбора/отмены, Ctrl+Click для множественного выбора"
+            "Используйте Space для выбора/отмены, Ctrl+Click для множественного выбора, "
+            "Ctrl+A — выбрать совпадения, Ctrl+G — группу, Ctrl+I — инвертировать, "
+            "Ctrl+S — назначить горячую клавишу, Alt+1…9 — скопировать набор"
         )
         self.add_btn = QPushButton("Add New Prompt", self)
         self.manage_btn = QPushButton("Manage Prompts", self)
@@ -62,65 +131,359 @@ class Overlay(QWidget):
         layout.addLayout(btn_layout)
         self.search.textChanged.connect(self.on_search)
         self.list.itemActivated.connect(self.on_activate)
-        self.list.itemSelectionChanged.connect(self.on_selection_changed)
+        self.list.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        self.list.verticalScrollBar().valueChanged.connect(self._request_similar)
         self.add_btn.clicked.connect(self.on_add)
         self.manage_btn.clicked.connect(self.on_manage)
         self.settings_btn.clicked.connect(self.on_settings)
         self.search.returnPressed.connect(self.on_search_enter)
         self.search.keyPressEvent = self.search_key_press
         self.list.keyPressEvent = self.list_key_press
+        # Memory held for the hidden overlay is released after a while
+        self._trim_timer = QTimer(self)
+        self._trim_timer.setSingleShot(True)
+        self._trim_timer.timeout.connect(self.trim_memory)
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key.Key_Escape:
             self.hide()
         super().keyPressEvent(event)
 
-    def on_selection_changed(self):
-        """Track the order of selection."""
-        current_selected = self.list.selectedItems()
+    def showEvent(self, event):
+        self._trim_timer.stop()
+        self.visibility_changed.emit(True)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        if settings.memory.idle_trim_minutes > 0:
+            self._trim_timer.start(int(settings.memory.idle_trim_minutes * 60_000))
+        self.visibility_changed.emit(False)
+        super().hideEvent(event)
+
+    @profiler.section("trim_memory")
+    def trim_memory(self):
+        """Drop list items and cold cache entries; present() rebuilds them."""
+        if self.isVisible():
+            return
+        rss_before = read_rss()
+        self._search_seq += 1  # Results still in flight are not displayed
+        self.list.clear()
+        self.selection_order = {}
+        self._sources = {}
+        self._bundle_rows = []
+        self._reset_similar_state()
+        self.delegate.clear_cache()
+        self.templates.shrink(self.quick_slots.prompt_ids())
+        self.db_executor.call(
+            self.db_manager.trim_memory,
+            settings.memory.hot_queries,
+            callback=partial(self._on_memory_trimmed, rss_before),
+        )
 
-        # Find newly selected items (not in selection_order yet)
-        for item in current_selected:
-            if item not in self.selection_order:
-                self.selection_order.append(item)
+    def _on_memory_trimmed(self, rss_before, _result):
+        release_freed_memory()
+        rss_after = read_rss()
+        logger.info(
+            "Memory trimmed",
+            rss_before_mb=to_mb(rss_before),
+            rss_after_mb=to_mb(rss_after),
+            freed_mb=(
+                to_mb(rss_before - rss_after)
+                if rss_before is not None and rss_after is not None
+                else None
+            ),
+        )
 
-        # Remove deselected items (in selection_order but not in current_selected)
-        items_to_remove = []
-        for item in self.selection_order:
-            if item not in current_selected:
-                items_to_remove.append(item)
+    def on_setting_changed(self, key: str, value: str):
+        if key == "search_limit":
+            self.search_limit = self.settings_store.get_int("search_limit", 50)
+        elif key == "similar_limit":
+            self.similar_limit = self.settings_store.get_int("similar_limit", 3)
+        elif key == SLOTS_SETTING:
+            self.quick_slots.load(value)
+        elif key in ("bundle_min_support", "bundle_limit"):
+            self.db_executor.submit(
+                self.bundle_miner.configure,
+                self.settings_store.get_int("bundle_min_support", 3),
+                self.settings_store.get_int("bundle_limit", 3),
+            )
 
-        for item in items_to_remove:
-            self.selection_order.remove(item)
+    def present(self, query: str = ""):
+        """Show the overlay with the search box set to query."""
+        self.show()
+        self.activateWindow()
+        self.raise_()
+        self.search.setText(query)
+        self.on_search(self.search.text())
+        self.search.setFocus()
+
+    @profiler.section("quick_slot")
+    def on_quick_slot(self, hotkey: str):
+        """Copy a quick slot's prompts, or open the overlay with its query."""
+        slot = self.quick_slots.get(hotkey)
+        if slot is None:
+            return
+        if slot.query is not None:
+            self.present(slot.query)
+            return
+        if not slot.prompts:
+            logger.warning("Quick slot has no prompts", hotkey=hotkey)
+            return
 
+        try:
+            text = slot.text
+            if text is None:
+                bodies = self._render_prompts(slot.prompts)
+                if bodies is None:
+                    return
+                text = "\n".join(bodies)
+            copy_to_clipboard(text)
+        except Exception as e:
+            logger.error("Failed to copy quick slot", hotkey=hotkey, error=str(e))
+            return
+
+        # Bookkeeping goes to the database thread after the copy
+        prompt_ids = [pid for pid, _ in slot.prompts]
+        for pid in prompt_ids:
+            self.db_executor.increment_usage(pid)
+        if len(prompt_ids) > 1:
+            self.db_executor.submit(self.db_manager.add_prompt_relations, prompt_ids)
+        logger.debug("Quick slot copied", hotkey=hotkey, prompts_count=len(prompt_ids))
+
+    def bind_quick_slot(self):
+        """Bind a hotkey to the selected prompts, or to the current query."""
+        prompts = list(self.selection_order.values())
+        if not prompts:
+            current = self.list.currentItem()
+            data = current.data(Qt.ItemDataRole.UserRole) if current else None
+            if current and current.data(BundleRole):
+                prompts = current.data(BundleRole)
+            elif data is not None:
+                prompts = [data]
+        prompt_ids = [pid for pid, _ in prompts if pid not in self._sources]
+        query = self.search.text().strip()
+        if len(prompt_ids) == 1:
+            target = f"{PROMPT_TARGET}{prompt_ids[0]}"
+        elif prompt_ids:
+            target = f"{BUNDLE_TARGET}{','.join(prompt_ids)}"
+        elif query:
+            target = f"{QUERY_TARGET}{query}"
+        else:
+            return
+
+        hotkey, ok = QInputDialog.getText(
+            self,
+            "Quick Slot",
+            "Hotkey (e.g. Ctrl+Alt+1), empty to cancel:",
+        )
+        hotkey = "+".join(part.strip() for part in hotkey.split("+"))
+        if not ok or not hotkey:
+            return
+        if hotkey.lower() == self.settings_store.get("hotkey", "").lower():
+            logger.warning("Quick slot hotkey is the overlay hotkey", hotkey=hotkey)
+            return
+        self.settings_store.set(SLOTS_SETTING, self.quick_slots.bound(hotkey, target))
+        logger.info("Quick slot bound", hotkey=hotkey, target=target)
+
+    def on_selection_changed(self, selected, deselected):
+        """Track the order of selection from selection deltas."""
+        for index in deselected.indexes():
+            data = index.data(Qt.ItemDataRole.UserRole)
+            if data is not None:
+                self.selection_order.pop(data[0], None)
+        for index in selected.indexes():
+            data = index.data(Qt.ItemDataRole.UserRole)
+            if data is not None:
+                self.selection_order.setdefault(data[0], data)
+
+    def _prompt_rows_selection(self, rows) -> QItemSelection:
+        """Build a selection of the prompt rows among ascending rows.
+
+        Consecutive prompt rows are merged into ranges, skipping separators.
+        """
+        selection = QItemSelection()
+        model = self.list.model()
+        start = previous = None
+        for row in rows:
+            item = self.list.item(row)
+            if item.data(Qt.ItemDataRole.UserRole) is None:
+                continue
+            if start is not None and row != previous + 1:
+                selection.select(model.index(start, 0), model.index(previous, 0))
+                start = None
+            if start is None:
+                start = row
+            previous = row
+        if start is not None:
+            selection.select(model.index(start, 0), model.index(previous, 0))
+        return selection
+
+    def select_all_matches(self):
+        """Select matched prompts, or every prompt if the search matched nothing."""
+        rows = [
+            row
+            for row in range(self.list.count())
+            if self.list.item(row).data(MarkerRole) == "✓"
+        ] or range(self.list.count())
+        self.list.selectionModel().select(
+            self._prompt_rows_selection(rows), QItemSelectionModel.SelectionFlag.Select
+        )
+
+    def select_group(self):
+        """Select all prompts between the group separators around the current row."""
+        current = self.list.currentRow()
+        if current < 0:
+            return
+        first = current
+        while first > 0 and self.list.item(first - 1).text() != GROUP_SEPARATOR:
+            first -= 1
+        last = current
+        while (
+            last < self.list.count() - 1
+            and self.list.item(last + 1).text() != GROUP_SEPARATOR
+        ):
+            last += 1
+        self.list.selectionModel().select(
+            self._prompt_rows_selection(range(first, last + 1)),
+            QItemSelectionModel.SelectionFlag.Select,
+        )
+
+    def invert_selection(self):
+        self.list.selectionModel().select(
+            self._prompt_rows_selection(range(self.list.count())),
+            QItemSelectionModel.SelectionFlag.Toggle,
+        )
+
+    @profiler.section("on_search")
     def on_search(self, text):
-        self.list.clear()
-        self.selection_order = []  # Reset selection order on new search
         text = text.strip()
+        self._search_seq += 1
+        self.db_executor.call(
+            self._query,
+            self._search_seq,
+            text,
+            callback=partial(self._show_results, self._search_seq, text),
+        )
+
+    @profiler.section("query")
+    def _query(self, seq, text):
+        """Load everything a search displays; runs on the database thread.
+
+        Returns (all_prompts, search_result, sources, bundles), where
+        search_result is None when the query is empty or matched nothing,
+        sources maps prompts from mounted libraries to their library name and
+        bundles lists the frequent bundles to offer. Returns None without
+        querying if the user has typed on since.
+        """
+        if seq != self._search_seq:
+            return None
+        all_prompts = self.db_manager.get_all_prompts()
+        if not text:
+            return all_prompts, None, {}, self._load_bundles()
+
+        # Search by phrase, in mounted libraries too
+        result = self.db_manager.search_federated(text, limit=self.search_limit)
+        if not result:
+            return all_prompts, None, {}, []
+        matched, related_map, cross_refs, sources = result
+        return (
+            all_prompts,
+            (matched, related_map, cross_refs),
+            sources,
+            self._load_bundles({prompt.id for prompt in matched}),
+        )
+
+    def _load_bundles(self, matched_ids: set[str] | None = None):
+        """Get [(prompts, support)] of the top bundles.
+
+        With matched_ids, only bundles containing a matched prompt are kept.
+        Bundles whose prompts no longer all exist are skipped.
+        """
+        bundles = []
+        for bundle in self.bundle_miner.top():
+            if matched_ids is not None and matched_ids.isdisjoint(bundle.prompt_ids):
+                continue
+            prompts = self.db_manager.get_prompts(list(bundle.prompt_ids))
+            if len(prompts) == len(bundle.prompt_ids):
+                bundles.append((prompts, bundle.support))
+        return bundles
+
+    @profiler.section("display_results")
+    def _show_results(self, seq, text, results):
+        if seq != self._search_seq or results is None:
+            return  # A newer search is on its way
+        all_prompts, found, self._sources, bundles = results
+
+        self.list.clear()
+        self.selection_order = {}  # Reset selection order on new search
+        self._reset_similar_state()
+        self.delegate.set_highlight_terms(parse_query(text).terms)
+        self._display_bundles(bundles)
 
         if not text:
             # Show all prompts when search is empty
-            rows = self.db_manager.get_all_prompts()
-            self.has_results = bool(rows)
-            self._display_prompts(rows)
+            self._display_prompts(all_prompts)
             return
 
-        # Search by phrase
-        result = self.db_manager.search_prompts(text)
-
-        if not result:
+        if found is None:
             # No matches - show all prompts
-            rows = self.db_manager.get_all_prompts()
-            self.has_results = False
-            self._display_prompts(rows)
+            self._display_prompts(all_prompts)
         else:
             # Show matched prompts with related ones grouped together
-            matched, related_map, cross_refs = result
-            self.has_results = True
-            self._display_search_results(matched, related_map, cross_refs)
+            self._display_search_results(*found, all_prompts)
 
         self.list.clearSelection()
         self.list.setCurrentRow(-1)
+        self._request_similar()
+
+    def _make_prompt_item(self, prompt, marker="", badge=None):
+        """Create a list item for a prompt, painted by PromptItemDelegate."""
+        # Display prompt - replace newlines with space for single-line display
+        body_display = prompt.body.replace("\n", " ")[:120]
+        text = f"{body_display} [{prompt.usage_count}]"
+        source = self._sources.get(prompt.id)
+        if source:
+            badge = f"{badge} · {source}" if badge else source
+        if marker:
+            text = f"{marker} {text}"
+        if badge:
+            text = f"{text} ({badge})"
+        item = QListWidgetItem(text)
+        item.setData(Qt.ItemDataRole.UserRole, (prompt.id, prompt.body))
+        item.setData(PreviewRole, body_display)
+        item.setData(UsageRole, prompt.usage_count)
+        if marker:
+            item.setData(MarkerRole, marker)
+        if badge:
+            item.setData(BadgeRole, badge)
+        return item
+
+    def _display_bundles(self, bundles):
+        """Display bundle rows, copied with Enter or Alt+<number>."""
+        self._bundle_rows = []
+        for number, (prompts, support) in enumerate(bundles, start=1):
+            previews = " + ".join(p.body.replace("\n", " ")[:40] for p in prompts)
+            badge = f"Alt+{number} · набор: {support}"
+            item = QListWidgetItem(f"📦 {previews} ({badge})")
+            # Bundle rows are copied as a whole, never part of a selection
+            item.setFlags(Qt.ItemFlag.ItemIsEnabled)
+            item.setData(Qt.ItemDataRole.UserRole, None)
+            item.setData(BundleRole, [(p.id, p.body) for p in prompts])
+            item.setData(PreviewRole, previews)
+            item.setData(MarkerRole, "📦")
+            item.setData(BadgeRole, badge)
+            self.list.addItem(item)
+            self._bundle_rows.append(item.data(BundleRole))
+        if bundles:
+            separator = QListWidgetItem(GROUP_SEPARATOR)
+            separator.setFlags(Qt.ItemFlag.NoItemFlags)
+            separator.setData(Qt.ItemDataRole.UserRole, None)
+            self.list.addItem(separator)
+
+    def copy_bundle(self, number: int):
+        """Copy the bundle shown in row number (1-based)."""
+        if 0 < number <= len(self._bundle_rows):
+            self._copy_prompts(self._bundle_rows[number - 1])
 
     def _display_prompts(self, prompts):
         """Display a simple list of prompts."""
@@ -132,16 +495,112 @@ class Overlay(QWidget):
                 separator.setData(Qt.ItemDataRole.UserRole, None)
                 self.list.addItem(separator)
 
-            # Display prompt - replace newlines with space for single-line display
-            body_display = prompt.body.replace("\n", " ")[:120]
-            item = QListWidgetItem(f"{body_display} [{prompt.usage_count}]")
-            item.setData(Qt.ItemDataRole.UserRole, (prompt.id, prompt.body))
-            self.list.addItem(item)
+            self.list.addItem(self._make_prompt_item(prompt))
+
+    def _reset_similar_state(self):
+        # Matched prompts whose similar prompts were not requested yet
+        self._similar_pending = set()
+        # Rows of the displayed results: {prompt_id: QListWidgetItem}
+        self._matched_items = {}
+        self._remaining_items = {}  # Prompts listed below the result groups
+        self._placed_ids = set()  # Prompts shown within the result groups
 
-    def _display_search_results(self, matched, related_map, cross_refs):
-        """Display matched prompts with their related prompts grouped."""
+    def _request_similar(self, *_):
+        """Look up similar prompts for matched rows scrolled into view.
+
+        Runs as its own database job after the results are shown, so typing
+        never waits on it; the rows are inserted when it finishes.
+        """
+        if not self._similar_pending or self.similar_limit <= 0:
+            return
+        viewport = self.list.viewport().rect()
+        first = max(self.list.indexAt(viewport.topLeft()).row(), 0)
+        last = self.list.indexAt(viewport.bottomLeft()).row()
+        if last < 0:
+            last = self.list.count() - 1
+        ids = []
+        for row in range(first, last + 1):
+            data = self.list.item(row).data(Qt.ItemDataRole.UserRole)
+            if data is not None and data[0] in self._similar_pending:
+                self._similar_pending.discard(data[0])
+                ids.append(data[0])
+        if ids:
+            self.db_executor.call(
+                self._find_similar,
+                self._search_seq,
+                ids,
+                callback=partial(self._show_similar, self._search_seq),
+            )
+
+    def _find_similar(self, seq, ids):
+        """Get content-similar prompts for matched prompts.
+
+        Returns {matched_id: [(similar_prompt, score), ...]}, or None if a
+        newer search started since.
+        """
+        if seq != self._search_seq:
+            return None
+        neighbors = self.similarity.similar(ids, k=self.similar_limit)
+        if not neighbors:
+            return {}
+        ids = list({pid for pairs in neighbors.values() for pid, _ in pairs})
+        prompts = {p.id: p for p in self.db_manager.get_prompts(ids)}
+        return {
+            pid: [(prompts[other], score) for other, score in pairs if other in prompts]
+            for pid, pairs in neighbors.items()
+        }
+
+    def _show_similar(self, seq, similar_map):
+        """Insert similar prompts below their matched prompt and its related ones.
+
+        Similar prompts listed further down with the remaining prompts are
+        moved up; ones already shown in the result groups are skipped.
+        """
+        if seq != self._search_seq or not similar_map:
+            return
+        for pid, pairs in similar_map.items():
+            for similar_prompt, score in pairs:
+                if similar_prompt.id in self._placed_ids:
+                    continue
+                was_selected = self._take_remaining(similar_prompt.id)
+                row = self.list.row(self._matched_items[pid]) + 1
+                while row < self.list.count() and self.list.item(row).data(
+                    MarkerRole
+                ) in ("  ↳", "  ≈"):
+                    row += 1
+                item = self._make_prompt_item(
+                    similar_prompt, marker="  ≈", badge=f"сходство: {score:.2f}"
+                )
+                self.list.insertItem(row, item)
+                item.setSelected(was_selected)
+                self._placed_ids.add(similar_prompt.id)
+
+    def _take_remaining(self, pid) -> bool:
+        """Remove a prompt and its spacer from the remaining prompts.
+
+        Returns whether its row was selected.
+        """
+        item = self._remaining_items.pop(pid, None)
+        if item is None:
+            return False
+        selected = item.isSelected()
+        row = self.list.row(item)
+        for spacer in (row - 1, row + 1):
+            spacer_item = self.list.item(spacer)
+            if spacer_item is not None and spacer_item.text() == "  ":
+                self.list.takeItem(spacer)
+                if spacer < row:
+                    row -= 1
+                break
+        self.list.takeItem(row)
+        return selected
+
+    def _display_search_results(self, matched, related_map, cross_refs, all_prompts):
+        """Display matched prompts with their related prompts grouped.
+
+        Similar prompts are added later by _request_similar.
+        """
         displayed_ids = set()
-        all_prompts = self.db_manager.get_all_prompts()
         matched_ids = {p.id for p in matched}
 
         # Create a map for quick access to prompts by id
@@ -184,7 +643,7 @@ class Overlay(QWidget):
         first_group = True
         for group in groups:
             if not first_group:
-                separator = QListWidgetItem("─" * 60)
+                separator = QListWidgetItem(GROUP_SEPARATOR)
                 separator.setFlags(Qt.ItemFlag.NoItemFlags)
                 separator.setData(Qt.ItemDataRole.UserRole, None)
                 self.list.addItem(separator)
@@ -208,11 +667,10 @@ class Overlay(QWidget):
                     self.list.addItem(separator)
                 first_in_group = False
 
-                # Add matched prompt with marker - replace newlines
-                body_display = prompt.body.replace("\n", " ")[:120]
-                item = QListWidgetItem(f"✓ {body_display} [{prompt.usage_count}]")
-                item.setData(Qt.ItemDataRole.UserRole, (prompt.id, prompt.body))
+                # Add matched prompt with marker
+                item = self._make_prompt_item(prompt, marker="✓")
                 self.list.addItem(item)
+                self._matched_items[prompt.id] = item
                 displayed_ids.add(prompt.id)
 
                 # Add related prompts (non-matched only)
@@ -222,22 +680,22 @@ class Overlay(QWidget):
                             related_prompt.id not in displayed_ids
                             and related_prompt.id not in matched_ids
                         ):
-                            body_display = related_prompt.body.replace("\n", " ")[:120]
-                            item = QListWidgetItem(
-                                f"  ↳ {body_display} [{related_prompt.usage_count}] (связь: {strength})"
-                            )
-                            item.setData(
-                                Qt.ItemDataRole.UserRole,
-                                (related_prompt.id, related_prompt.body),
+                            item = self._make_prompt_item(
+                                related_prompt,
+                                marker="  ↳",
+                                badge=f"связь: {strength}",
                             )
                             self.list.addItem(item)
                             displayed_ids.add(related_prompt.id)
 
+        self._similar_pending = set(matched_ids)
+        self._placed_ids = displayed_ids
+
         # Add remaining prompts with separator if there were any groups
         remaining = [p for p in all_prompts if p.id not in displayed_ids]
         if remaining:
             if not first_group:
-                separator = QListWidgetItem("─" * 60)
+                separator = QListWidgetItem(GROUP_SEPARATOR)
                 separator.setFlags(Qt.ItemFlag.NoItemFlags)
                 separator.setData(Qt.ItemDataRole.UserRole, None)
                 self.list.addItem(separator)
@@ -250,25 +708,65 @@ class Overlay(QWidget):
                     separator.setData(Qt.ItemDataRole.UserRole, None)
                     self.list.addItem(separator)
 
-                body_display = prompt.body.replace("\n", " ")[:120]
-                item = QListWidgetItem(f"{body_display} [{prompt.usage_count}]")
-                item.setData(Qt.ItemDataRole.UserRole, (prompt.id, prompt.body))
+                item = self._make_prompt_item(prompt)
                 self.list.addItem(item)
+                self._remaining_items[prompt.id] = item
 
     def on_search_enter(self):
         text = self.search.text().strip()
-        if text and not self.has_results:
-            self.db_manager.add_prompt(text)
-            self.on_search(text)
+        if text:
+            self.db_executor.call(
+                self._add_if_unmatched,
+                text,
+                callback=lambda pid: pid and self.on_search(self.search.text()),
+            )
 
+    def _add_if_unmatched(self, text):
+        """Add text as a new prompt unless it matches existing ones.
+
+        Runs on the database thread, so a result list that is still loading
+        can't cause a duplicate. Returns the new prompt id or None.
+        """
+        if self.db_manager.search_federated(text, limit=1):
+            return None
+        return self.db_manager.add_prompt(text)
+
+    def _render_prompts(self, prompts):
+        """Render prompt templates, asking for variables that can't be resolved.
+
+        Returns the rendered bodies, or None if the user cancelled.
+        """
+        compiled = [self.templates.get(pid, body) for pid, body in prompts]
+        names = list(dict.fromkeys(name for t in compiled for name in t.variables))
+        values = {}
+        if names:
+            clipboard_text = QApplication.clipboard().text()
+            values, missing = resolve_variables(names, clipboard_text)
+            if missing:
+                dialog = TemplateFillDialog(missing, clipboard_text, self)
+                if not dialog.exec():
+                    logger.debug("Template filling cancelled", variables=missing)
+                    return None
+                values.update(dialog.values())
+        return [template.render(values) for template in compiled]
+
+    @profiler.section("on_activate")
     def on_activate(self, item: QListWidgetItem):
+        bundle = item.data(BundleRole)
+        if bundle:
+            self._copy_prompts(bundle)
+            return
         data = item.data(Qt.ItemDataRole.UserRole)
         if data is None:  # Skip separator items
             return
         pid, body = data
         try:
-            copy_to_clipboard(body)
-            self.db_manager.increment_usage(pid)
+            rendered = self._render_prompts([data])
+            if rendered is None:
+                return
+            copy_to_clipboard(rendered[0])
+            if pid not in self._sources:  # Mounted libraries are read-only
+                self.db_executor.increment_usage(pid)
             logger.debug(
                 "Prompt activated and copied to clipboard",
                 prompt_id=pid,
@@ -278,48 +776,53 @@ class Overlay(QWidget):
         except Exception as e:
             logger.error("Failed to activate prompt", prompt_id=pid, error=str(e))
 
+    @profiler.section("on_list_enter")
     def on_list_enter(self):
         # Use selection_order for the order of copying
-        selected = (
-            self.selection_order if self.selection_order else self.list.selectedItems()
-        )
+        prompts = list(self.selection_order.values())
 
-        if not selected:
+        if not prompts:
             current = self.list.currentItem()
-            if current:
-                selected = [current]
-
-        if selected:
-            bodies = []
-            prompt_ids = []
-            for item in selected:
-                data = item.data(Qt.ItemDataRole.UserRole)
-                if data is None:  # Skip separator items
-                    continue
-                pid, body = data
-                bodies.append(body)
-                prompt_ids.append(pid)
-                self.db_manager.increment_usage(pid)
-
-            # Create relations if multiple prompts selected
-            if len(prompt_ids) > 1:
-                self.db_manager.add_prompt_relations(prompt_ids)
-
-            if bodies:  # Only copy if there are actual prompts
-                try:
-                    copy_to_clipboard("\n".join(bodies))
-                    logger.info(
-                        "Multiple prompts copied to clipboard",
-                        prompts_count=len(bodies),
-                        total_length=sum(len(b) for b in bodies),
-                    )
-                    self.hide()
-                except Exception as e:
-                    logger.error(
-                        "Failed to copy multiple prompts",
-                        prompts_count=len(bodies),
-                        error=str(e),
-                    )
+            if current and current.data(BundleRole):
+                prompts = current.data(BundleRole)
+            else:
+                data = current.data(Qt.ItemDataRole.UserRole) if current else None
+                if data is not None:  # Skip separator items
+                    prompts = [data]
+
+        if prompts:
+            self._copy_prompts(prompts)
+
+    def _copy_prompts(self, prompts):
+        """Copy prompts joined by newlines and record their use."""
+        bodies = self._render_prompts(prompts)
+        if bodies is None:
+            return
+
+        # Usage and relations are recorded in the writable library only
+        prompt_ids = [pid for pid, _ in prompts if pid not in self._sources]
+        for pid in prompt_ids:
+            self.db_executor.increment_usage(pid)
+
+        # Create relations and feed bundle mining if multiple prompts selected
+        if len(prompt_ids) > 1:
+            self.db_executor.submit(self.db_manager.add_prompt_relations, prompt_ids)
+            self.db_executor.submit(self.bundle_miner.record, prompt_ids)
+
+        try:
+            copy_to_clipboard("\n".join(bodies))
+            logger.info(
+                "Multiple prompts copied to clipboard",
+                prompts_count=len(bodies),
+                total_length=sum(map(len, bodies)),
+            )
+            self.hide()
+        except Exception as e:
+            logger.error(
+                "Failed to copy multiple prompts",
+                prompts_count=len(bodies),
+                error=str(e),
+            )
 
     def on_add(self):
         dialog = AddPromptDialog(self.db_manager, self)
@@ -328,16 +831,26 @@ class Overlay(QWidget):
         self.on_search(self.search.text())
 
     def on_manage(self):
-        manager = PromptManagerWindow(self.db_manager, self)
+        manager = PromptManagerWindow(self.db_manager, self, self.db_executor)
         manager.exec()
         self.on_search(self.search.text())
 
     def on_settings(self):
-        settings_window = SettingsWindow(self.db_manager, self)
-        settings_window.hotkey_changed.connect(self.hotkey_manager.update_hotkey)
+        # Hotkey changes reach HotkeyManager through the settings store
+        settings_window = SettingsWindow(self.settings_store, self)
         settings_window.exec()
 
+    def _bundle_shortcut(self, event) -> bool:
+        """Copy a bundle on Alt+<number>; returns True if the key was used."""
+        alt = event.modifiers() & Qt.KeyboardModifier.AltModifier
+        if alt and Qt.Key.Key_1 <= event.key() <= Qt.Key.Key_9:
+            self.copy_bundle(event.key() - Qt.Key.Key_0)
+            return True
+        return False
+
     def search_key_press(self, event):
+        if self._bundle_shortcut(event):
+            return
         if event.key() == Qt.Key.Key_Down:
             if self.list.count() > 0:
                 self.list.setFocus()
@@ -347,8 +860,19 @@ class Overlay(QWidget):
             QLineEdit.keyPressEvent(self.search, event)
 
     def list_key_press(self, event):
+        ctrl = event.modifiers() & Qt.KeyboardModifier.ControlModifier
+        if self._bundle_shortcut(event):
+            return
         if event.key() == Qt.Key.Key_Return:
             self.on_list_enter()
+        elif ctrl and event.key() == Qt.Key.Key_A:
+            self.select_all_matches()
+        elif ctrl and event.key() == Qt.Key.Key_G:
+            self.select_group()
+        elif ctrl and event.key() == Qt.Key.Key_I:
+            self.invert_selection()
+        elif ctrl and event.key() == Qt.Key.Key_S:
+            self.bind_quick_slot()
         elif event.key() == Qt.Key.Key_Space:
             # Toggle selection of current item with Space key
             current = self.list.currentItem()
@@ -365,6 +889,8 @@ class Overlay(QWidget):
 
 def main():
     logger.info("Application starting")
+    if settings.profiling.enabled or "--profile" in sys.argv[1:]:
+        profiler.start()
 
     try:
         db_manager = DatabaseManager(settings.database.path)
@@ -372,10 +898,17 @@ def main():
         logger.critical("Failed to initialize database manager", error=str(e))
         sys.exit(1)
 
+    for path in settings.database.mounts:
+        try:
+            db_manager.mount(path)
+        except Exception as e:
+            logger.error("Failed to mount library", path=str(path), error=str(e))
+
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(profiler.stop)
 
-    # Get hotkey from settings or use default
-    hotkey_sequence = db_manager.get_setting("hotkey") or "Ctrl+Alt+I"
+    settings_store = SettingsStore(db_manager)
+    hotkey_sequence = settings_store.get("hotkey")
     logger.info("Hotkey configured", hotkey=hotkey_sequence)
 
     try:
@@ -386,23 +919,39 @@ def main():
         )
         sys.exit(1)
 
-    overlay = Overlay(db_manager, hk)
+    settings_store.changed.connect(hk.on_setting_changed)
+    db_executor = DatabaseExecutor(db_manager)
+    db_executor.start()
+    app.aboutToQuit.connect(db_executor.stop)
+    overlay = Overlay(db_manager, hk, settings_store, db_executor)
 
+    @profiler.section("show_overlay")
     def show_overlay():
         try:
-            overlay.show()
-            overlay.activateWindow()
-            overlay.raise_()
-            overlay.search.clear()
-            overlay.on_search(overlay.search.text())
-            overlay.search.setFocus()
+            overlay.present()
             logger.debug("Overlay displayed")
         except Exception as e:
             logger.error("Failed to show overlay", error=str(e))
 
     hk.hotkey_pressed.connect(show_overlay)
+    hk.set_slot_hotkeys(load_slot_targets(settings_store.get(SLOTS_SETTING)))
+    hk.slot_triggered.connect(overlay.on_quick_slot)
     hk.start()
 
+    if settings.backup.enabled:
+        backup_scheduler = BackupScheduler(settings.database.path)
+        backup_scheduler.start()
+        app.aboutToQuit.connect(backup_scheduler.stop)
+
+    if settings.maintenance.enabled:
+        maintenance_scheduler = MaintenanceScheduler(db_manager)
+        # Any use of the app stops maintenance and restarts the idle wait
+        hk.hotkey_pressed.connect(maintenance_scheduler.notify_activity)
+        hk.slot_triggered.connect(maintenance_scheduler.notify_activity)
+        overlay.visibility_changed.connect(maintenance_scheduler.set_overlay_visible)
+        maintenance_scheduler.start()
+        app.aboutToQuit.connect(maintenance_scheduler.stop)
+
     # Seed example prompt if DB empty
     if db_manager.is_empty():
         db_manager.add_prompt(settings.app.seed_prompt)
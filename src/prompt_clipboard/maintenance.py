@@ -0,0 +1,222 @@
+"""
+Database maintenance while the app is idle.
+
+Once the overlay has been hidden and no hotkey has fired for a while, a
+background thread tidies the database in small steps:
+
+- deleting usage journal entries superseded by a newer running total
+- ANALYZE of each table (bounded by analysis_limit), then PRAGMA optimize
+- a passive WAL checkpoint when the database is in WAL mode
+- incremental_vacuum a few pages at a time; a database created without
+  auto_vacuum is converted once with a full VACUUM when enough of it is free
+- PRAGMA quick_check
+
+Any hotkey press stops a run between steps and interrupts the statement in
+progress, so SQLite rolls it back instead of holding the database. Each run is
+recorded in the MaintenanceRun table with the file size before and after and
+its duration; interrupted runs are retried at the next idle period.
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from prompt_clipboard.config import settings
+from prompt_clipboard.config.logging import logger
+from prompt_clipboard.database import (
+    COMPACT_JOURNAL_SQL,
+    DatabaseManager,
+    MaintenanceRun,
+)
+
+# Rows sampled per index by ANALYZE; keeps each step short on large tables
+ANALYSIS_LIMIT = 1000
+# PRAGMA auto_vacuum values
+AUTO_VACUUM_NONE = 0
+AUTO_VACUUM_INCREMENTAL = 2
+# Problems reported by quick_check that are kept in the run record
+INTEGRITY_ROWS = 10
+
+
+class MaintenanceInterrupted(Exception):
+    """Raised inside a run when the user became active."""
+
+
+class MaintenanceScheduler:
+    """Background thread that maintains the database during idle periods."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+        self.db_path = Path(db_manager.db_path)
+        self.idle_seconds = settings.maintenance.idle_minutes * 60
+        self.interval = settings.maintenance.interval_hours * 3600
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._connection = None  # sqlite3 connection of the run in progress
+        self._last_activity = time.monotonic()
+        self._overlay_visible = False
+        self._thread = None
+
+    def notify_activity(self):
+        """Postpone maintenance and stop a run in progress."""
+        with self._lock:
+            self._last_activity = time.monotonic()
+            if self._connection is not None:
+                self._connection.interrupt()
+
+    def set_overlay_visible(self, visible: bool):
+        self._overlay_visible = visible
+        self.notify_activity()
+
+    def _seconds_until_idle(self) -> float:
+        if self._overlay_visible:
+            return self.idle_seconds
+        idle = time.monotonic() - self._last_activity
+        return max(0.0, self.idle_seconds - idle)
+
+    def _seconds_until_due(self) -> float:
+        last = self.db_manager.get_last_maintenance_run()
+        if last is None:
+            return 0
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(last.started_at)
+        return max(0.0, self.interval - age.total_seconds())
+
+    def _file_size(self) -> int:
+        try:
+            return self.db_path.stat().st_size
+        except OSError:
+            return 0
+
+    def _tasks(self, connection: sqlite3.Connection, run: MaintenanceRun):
+        """Run the maintenance steps, yielding between short statements.
+
+        Yields the step name when a step completes and None in between.
+        """
+        connection.execute(COMPACT_JOURNAL_SQL)
+        yield "compact_journal"
+
+        connection.execute(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+        tables = connection.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        ).fetchall()
+        for (table,) in tables:
+            connection.execute(f'ANALYZE "{table}"')
+            yield None
+        connection.execute("PRAGMA optimize")
+        yield "analyze"
+
+        (journal_mode,) = connection.execute("PRAGMA journal_mode").fetchone()
+        if journal_mode == "wal":
+            connection.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+            yield "checkpoint"
+
+        (auto_vacuum,) = connection.execute("PRAGMA auto_vacuum").fetchone()
+        (free_pages,) = connection.execute("PRAGMA freelist_count").fetchone()
+        (page_count,) = connection.execute("PRAGMA page_count").fetchone()
+        if auto_vacuum == AUTO_VACUUM_INCREMENTAL:
+            while free_pages:
+                pages = settings.maintenance.vacuum_pages_per_step
+                # Each freed page is a step of the statement; fetch runs them all
+                connection.execute(f"PRAGMA incremental_vacuum({pages})").fetchall()
+                (free_pages,) = connection.execute("PRAGMA freelist_count").fetchone()
+                yield None
+            yield "incremental_vacuum"
+        elif (
+            auto_vacuum == AUTO_VACUUM_NONE
+            and free_pages > page_count * settings.maintenance.vacuum_free_ratio
+        ):
+            # auto_vacuum can only be switched on by rebuilding the file
+            connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            connection.execute("VACUUM")
+            yield "vacuum"
+
+        rows = connection.execute("PRAGMA quick_check").fetchmany(INTEGRITY_ROWS)
+        run.integrity = "; ".join(row[0] for row in rows)
+        yield "quick_check"
+
+    def run_once(self) -> MaintenanceRun:
+        """Run all maintenance steps now, stopping early on user activity."""
+        started = time.perf_counter()
+        activity = self._last_activity
+        run = MaintenanceRun(
+            duration_ms=0, size_before=self._file_size(), size_after=0, steps=""
+        )
+        steps = []
+        connection = sqlite3.connect(
+            self.db_path,
+            timeout=settings.maintenance.busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        with self._lock:
+            self._connection = connection
+        try:
+            for step in self._tasks(connection, run):
+                if step:
+                    steps.append(step)
+                if self._last_activity != activity or self._stop.wait(
+                    settings.maintenance.step_sleep
+                ):
+                    raise MaintenanceInterrupted
+        except (MaintenanceInterrupted, sqlite3.OperationalError) as e:
+            if self._last_activity == activity and not self._stop.is_set():
+                raise  # Locked or failing database rather than an interrupt
+            run.interrupted = True
+            logger.debug("Database maintenance interrupted", error=str(e))
+        finally:
+            with self._lock:
+                self._connection = None
+            connection.close()
+
+        run.steps = ",".join(steps)
+        run.size_after = self._file_size()
+        run.duration_ms = round((time.perf_counter() - started) * 1000)
+        self.db_manager.add_maintenance_run(run)
+        if run.integrity not in (None, "ok"):
+            logger.error("Database integrity check failed", problems=run.integrity)
+        logger.info(
+            "Database maintenance finished",
+            steps=run.steps,
+            interrupted=run.interrupted,
+            size_before=run.size_before,
+            size_after=run.size_after,
+            duration_ms=run.duration_ms,
+        )
+        return run
+
+    def _run(self):
+        while not self._stop.is_set():
+            wait = max(self._seconds_until_due(), self._seconds_until_idle())
+            if wait > 0:
+                self._stop.wait(wait)
+                continue
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error("Database maintenance failed", error=str(e))
+                # Avoid a tight retry loop on persistent failures
+                if self._stop.wait(self.interval):
+                    break
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="maintenance-scheduler", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            "Maintenance scheduler started",
+            idle_minutes=settings.maintenance.idle_minutes,
+            interval_hours=settings.maintenance.interval_hours,
+        )
+
+    def stop(self):
+        self._stop.set()
+        self.notify_activity()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -0,0 +1,48 @@
+"""
+Process memory helpers for trimming the app while it sits in the background.
+
+Dropping Python objects returns their memory to the allocator, not to the
+system, so resident memory only falls after the freed heap is handed back
+with malloc_trim (glibc). Elsewhere trimming still frees the objects for reuse.
+"""
+
+import ctypes
+import ctypes.util
+import gc
+import os
+
+from prompt_clipboard.config.logging import logger
+
+_libc = None
+
+
+def read_rss() -> int | None:
+    """Get the resident set size of this process in bytes, if known."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None  # No procfs (macOS, Windows)
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def release_freed_memory():
+    """Collect garbage and return free heap pages to the system."""
+    global _libc
+    gc.collect()
+    if _libc is None:
+        name = ctypes.util.find_library("c")
+        try:
+            _libc = ctypes.CDLL(name) if name else False
+        except OSError:
+            _libc = False
+    trim = getattr(_libc, "malloc_trim", None)
+    if trim is not None:
+        try:
+            trim(0)
+        except Exception as e:
+            logger.debug("malloc_trim failed", error=str(e))
+
+
+def to_mb(size: int | None) -> float | None:
+    return None if size is None else round(size / (1024 * 1024), 1)
@@ -0,0 +1,411 @@
+"""
+Prompt packs: immutable, memory-mapped read-only libraries.
+
+A pack is a library snapshot in a fixed little-endian layout. It is queried
+in place through mmap, so opening one only reads the header, and processes
+mapping the same pack share its pages instead of each building a cache.
+
+    header         magic, version, counts and section offsets
+    ids            36-byte prompt ids
+    usage          uint32 usage counts
+    created        32-byte ISO creation timestamps, NUL-padded
+    bodies         uint64 offsets (count + 1) of UTF-8 bodies in text
+    lowered        uint64 offsets (count + 1) of lower-cased bodies in text
+    term_names     uint32 offsets (terms + 1) of term names in the term blob
+    term_postings  uint32 offsets (terms + 1) of term posting lists
+    tag_names      uint32 offsets (tags + 1) of tag names in the tag blob
+    tag_postings   uint32 offsets (tags + 1) of tag posting lists
+    postings       uint32 record numbers, ascending within each list
+    text           bodies, lower-cased bodies, term blob, tag blob
+
+Records are stored in display order (most used first), so a record number is
+also its rank and posting lists are already ranked. Terms are the whitespace
+tokens of the lower-cased bodies; the term and tag blobs hold the sorted
+names, each followed by "\\n".
+
+Words match as substrings, as in the database: term names containing a word
+are found with mmap.find over the term blob, their postings give the
+candidates, and candidates are checked against the lower-cased body in place.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import NamedTuple
+
+from prompt_clipboard.config.logging import logger
+from prompt_clipboard.search_query import SearchQuery, parse_query
+from prompt_clipboard.tag_index import TagIndex
+
+PACK_SUFFIX = ".pack"
+PACK_MAGIC = b"PCPACK\0\0"
+PACK_VERSION = 1
+
+ID_SIZE = 36
+CREATED_SIZE = 32
+SECTIONS = (
+    "ids",
+    "usage",
+    "created",
+    "bodies",
+    "lowered",
+    "term_names",
+    "term_postings",
+    "tag_names",
+    "tag_postings",
+    "postings",
+    "text",
+    "term_blob",
+    "tag_blob",
+)
+# magic, version, prompt count, term count, tag count, section offsets
+_HEADER = struct.Struct("<8sIIII" + "Q" * len(SECTIONS))
+
+# A word matching terms with more postings than this share of the library is
+# checked against every body instead of collecting candidates
+SCAN_RATIO = 0.5
+
+
+class PackedPrompt(NamedTuple):
+    """A prompt read from a pack; the attributes search results use."""
+
+    id: str
+    body: str
+    usage_count: int
+    created_at: str
+
+
+def _check_byte_order():
+    if sys.byteorder != "little":
+        raise OSError("Prompt packs need a little-endian host")
+
+
+def _index(entries: dict[str, list[int]], first_posting: int):
+    """Lay out one index: (name blob, name offsets, posting offsets, postings)."""
+    blob = bytearray()
+    name_offsets = array("I")
+    posting_offsets = array("I", [first_posting])
+    postings = array("I")
+    for name in sorted(entries):
+        name_offsets.append(len(blob))
+        blob += name.encode("utf-8") + b"\n"
+        postings.extend(entries[name])
+        posting_offsets.append(first_posting + len(postings))
+    name_offsets.append(len(blob))
+    return blob, name_offsets, posting_offsets, postings
+
+
+def write_pack(path: Path, prompts) -> int:
+    """Write prompts to a pack file; returns the number of prompts written.
+
+    prompts is an iterable of (id, body, usage_count, created_at, tags). The
+    file is replaced atomically, so processes that mapped it keep the old one.
+    """
+    _check_byte_order()
+    records = sorted(prompts, key=lambda p: (-p[2], p[3]))
+    ids = bytearray()
+    usage = array("I")
+    created = bytearray()
+    body_offsets = array("Q")
+    lowered_offsets = array("Q")
+    text = bytearray()
+    lowered_bodies = []
+    terms, tags = {}, {}
+    for number, (pid, body, usage_count, created_at, prompt_tags) in enumerate(records):
+        ids += pid.encode("ascii")[:ID_SIZE].ljust(ID_SIZE, b"\0")
+        # Unsigned column; a negative count left by an old sync must not break export
+        usage.append(max(0, usage_count))
+        created += created_at.encode("ascii")[:CREATED_SIZE].ljust(CREATED_SIZE, b"\0")
+        body_offsets.append(len(text))
+        text += body.encode("utf-8")
+        lowered = body.lower()
+        lowered_bodies.append(lowered.encode("utf-8"))
+        for term in set(lowered.split()):
+            terms.setdefault(term, []).append(number)
+        for tag in prompt_tags:
+            tags.setdefault(tag, []).append(number)
+    body_offsets.append(len(text))
+    for lowered in lowered_bodies:
+        lowered_offsets.append(len(text))
+        text += lowered
+    lowered_offsets.append(len(text))
+
+    term_blob, term_names, term_postings, postings = _index(terms, 0)
+    tag_blob, tag_names, tag_postings, tag_list = _index(tags, len(postings))
+    postings.extend(tag_list)
+    blob_offsets = {"term_blob": len(text), "tag_blob": len(text) + len(term_blob)}
+    text += term_blob
+    text += tag_blob
+
+    sections = {
+        "ids": ids,
+        "usage": usage.tobytes(),
+        "created": created,
+        "bodies": body_offsets.tobytes(),
+        "lowered": lowered_offsets.tobytes(),
+        "term_names": term_names.tobytes(),
+        "term_postings": term_postings.tobytes(),
+        "tag_names": tag_names.tobytes(),
+        "tag_postings": tag_postings.tobytes(),
+        "postings": postings.tobytes(),
+        "text": text,
+    }
+    out = bytearray(_HEADER.size)
+    offsets = {}
+    for name, data in sections.items():
+        out += b"\0" * (-len(out) % 8)  # Keep arrays aligned for memoryview casts
+        offsets[name] = len(out)
+        out += data
+    for name, offset in blob_offsets.items():
+        offsets[name] = offsets["text"] + offset
+    _HEADER.pack_into(
+        out,
+        0,
+        PACK_MAGIC,
+        PACK_VERSION,
+        len(records),
+        len(terms),
+        len(tags),
+        *(offsets[name] for name in SECTIONS),
+    )
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(out)
+    os.replace(tmp_path, path)
+    logger.info(
+        "Prompt pack written",
+        path=str(path),
+        prompts_count=len(records),
+        terms_count=len(terms),
+        size_bytes=len(out),
+    )
+    return len(records)
+
+
+class PromptPack:
+    """Read-only library backed by a memory-mapped pack file.
+
+    Has the search interface of a read-only DatabaseManager, so it can be
+    mounted next to the writable library.
+    """
+
+    def __init__(self, path):
+        _check_byte_order()
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            header = _HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            self._mm.close()
+            raise ValueError(f"Not a prompt pack: {path}") from None
+        magic, version, self.count, term_count, tag_count, *offsets = header
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            self._mm.close()
+            raise ValueError(f"Not a prompt pack (version {PACK_VERSION}): {path}")
+
+        self._offsets = dict(zip(SECTIONS, offsets))
+        self._view = memoryview(self._mm)
+        self._usage = self._column("usage", "I", self.count)
+        self._bodies = self._column("bodies", "Q", self.count + 1)
+        self._lowered = self._column("lowered", "Q", self.count + 1)
+        self._term_names = self._column("term_names", "I", term_count + 1)
+        self._term_postings = self._column("term_postings", "I", term_count + 1)
+        self._tag_names = self._column("tag_names", "I", tag_count + 1)
+        self._tag_postings = self._column("tag_postings", "I", tag_count + 1)
+        postings_count = self._tag_postings[tag_count]
+        self._postings = self._column("postings", "I", postings_count)
+        self._text = self._offsets["text"]
+        logger.info("Prompt pack opened", path=str(path), prompts_count=self.count)
+
+    def _column(self, section: str, fmt: str, length: int) -> memoryview:
+        start = self._offsets[section]
+        size = struct.calcsize(fmt) * length
+        return self._view[start : start + size].cast(fmt)
+
+    def release_pages(self):
+        """Drop the mapped pages from memory; they are read back on access."""
+        if hasattr(mmap, "MADV_DONTNEED"):
+            self._mm.madvise(mmap.MADV_DONTNEED)
+
+    def close(self):
+        for name in (
+            "_usage",
+            "_bodies",
+            "_lowered",
+            "_term_names",
+            "_term_postings",
+            "_tag_names",
+            "_tag_postings",
+            "_postings",
+        ):
+            getattr(self, name).release()
+        self._view.release()
+        self._mm.close()
+
+    def _prompt(self, number: int) -> PackedPrompt:
+        mm = self._mm
+        ids = self._offsets["ids"] + number * ID_SIZE
+        created = self._offsets["created"] + number * CREATED_SIZE
+        start = self._text + self._bodies[number]
+        end = self._text + self._bodies[number + 1]
+        return PackedPrompt(
+            id=mm[ids : ids + ID_SIZE].rstrip(b"\0").decode("ascii"),
+            body=mm[start:end].decode("utf-8"),
+            usage_count=self._usage[number],
+            created_at=mm[created : created + CREATED_SIZE]
+            .rstrip(b"\0")
+            .decode("ascii"),
+        )
+
+    def _created(self, number: int) -> str:
+        start = self._offsets["created"] + number * CREATED_SIZE
+        return self._mm[start : start + CREATED_SIZE].rstrip(b"\0").decode("ascii")
+
+    def _contains(self, number: int, needle: bytes) -> bool:
+        """Check a lower-cased body for a substring without copying it."""
+        return (
+            self._mm.find(
+                needle,
+                self._text + self._lowered[number],
+                self._text + self._lowered[number + 1],
+            )
+            != -1
+        )
+
+    def _lowered_length(self, number: int) -> int:
+        start = self._text + self._lowered[number]
+        end = self._text + self._lowered[number + 1]
+        return len(self._mm[start:end].decode("utf-8"))
+
+    def _postings_of(self, offsets: memoryview, index: int) -> memoryview:
+        return self._postings[offsets[index] : offsets[index + 1]]
+
+    def _find_tag(self, tag: str) -> int | None:
+        """Binary search the tag index for an exact name."""
+        needle = TagIndex.normalize(tag).encode("utf-8")
+        blob = self._offsets["tag_blob"]
+        names = self._tag_names
+        low, high = 0, len(names) - 1
+        while low < high:
+            middle = (low + high) // 2
+            name = self._mm[blob + names[middle] : blob + names[middle + 1] - 1]
+            if name == needle:
+                return middle
+            if name < needle:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(names) - 1:
+            if self._mm[blob + names[low] : blob + names[low + 1] - 1] == needle:
+                return low
+        return None
+
+    def _tagged(self, tag: str) -> set[int]:
+        index = self._find_tag(tag)
+        if index is None:
+            return set()
+        return set(self._postings_of(self._tag_postings, index))
+
+    def _word_candidates(self, word: bytes) -> set[int] | None:
+        """Get records with a token containing word; None if too many to collect."""
+        mm = self._mm
+        blob = self._offsets["term_blob"]
+        names = self._term_names
+        end = blob + names[len(names) - 1]
+        limit = SCAN_RATIO * self.count
+        lists = []
+        total = 0
+        position = mm.find(word, blob, end)
+        while position != -1:
+            # Term containing the hit: the last name starting at or before it
+            low, high = 0, len(names) - 1
+            relative = position - blob
+            while low < high:
+                middle = (low + high + 1) // 2
+                if names[middle] <= relative:
+                    low = middle
+                else:
+                    high = middle - 1
+            postings = self._postings_of(self._term_postings, low)
+            total += len(postings)
+            if total > limit:
+                return None
+            lists.append(postings)
+            position = mm.find(word, blob + names[low + 1], end)
+        candidates = set()
+        for postings in lists:
+            candidates.update(postings)
+        return candidates
+
+    def _query_numbers(self, query: SearchQuery, limit: int) -> list[int]:
+        """Get up to limit record numbers matching a query, in display order."""
+        pools = [self._tagged(tag) for tag in query.tags]
+        terms = [term.encode("utf-8") for term in query.terms]
+        for term in terms:
+            for word in term.split():
+                candidates = self._word_candidates(word)
+                if candidates is not None:
+                    pools.append(candidates)
+        if pools:
+            pools.sort(key=len)
+            candidates = pools[0].intersection(*pools[1:])
+            numbers = sorted(candidates)
+        else:
+            numbers = range(self.count)
+
+        excluded_ids = set()
+        for tag in query.excluded_tags:
+            excluded_ids |= self._tagged(tag)
+        excluded = [term.encode("utf-8") for term in query.excluded]
+        matched = []
+        for number in numbers:
+            if (
+                number in excluded_ids
+                or not all(self._contains(number, term) for term in terms)
+                or any(self._contains(number, term) for term in excluded)
+            ):
+                continue
+            if not all(self._filter_matches(number, f) for f in query.filters):
+                continue
+            matched.append(number)
+            if len(matched) >= limit:
+                break
+        return matched
+
+    def _filter_matches(self, number: int, query_filter) -> bool:
+        if query_filter.field == "uses":
+            return query_filter.matches(self._usage[number])
+        if query_filter.field == "created":
+            return query_filter.matches(self._created(number))
+        return query_filter.matches(self._lowered_length(number))
+
+    def search_prompts(self, q, limit=50):
+        """Search the pack; returns (matched, related_map, cross_refs) or [].
+
+        Packs don't store relations, so both maps are empty.
+        """
+        query = parse_query(q)
+        if not query:
+            return []
+        matched = [self._prompt(n) for n in self._query_numbers(query, limit)]
+        logger.debug(
+            "Pack search completed",
+            path=str(self.path),
+            query=q,
+            matched_count=len(matched),
+        )
+        return (matched, {}, {}) if matched else []
+
+    def get_prompt(self, pid: str) -> PackedPrompt | None:
+        needle = pid.encode("ascii")
+        start = self._offsets["ids"]
+        end = start + self.count * ID_SIZE
+        position = self._mm.find(needle, start, end)
+        while position != -1 and (position - start) % ID_SIZE:
+            position = self._mm.find(needle, position + 1, end)
+        return None if position == -1 else self._prompt((position - start) // ID_SIZE)
@@ -0,0 +1,192 @@
+"""
+Opt-in sampling profiler for the hotkey-to-clipboard pipeline.
+
+Pipeline steps are wrapped in named sections. While any thread is inside a
+section, a background thread samples the stacks of those threads only, so
+idle time and unrelated threads cost nothing. Each session is written to the
+profiles directory as:
+
+- profile-<timestamp>.folded: collapsed stacks ("a;b;c count"), ready for
+  flamegraph.pl, speedscope or inferno
+- profile-<timestamp>.txt: per-section timings and the hottest functions
+
+Enabled with --profile or PROMPT_CLIPBOARD__PROFILING__ENABLED=true.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+from prompt_clipboard.config import settings
+from prompt_clipboard.config.logging import logger
+
+# Functions listed in the session summary
+SUMMARY_TOP_FUNCTIONS = 30
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return (
+        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    )
+
+
+def _fold(frame) -> list[str]:
+    """Get the labels of a stack, outermost first."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+class PipelineProfiler:
+    """Section timer and stack sampler; a no-op until started."""
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._active = {}  # {thread id: stack of open section names}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stacks = Counter()  # {folded stack: samples}
+        self._sections = {}  # {name: [calls, total seconds, max seconds]}
+        self._started_at = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self.enabled = True
+        self._started_at = datetime.now()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="pipeline-profiler", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            "Pipeline profiling enabled",
+            profiles_dir=str(settings.profiling.dir),
+            interval_ms=settings.profiling.interval * 1000,
+        )
+
+    @contextmanager
+    def section(self, name: str):
+        """Time a pipeline step and sample its stacks while it runs."""
+        if not self.enabled:
+            yield
+            return
+
+        tid = threading.get_ident()
+        with self._lock:
+            self._active.setdefault(tid, []).append(name)
+            self._wake.set()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                stats = self._sections.setdefault(name, [0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = max(stats[2], elapsed)
+                names = self._active[tid]
+                names.pop()
+                if not names:
+                    del self._active[tid]
+                    if not self._active:
+                        self._wake.clear()
+
+    def _run(self):
+        interval = settings.profiling.interval
+        while not self._stop.is_set():
+            self._wake.wait(timeout=0.5)
+            if not self._wake.is_set():
+                continue
+            frames = sys._current_frames()
+            with self._lock:
+                for tid, names in self._active.items():
+                    frame = frames.get(tid)
+                    if frame is not None:
+                        stack = ";".join([names[0], *_fold(frame)])
+                        self._stacks[stack] += 1
+            del frames
+            time.sleep(interval)
+
+    def stop(self):
+        """Stop sampling and write the session files."""
+        if self._thread is None:
+            return
+        self.enabled = False
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        try:
+            self.dump()
+        except Exception as e:
+            logger.error("Failed to write profile", error=str(e))
+
+    def dump(self):
+        """Write collected samples and timings; returns the folded stacks path."""
+        with self._lock:
+            stacks = Counter(self._stacks)
+            sections = {name: list(stats) for name, stats in self._sections.items()}
+
+        profiles_dir = settings.profiling.dir
+        profiles_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = self._started_at.strftime("%Y%m%d-%H%M%S")
+        folded_path = profiles_dir / f"profile-{timestamp}.folded"
+        summary_path = profiles_dir / f"profile-{timestamp}.txt"
+
+        folded_path.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in stacks.items()),
+            encoding="utf-8",
+        )
+        summary_path.write_text(self._summary(stacks, sections), encoding="utf-8")
+
+        sessions = sorted(profiles_dir.glob("profile-*.folded"))
+        for old in sessions[: -settings.profiling.keep]:
+            old.unlink(missing_ok=True)
+            old.with_suffix(".txt").unlink(missing_ok=True)
+
+        logger.info(
+            "Profile written",
+            path=str(folded_path),
+            samples=sum(stacks.values()),
+            sections_count=len(sections),
+        )
+        return folded_path
+
+    def _summary(self, stacks: Counter, sections: dict) -> str:
+        lines = [f"Session started {self._started_at.isoformat()}", ""]
+        lines.append(
+            f"{'section':<20} {'calls':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9}"
+        )
+        for name, (calls, total, longest) in sorted(
+            sections.items(), key=lambda item: item[1][1], reverse=True
+        ):
+            lines.append(
+                f"{name:<20} {calls:>7} {total * 1000:>10.1f} "
+                f"{total / calls * 1000:>9.2f} {longest * 1000:>9.2f}"
+            )
+
+        # Self samples: the innermost frame of each stack
+        own = Counter()
+        for stack, count in stacks.items():
+            own[stack.rsplit(";", 1)[-1]] += count
+        total_samples = sum(own.values()) or 1
+        lines += ["", f"{'samples':>8} {'share':>6}  function"]
+        for label, count in own.most_common(SUMMARY_TOP_FUNCTIONS):
+            lines.append(f"{count:>8} {count / total_samples:>6.1%}  {label}")
+        return "\n".join(lines) + "\n"
+
+
+# Shared instance used by instrumented code
+profiler = PipelineProfiler()
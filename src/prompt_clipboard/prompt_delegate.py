@@ -0,0 +1,154 @@
+"""
+Item delegate painting prompt rows with elided previews, highlighted query
+terms and separate usage / relation badges.
+
+Text layouts are cached per preview and row width, so repaints while
+scrolling only draw prepared layouts instead of re-shaping text.
+"""
+
+from PySide6.QtCore import QPointF, QRectF, QSize, Qt
+from PySide6.QtGui import QFontMetrics, QPalette, QTextCharFormat, QTextLayout
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+# Item data roles used by prompt rows
+PreviewRole = Qt.ItemDataRole.UserRole + 1  # single-line body preview
+UsageRole = Qt.ItemDataRole.UserRole + 2  # usage count
+BadgeRole = Qt.ItemDataRole.UserRole + 3  # relation/similarity label
+MarkerRole = Qt.ItemDataRole.UserRole + 4  # leading marker, e.g. "✓"
+BundleRole = Qt.ItemDataRole.UserRole + 5  # [(prompt_id, body)] of a bundle row
+
+PADDING = 4
+BADGE_SPACING = 6
+# Cached layouts are dropped all at once beyond this size
+MAX_CACHED_LAYOUTS = 4096
+
+
+class PromptItemDelegate(QStyledItemDelegate):
+    """Paints prompt rows; rows without a preview are painted by Qt."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._terms = ()
+        self._layouts = {}  # {(preview, width): QTextLayout}
+
+    def set_highlight_terms(self, terms):
+        terms = tuple(sorted({t.lower() for t in terms if t}, key=len, reverse=True))
+        if terms != self._terms:
+            self._terms = terms
+            self._layouts.clear()
+
+    def clear_cache(self):
+        self._layouts.clear()
+
+    def _highlight_format(self, palette: QPalette) -> QTextCharFormat:
+        fmt = QTextCharFormat()
+        fmt.setFontWeight(700)
+        fmt.setForeground(palette.link())
+        return fmt
+
+    def _text_layout(self, preview: str, width: int, option) -> QTextLayout:
+        key = (preview, width)
+        layout = self._layouts.get(key)
+        if layout is not None:
+            return layout
+
+        metrics = QFontMetrics(option.font)
+        text = metrics.elidedText(preview, Qt.TextElideMode.ElideRight, width)
+        layout = QTextLayout(text, option.font)
+
+        if self._terms:
+            ranges = []
+            lowered = text.lower()
+            highlight = self._highlight_format(option.palette)
+            for term in self._terms:
+                start = lowered.find(term)
+                while start != -1:
+                    fmt_range = QTextLayout.FormatRange()
+                    fmt_range.start = start
+                    fmt_range.length = len(term)
+                    fmt_range.format = highlight
+                    ranges.append(fmt_range)
+                    start = lowered.find(term, start + len(term))
+            layout.setFormats(ranges)
+
+        layout.beginLayout()
+        line = layout.createLine()
+        line.setLineWidth(width)
+        layout.endLayout()
+
+        if len(self._layouts) >= MAX_CACHED_LAYOUTS:
+            self._layouts.clear()
+        self._layouts[key] = layout
+        return layout
+
+    def _draw_badge(self, painter, option, text: str, right: float) -> float:
+        """Draw a rounded badge ending at `right`; returns its left edge."""
+        metrics = QFontMetrics(option.font)
+        width = metrics.horizontalAdvance(text) + 2 * PADDING
+        height = metrics.height()
+        top = option.rect.top() + (option.rect.height() - height) / 2
+        rect = QRectF(right - width, top, width, height)
+
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(option.palette.alternateBase())
+        painter.drawRoundedRect(rect, height / 3, height / 3)
+        painter.setPen(option.palette.color(QPalette.ColorRole.Text))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        return rect.left() - BADGE_SPACING
+
+    def paint(self, painter, option, index):
+        preview = index.data(PreviewRole)
+        if preview is None:
+            super().paint(painter, option, index)
+            return
+
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        style = opt.widget.style() if opt.widget else None
+        painter.save()
+        if style is not None:
+            # Background, selection and focus without the default text
+            style.drawControl(
+                QStyle.ControlElement.CE_ItemViewItem, opt, painter, opt.widget
+            )
+
+        rect = option.rect
+        right = rect.right() - PADDING
+        badge = index.data(BadgeRole)
+        if badge:
+            right = self._draw_badge(painter, option, badge, right)
+        usage = index.data(UsageRole)
+        if usage is not None:
+            right = self._draw_badge(painter, option, str(usage), right)
+
+        left = rect.left() + PADDING
+        metrics = QFontMetrics(option.font)
+        text_top = rect.top() + (rect.height() - metrics.height()) / 2
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        painter.setPen(
+            option.palette.color(
+                QPalette.ColorRole.HighlightedText
+                if selected
+                else QPalette.ColorRole.Text
+            )
+        )
+
+        marker = index.data(MarkerRole)
+        if marker:
+            painter.drawText(QPointF(left, text_top + metrics.ascent()), f"{marker} ")
+            left += metrics.horizontalAdvance(f"{marker} ")
+
+        width = int(right - left)
+        if width > 0:
+            self._text_layout(preview, width, option).draw(
+                painter, QPointF(left, text_top)
+            )
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        if index.data(PreviewRole) is None:
+            return super().sizeHint(option, index)
+        # Width-neutral: rows elide to the viewport instead of scrolling
+        metrics = QFontMetrics(option.font)
+        return QSize(1, metrics.height() + 2 * PADDING)
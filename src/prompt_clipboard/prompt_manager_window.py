@@ -1,26 +1,54 @@
+from pathlib import Path
+
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QDialog,
+    QFileDialog,
     QHBoxLayout,
+    QInputDialog,
+    QLineEdit,
     QListWidget,
     QListWidgetItem,
     QMessageBox,
+    QProgressDialog,
     QPushButton,
     QVBoxLayout,
 )
 
 from prompt_clipboard.add_prompt_dialog import AddPromptDialog
+from prompt_clipboard.backup import restore_snapshot
+from prompt_clipboard.config import settings
 from prompt_clipboard.config.logging import logger
 from prompt_clipboard.database import DatabaseManager
+from prompt_clipboard.db_executor import DatabaseExecutor
+from prompt_clipboard.duplicates_dialog import DuplicatesDialog
 from prompt_clipboard.edit_prompt_dialog import EditPromptDialog
+from prompt_clipboard.import_export import export_pack, export_prompts, import_prompts
+from prompt_clipboard.pack import PACK_SUFFIX
+from prompt_clipboard.sync import sync_databases
+
+# Number of prompts fetched per lazy page
+PAGE_SIZE = 200
+
+# (-usage_count, created_at) of a row, the display order of the list
+SortKeyRole = Qt.ItemDataRole.UserRole + 1
 
 
 class PromptManagerWindow(QDialog):
     """Window for managing prompts (add, edit, delete)."""
 
-    def __init__(self, db_manager: DatabaseManager, parent=None):
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        parent=None,
+        db_executor: DatabaseExecutor | None = None,
+    ):
         super().__init__(parent)
         self.db_manager = db_manager
+        self.db_executor = db_executor
+        self._items = {}  # {prompt_id: QListWidgetItem} for loaded rows
+        self._offset = 0
+        self._exhausted = False
         self._setup_ui()
         self._load_prompts()
 
@@ -31,45 +59,155 @@ class PromptManagerWindow(QDialog):
 
         layout = QVBoxLayout(self)
 
+        self.filter_edit = QLineEdit(self)
+        self.filter_edit.setPlaceholderText(
+            'Filter prompts... (#tag, "phrase", -word, uses:>5)'
+        )
+        layout.addWidget(self.filter_edit)
+
         self.list = QListWidget(self)
+        self.list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
         layout.addWidget(self.list)
 
         btn_layout = QHBoxLayout()
         self.add_btn = QPushButton("Add", self)
         self.edit_btn = QPushButton("Edit", self)
         self.delete_btn = QPushButton("Delete", self)
+        self.tags_btn = QPushButton("Tags...", self)
+        self.reset_usage_btn = QPushButton("Reset Usage", self)
+        self.duplicates_btn = QPushButton("Duplicates...", self)
+        self.import_btn = QPushButton("Import...", self)
+        self.export_btn = QPushButton("Export...", self)
+        self.sync_btn = QPushButton("Sync...", self)
+        self.restore_btn = QPushButton("Restore Backup...", self)
 
         btn_layout.addWidget(self.add_btn)
         btn_layout.addWidget(self.edit_btn)
         btn_layout.addWidget(self.delete_btn)
+        btn_layout.addWidget(self.tags_btn)
+        btn_layout.addWidget(self.reset_usage_btn)
+        btn_layout.addWidget(self.duplicates_btn)
+        btn_layout.addWidget(self.import_btn)
+        btn_layout.addWidget(self.export_btn)
+        btn_layout.addWidget(self.sync_btn)
+        btn_layout.addWidget(self.restore_btn)
         layout.addLayout(btn_layout)
 
+        self.filter_edit.textChanged.connect(self._load_prompts)
+        self.list.verticalScrollBar().valueChanged.connect(self._on_scroll)
         self.add_btn.clicked.connect(self._on_add)
         self.edit_btn.clicked.connect(self._on_edit)
         self.delete_btn.clicked.connect(self._on_delete)
+        self.tags_btn.clicked.connect(self._on_tags)
+        self.reset_usage_btn.clicked.connect(self._on_reset_usage)
+        self.duplicates_btn.clicked.connect(self._on_duplicates)
+        self.import_btn.clicked.connect(self._on_import)
+        self.export_btn.clicked.connect(self._on_export)
+        self.sync_btn.clicked.connect(self._on_sync)
+        self.restore_btn.clicked.connect(self._on_restore)
 
     def _load_prompts(self):
+        """Reset the list and load the first page for the current filter."""
         self.list.clear()
-        rows = self.db_manager.get_all_prompts()
-
-        for i, prompt in enumerate(rows):
-            # Add visual separator between prompts (except before first)
-            if i > 0:
-                separator = QListWidgetItem("  ")
-                separator.setFlags(Qt.ItemFlag.NoItemFlags)
-                separator.setData(Qt.ItemDataRole.UserRole, None)
-                self.list.addItem(separator)
-
-            # Display prompt - replace newlines with space
-            body_display = prompt.body.replace("\n", " ")[:200]
-            item = QListWidgetItem(f"{body_display} [{prompt.usage_count}]")
-            item.setData(Qt.ItemDataRole.UserRole, (prompt.id, prompt.body))
+        self._items = {}
+        self._offset = 0
+        self._exhausted = False
+        self._load_next_page()
+
+    def _load_next_page(self):
+        if self._exhausted:
+            return
+
+        rows = self.db_manager.get_prompts_page(
+            self._offset, PAGE_SIZE, query=self.filter_edit.text()
+        )
+        self._offset += len(rows)
+        self._exhausted = len(rows) < PAGE_SIZE
+
+        for prompt in rows:
+            # A prompt inserted locally may show up again in a later page
+            if prompt.id not in self._items:
+                self._insert_prompt(self.list.count(), prompt)
+
+    def _on_scroll(self, value):
+        scrollbar = self.list.verticalScrollBar()
+        if value >= scrollbar.maximum() - scrollbar.pageStep():
+            self._load_next_page()
+
+    def _make_separator(self):
+        separator = QListWidgetItem("  ")
+        separator.setFlags(Qt.ItemFlag.NoItemFlags)
+        separator.setData(Qt.ItemDataRole.UserRole, None)
+        return separator
+
+    def _set_item_prompt(self, item: QListWidgetItem, prompt):
+        # Display prompt - replace newlines with space
+        body_display = prompt.body.replace("\n", " ")[:200]
+        tags = "".join(f" #{tag}" for tag in self.db_manager.get_prompt_tags(prompt.id))
+        item.setText(f"{body_display} [{prompt.usage_count}]{tags}")
+        item.setData(Qt.ItemDataRole.UserRole, (prompt.id, prompt.body))
+        item.setData(SortKeyRole, (-prompt.usage_count, prompt.created_at))
+
+    def _insert_prompt(self, row: int, prompt):
+        """Insert a prompt row, keeping visual separators between prompts."""
+        item = QListWidgetItem()
+        self._set_item_prompt(item, prompt)
+
+        if self.list.count() == 0:
             self.list.addItem(item)
+        elif row >= self.list.count():
+            self.list.addItem(self._make_separator())
+            self.list.addItem(item)
+        else:
+            self.list.insertItem(row, self._make_separator())
+            self.list.insertItem(row, item)
+
+        self._items[prompt.id] = item
+
+    def _remove_prompt(self, prompt_id: str):
+        item = self._items.pop(prompt_id, None)
+        if item is None:
+            return
+
+        row = self.list.row(item)
+        self.list.takeItem(row)
+        # Drop the separator that belonged to the removed row
+        if row > 0:
+            self.list.takeItem(row - 1)
+        elif self.list.count() > 0:
+            self.list.takeItem(0)
+        # Later pages shift up by one row
+        self._offset = max(0, self._offset - 1)
+
+    def _sorted_row(self, prompt) -> int | None:
+        """Get the list row a prompt belongs at in display order.
+
+        Returns None when it sorts after the loaded rows of an unfinished
+        listing, where a later page will bring it in.
+        """
+        key = (-prompt.usage_count, prompt.created_at)
+        # Prompts sit on even rows, each followed by its separator
+        for row in range(0, self.list.count(), 2):
+            if self.list.item(row).data(SortKeyRole) > key:
+                return row
+        return self.list.count() if self._exhausted else None
 
     def _on_add(self):
         dialog = AddPromptDialog(self.db_manager, self)
-        if dialog.exec():
-            self._load_prompts()
+        if not (dialog.exec() and dialog.prompt_id):
+            return
+        prompt = self.db_manager.get_prompt(dialog.prompt_id)
+        if not prompt or not self.db_manager.prompt_matches(
+            prompt.id, self.filter_edit.text()
+        ):
+            return
+        row = self._sorted_row(prompt)
+        if row is None:
+            return
+        self._insert_prompt(row, prompt)
+        # Later pages shift down by one row
+        self._offset += 1
+        self.list.setCurrentItem(self._items[prompt.id])
 
     def _on_edit(self):
         current = self.list.currentItem()
@@ -85,35 +223,259 @@ class PromptManagerWindow(QDialog):
         prompt_id, body = data
         dialog = EditPromptDialog(self.db_manager, prompt_id, body, self)
         if dialog.exec():
-            self._load_prompts()
+            prompt = self.db_manager.get_prompt(prompt_id)
+            if prompt:
+                self._set_item_prompt(current, prompt)
+            else:
+                self._remove_prompt(prompt_id)
+
+    def _selected_ids(self) -> list[str]:
+        """Get the ids of selected prompts in list order."""
+        items = sorted(self.list.selectedItems(), key=self.list.row)
+        return [
+            data[0]
+            for data in (item.data(Qt.ItemDataRole.UserRole) for item in items)
+            if data is not None
+        ]
+
+    def _run_bulk(self, label: str, operation, prompt_ids: list[str], *args) -> bool:
+        """Run a bulk database operation with a progress readout.
+
+        The list is reloaded once at the end. Returns False on failure.
+        """
+        progress = QProgressDialog(label, None, 0, len(prompt_ids), self)
+        progress.setWindowTitle("Please Wait")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.setValue(0)
+        try:
+            count = operation(
+                prompt_ids,
+                *args,
+                progress=lambda done, total: progress.setValue(done),
+            )
+        except Exception as e:
+            logger.error(
+                "Bulk operation failed via manager",
+                operation=operation.__name__,
+                prompts_count=len(prompt_ids),
+                error=str(e),
+            )
+            QMessageBox.critical(self, "Error", f"{label} failed: {e}")
+            return False
+        finally:
+            progress.close()
+        logger.info(
+            "Bulk operation completed via manager",
+            operation=operation.__name__,
+            prompts_count=count,
+        )
+        self._load_prompts()
+        return True
 
     def _on_delete(self):
-        current = self.list.currentItem()
-        if not current:
+        prompt_ids = self._selected_ids()
+        if not prompt_ids:
             QMessageBox.warning(self, "Warning", "Select a prompt to delete.")
             return
 
-        data = current.data(Qt.ItemDataRole.UserRole)
-        if data is None:  # Skip separator
-            QMessageBox.warning(self, "Warning", "Select a prompt to delete.")
+        message = (
+            "Are you sure you want to delete this prompt?"
+            if len(prompt_ids) == 1
+            else f"Are you sure you want to delete {len(prompt_ids)} prompts?"
+        )
+        reply = QMessageBox.question(
+            self,
+            "Confirm Delete",
+            message,
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        if len(prompt_ids) > 1:
+            self._run_bulk(
+                "Deleting prompts...", self.db_manager.delete_prompts, prompt_ids
+            )
+            return
+
+        prompt_id = prompt_ids[0]
+        try:
+            self.db_manager.delete_prompt(prompt_id)
+            logger.info("Prompt deleted via manager", prompt_id=prompt_id)
+            self._remove_prompt(prompt_id)
+        except Exception as e:
+            logger.error(
+                "Failed to delete prompt via manager",
+                prompt_id=prompt_id,
+                error=str(e),
+            )
+            QMessageBox.critical(self, "Error", f"Failed to delete prompt: {e}")
+
+    def _on_tags(self):
+        prompt_ids = self._selected_ids()
+        if not prompt_ids:
+            QMessageBox.warning(self, "Warning", "Select a prompt to tag.")
+            return
+        if len(prompt_ids) > 1:
+            self._on_bulk_tags(prompt_ids)
+            return
+
+        prompt_id = prompt_ids[0]
+        tags, ok = QInputDialog.getText(
+            self,
+            "Edit Tags",
+            "Tags (comma-separated):",
+            text=", ".join(self.db_manager.get_prompt_tags(prompt_id)),
+        )
+        if not ok:
             return
 
-        prompt_id, _ = data
+        try:
+            self.db_manager.set_prompt_tags(prompt_id, tags.split(","))
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to update tags: {e}")
+            return
+        prompt = self.db_manager.get_prompt(prompt_id)
+        if prompt:
+            self._set_item_prompt(self._items[prompt_id], prompt)
+
+    def _on_bulk_tags(self, prompt_ids: list[str]):
+        """Add or remove tags on several prompts; -tag removes a tag."""
+        tags, ok = QInputDialog.getText(
+            self,
+            "Edit Tags",
+            f"Tags for {len(prompt_ids)} prompts (comma-separated, -tag removes,\n"
+            'e.g. "-inbox, archive" moves them from #inbox to #archive):',
+        )
+        if not ok:
+            return
+        names = [tag.strip() for tag in tags.split(",") if tag.strip()]
+        add = [tag for tag in names if not tag.startswith("-")]
+        remove = [tag[1:] for tag in names if tag.startswith("-")]
+        if add or remove:
+            self._run_bulk(
+                "Updating tags...",
+                self.db_manager.retag_prompts,
+                prompt_ids,
+                add,
+                remove,
+            )
+
+    def _on_reset_usage(self):
+        prompt_ids = self._selected_ids()
+        if not prompt_ids:
+            QMessageBox.warning(self, "Warning", "Select prompts to reset.")
+            return
         reply = QMessageBox.question(
             self,
-            "Confirm Delete",
-            "Are you sure you want to delete this prompt?",
+            "Confirm Reset",
+            f"Reset the usage count of {len(prompt_ids)} prompt(s) to zero?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
         )
         if reply == QMessageBox.StandardButton.Yes:
-            try:
-                self.db_manager.delete_prompt(prompt_id)
-                logger.info("Prompt deleted via manager", prompt_id=prompt_id)
-                self._load_prompts()
-            except Exception as e:
-                logger.error(
-                    "Failed to delete prompt via manager",
-                    prompt_id=prompt_id,
-                    error=str(e),
-                )
-                QMessageBox.critical(self, "Error", f"Failed to delete prompt: {e}")
+            self._run_bulk(
+                "Resetting usage counts...", self.db_manager.reset_usage, prompt_ids
+            )
+
+    def _on_duplicates(self):
+        dialog = DuplicatesDialog(self.db_manager, self, self.db_executor)
+        dialog.exec()
+        if dialog.merged:
+            self._load_prompts()
+
+    def _on_import(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Prompts", "", "JSON files (*.json)"
+        )
+        if not path:
+            return
+
+        try:
+            added = import_prompts(self.db_manager, Path(path))
+        except Exception as e:
+            logger.error("Failed to import prompts", path=path, error=str(e))
+            QMessageBox.critical(self, "Error", f"Failed to import prompts: {e}")
+            return
+
+        if added:
+            self._load_prompts()
+        QMessageBox.information(self, "Import Complete", f"Imported {added} prompt(s).")
+
+    def _on_export(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Prompts",
+            "prompts.json",
+            f"JSON files (*.json);;Read-only prompt packs (*{PACK_SUFFIX})",
+        )
+        if not path:
+            return
+
+        try:
+            if Path(path).suffix == PACK_SUFFIX:
+                exported = export_pack(self.db_manager, Path(path))
+            else:
+                exported = export_prompts(self.db_manager, Path(path))
+        except Exception as e:
+            logger.error("Failed to export prompts", path=path, error=str(e))
+            QMessageBox.critical(self, "Error", f"Failed to export prompts: {e}")
+            return
+        QMessageBox.information(
+            self, "Export Complete", f"Exported {exported} prompt(s)."
+        )
+
+    def _on_sync(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Sync With Database",
+            str(Path(self.db_manager.db_path).parent),
+            "Prompt databases (*.db);;All files (*)",
+        )
+        if not path:
+            return
+        if Path(path).resolve() == Path(self.db_manager.db_path).resolve():
+            QMessageBox.warning(self, "Warning", "Select a different database file.")
+            return
+
+        try:
+            pulled, pushed = sync_databases(self.db_manager, Path(path))
+        except Exception as e:
+            logger.error("Failed to sync databases", other_path=path, error=str(e))
+            QMessageBox.critical(self, "Error", f"Failed to sync databases: {e}")
+            return
+
+        if pulled:
+            self._load_prompts()
+        QMessageBox.information(
+            self,
+            "Sync Complete",
+            f"Received {pulled} change(s), sent {pushed} change(s).",
+        )
+
+    def _on_restore(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Restore Backup",
+            str(settings.backup.dir),
+            "Backups (*.db.gz)",
+        )
+        if not path:
+            return
+
+        reply = QMessageBox.question(
+            self,
+            "Confirm Restore",
+            "Replace all prompts with the contents of this backup?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        try:
+            restore_snapshot(self.db_manager, Path(path), self.db_executor)
+        except Exception as e:
+            logger.error("Failed to restore backup", snapshot=path, error=str(e))
+            QMessageBox.critical(self, "Error", f"Failed to restore backup: {e}")
+            return
+        self._load_prompts()
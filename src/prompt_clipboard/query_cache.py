@@ -0,0 +1,88 @@
+"""
+LRU cache of search results for incremental typing.
+
+Each entry maps a normalized query (the sorted set of lower-cased words) to
+the full ordered list of matching prompt ids. Entries are tagged with the
+library generation and dropped as soon as the library changes.
+
+Because a prompt matches when it contains every query word, a query whose
+words each contain some word of an earlier query can only match a subset of
+that earlier result. Such queries are answered by filtering the cached
+candidates instead of scanning the whole table.
+
+The overlay searches on the database executor while the prompt manager
+filters on the GUI thread, so every method holds the cache's lock.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+def normalize_query(words) -> tuple[str, ...]:
+    """Build the cache key for a list of lower-cased query words."""
+    return tuple(sorted(set(words)))
+
+
+def _narrows(key: tuple[str, ...], base: tuple[str, ...]) -> bool:
+    """Check whether results for key are a subset of results for base."""
+    return all(any(old in new for new in key) for old in base)
+
+
+class QueryCache:
+    """Generation-tagged LRU cache of query -> matching prompt ids."""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generation = None
+        self._lock = threading.Lock()
+
+    def _sync(self, generation: int):
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+
+    def get(self, key: tuple[str, ...], generation: int) -> list[str] | None:
+        """Return cached ids for an exact query match."""
+        with self._lock:
+            self._sync(generation)
+            ids = self._entries.get(key)
+            if ids is not None:
+                self._entries.move_to_end(key)
+            return ids
+
+    def find_base(self, key: tuple[str, ...], generation: int) -> list[str] | None:
+        """Return the smallest cached result that is a superset of key's result."""
+        with self._lock:
+            self._sync(generation)
+            best_key = None
+            best_ids = None
+            for cached_key, ids in self._entries.items():
+                if (best_ids is None or len(ids) < len(best_ids)) and _narrows(
+                    key, cached_key
+                ):
+                    best_key, best_ids = cached_key, ids
+            if best_key is not None:
+                self._entries.move_to_end(best_key)
+            return best_ids
+
+    def put(self, key: tuple[str, ...], ids: list[str], generation: int):
+        with self._lock:
+            self._sync(generation)
+            self._entries[key] = ids
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def shrink(self, max_entries: int):
+        """Drop all but the max_entries most recently used entries."""
+        with self._lock:
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,144 @@
+"""
+Quick slots: global hotkeys bound to a prompt, a prompt bundle or a query.
+
+Slots are kept in the "quick_slots" setting as a JSON object mapping a hotkey
+to its target:
+
+    {
+        "Ctrl+Alt+1": "prompt:<prompt id>",
+        "Ctrl+Alt+2": "bundle:<prompt id>,<prompt id>",
+        "Ctrl+Alt+3": "query:#work uses:>5"
+    }
+
+Prompt and bundle slots copy without opening the overlay. Their text is
+rendered ahead of time and, after a prompt change, refreshed on the next use
+of the slot, so a key press usually only puts a ready string on the
+clipboard. Slots whose prompts have template
+variables are rendered on press, since the values depend on the moment.
+A query slot opens the overlay with the query typed in.
+"""
+
+import json
+
+from prompt_clipboard.config.logging import logger
+from prompt_clipboard.database import DatabaseManager
+from prompt_clipboard.templates import TemplateCache
+
+SLOTS_SETTING = "quick_slots"
+
+PROMPT_TARGET = "prompt:"
+BUNDLE_TARGET = "bundle:"
+QUERY_TARGET = "query:"
+
+
+def load_slot_targets(value: str | None) -> dict[str, str]:
+    """Parse the quick_slots setting into {hotkey: target}."""
+    if not value:
+        return {}
+    try:
+        data = json.loads(value)
+    except ValueError as e:
+        logger.error("Invalid quick slots setting", error=str(e))
+        return {}
+    if not isinstance(data, dict):
+        logger.error("Quick slots setting must be a JSON object")
+        return {}
+    return {str(hotkey): str(target) for hotkey, target in data.items()}
+
+
+class QuickSlot:
+    """A bound hotkey and the text it copies."""
+
+    __slots__ = ("hotkey", "prompt_ids", "query", "prompts", "text")
+
+    def __init__(self, hotkey: str, target: str):
+        self.hotkey = hotkey
+        self.prompt_ids = []
+        self.query = None
+        if target.startswith(QUERY_TARGET):
+            self.query = target[len(QUERY_TARGET) :]
+        elif target.startswith(PROMPT_TARGET):
+            self.prompt_ids = [target[len(PROMPT_TARGET) :].strip()]
+        elif target.startswith(BUNDLE_TARGET):
+            ids = target[len(BUNDLE_TARGET) :].split(",")
+            self.prompt_ids = [pid.strip() for pid in ids if pid.strip()]
+        else:
+            raise ValueError(f"Unknown quick slot target: {target}")
+        self.prompts = []  # [(prompt_id, body)] in bundle order
+        self.text = None  # Rendered text, or None if it depends on variables
+
+
+class QuickSlots:
+    """Bound quick slots with their copy text kept ready."""
+
+    def __init__(self, db_manager: DatabaseManager, templates: TemplateCache):
+        self.db_manager = db_manager
+        self.templates = templates
+        self._targets = {}  # {hotkey: target}, as stored in the setting
+        self._slots = {}  # {hotkey: QuickSlot}
+        # Hotkeys of slots whose prompts changed; listeners run on the writer's
+        # thread, so the refresh is left to get() on the GUI thread
+        self._stale = set()
+        db_manager.add_listener(self._on_prompt_changed)
+
+    def load(self, value: str | None):
+        """Rebuild the slots from the quick_slots setting value."""
+        slots = {}
+        targets = load_slot_targets(value)
+        for hotkey, target in targets.items():
+            try:
+                slot = QuickSlot(hotkey, target)
+            except ValueError as e:
+                logger.error("Invalid quick slot", hotkey=hotkey, error=str(e))
+                continue
+            self._refresh(slot)
+            slots[hotkey] = slot
+        self._targets = targets
+        self._slots = slots
+        self._stale = set()
+        logger.info("Quick slots loaded", slots_count=len(slots))
+
+    def get(self, hotkey: str) -> QuickSlot | None:
+        slot = self._slots.get(hotkey)
+        if slot is not None and hotkey in self._stale:
+            self._stale.discard(hotkey)
+            self._refresh(slot)
+        return slot
+
+    def prompt_ids(self) -> set[str]:
+        """Get the ids of all prompts bound to a slot."""
+        return {pid for slot in self._slots.values() for pid in slot.prompt_ids}
+
+    def bound(self, hotkey: str, target: str | None) -> str:
+        """Get the setting value with hotkey bound to target (None unbinds)."""
+        targets = dict(self._targets)
+        if target is None:
+            targets.pop(hotkey, None)
+        else:
+            QuickSlot(hotkey, target)  # Validate before saving
+            targets[hotkey] = target
+        return json.dumps(targets, ensure_ascii=False)
+
+    def _refresh(self, slot: QuickSlot):
+        if slot.query is not None:
+            return
+        prompts = self.db_manager.get_prompts(slot.prompt_ids)
+        slot.prompts = [(prompt.id, prompt.body) for prompt in prompts]
+        compiled = [self.templates.get(pid, body) for pid, body in slot.prompts]
+        if all(template.is_static for template in compiled):
+            slot.text = "\n".join(template.render({}) for template in compiled)
+        else:
+            slot.text = None
+        if len(slot.prompts) < len(slot.prompt_ids):
+            logger.warning(
+                "Quick slot prompts missing",
+                hotkey=slot.hotkey,
+                missing_count=len(slot.prompt_ids) - len(slot.prompts),
+            )
+
+    def _on_prompt_changed(self, event: str, pid: str | None):
+        if event not in ("updated", "deleted", "reset"):
+            return
+        for slot in list(self._slots.values()):
+            if pid is None or pid in slot.prompt_ids:
+                self._stale.add(slot.hotkey)
@@ -0,0 +1,61 @@
+"""
+Compact encoding of prompt revisions.
+
+Each revision is stored either as a full snapshot or as a delta against the
+previous revision, both zlib-compressed. A delta is a list of operations over
+word/whitespace tokens of the previous body:
+
+    [[start, end], "inserted text", [start, end], ...]
+
+where a [start, end] pair copies tokens start..end of the previous body and a
+string is inserted verbatim. Deltas therefore grow with the size of an edit,
+not the size of the prompt. A snapshot is written every SNAPSHOT_INTERVAL
+revisions so rebuilding any revision applies a bounded number of deltas.
+"""
+
+import difflib
+import json
+import re
+import zlib
+
+# Maximum number of deltas between two snapshots
+SNAPSHOT_INTERVAL = 20
+
+_TOKEN_RE = re.compile(r"\S+|\s+")
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text)
+
+
+def encode_snapshot(body: str) -> bytes:
+    return zlib.compress(body.encode("utf-8"))
+
+
+def decode_snapshot(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+def encode_delta(old: str, new: str) -> bytes:
+    """Encode new as copy/insert operations over the tokens of old."""
+    old_tokens = _tokens(old)
+    new_tokens = _tokens(new)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, old_tokens, new_tokens)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif tag in ("replace", "insert"):
+            ops.append("".join(new_tokens[j1:j2]))
+    return zlib.compress(json.dumps(ops, ensure_ascii=False).encode("utf-8"))
+
+
+def apply_delta(old: str, data: bytes) -> str:
+    old_tokens = _tokens(old)
+    parts = []
+    for op in json.loads(zlib.decompress(data)):
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(old_tokens[op[0] : op[1]])
+    return "".join(parts)
@@ -0,0 +1,128 @@
+"""
+Search query language.
+
+A query is a list of space-separated clauses, all of which must hold:
+
+    word          body contains the word (case-insensitive)
+    "some phrase" body contains the phrase
+    #tag          prompt has the tag
+    uses:>10      usage count filter (<, <=, >, >=, = or bare value)
+    created:<2026-01-01
+                  creation date filter; partial dates match by prefix,
+                  e.g. created:2026-03 is all of March
+    len:<500      body length filter
+    -clause       negates any of the above, e.g. -draft, -#old, -uses:0
+
+Clauses with an unknown field name or an invalid value are searched as plain
+words, so URLs and "key:value" text keep working.
+"""
+
+import re
+
+# Fields answered by SQL predicates on indexed columns
+SQL_FIELDS = ("uses", "created")
+# Fields checked in memory against the search body index
+MEMORY_FIELDS = ("len",)
+
+# Upper bound for prefix comparisons on ISO date strings
+PREFIX_END = "\uffff"
+
+_CLAUSE_RE = re.compile(r'(-?)(?:"([^"]*)"?|(\S+))')
+_FIELD_RE = re.compile(r"^(uses|created|len):(<=|>=|<|>|=)?(.+)$")
+_DATE_RE = re.compile(r"^\d{4}(-\d{2}(-\d{2}([t ][\d:.]+)?)?)?$")
+
+
+class Filter:
+    """Comparison of a prompt attribute against a value."""
+
+    def __init__(self, field: str, op: str, value, negated: bool = False):
+        self.field = field
+        self.op = op
+        self.value = value
+        self.negated = negated
+
+    def __repr__(self):
+        return (
+            f"Filter({'-' if self.negated else ''}{self.field}{self.op}{self.value!r})"
+        )
+
+    def matches(self, actual) -> bool:
+        """Check a count, or an ISO date string for created:, against the filter."""
+        op, value = self.op, self.value
+        if self.field == "created":
+            # Partial ISO dates compare as prefixes: created:<=2026-03 includes March
+            if op == "=":
+                return (value <= actual < value + PREFIX_END) != self.negated
+            if op in ("<=", ">"):
+                value += PREFIX_END
+                op = "<" if op == "<=" else ">="
+        result = {
+            "<": actual < value,
+            "<=": actual <= value,
+            ">": actual > value,
+            ">=": actual >= value,
+            "=": actual == value,
+        }[op]
+        return result != self.negated
+
+
+class SearchQuery:
+    """Parsed query; text clauses are lower-cased."""
+
+    def __init__(self):
+        self.terms = []  # words and phrases that must be present
+        self.excluded = []  # words and phrases that must be absent
+        self.tags = []
+        self.excluded_tags = []
+        self.filters = []
+
+    def __bool__(self):
+        return bool(
+            self.terms
+            or self.excluded
+            or self.tags
+            or self.excluded_tags
+            or self.filters
+        )
+
+    def __repr__(self):
+        return (
+            f"SearchQuery(terms={self.terms}, excluded={self.excluded}, "
+            f"tags={self.tags}, excluded_tags={self.excluded_tags}, "
+            f"filters={self.filters})"
+        )
+
+
+def _parse_filter(text: str, negated: bool) -> Filter | None:
+    match = _FIELD_RE.match(text)
+    if match is None:
+        return None
+    field, op, value = match.group(1), match.group(2) or "=", match.group(3)
+    if field == "created":
+        if not _DATE_RE.match(value):
+            return None
+        return Filter(field, op, value.upper().replace(" ", "T"), negated)
+    if not value.isdigit():
+        return None
+    return Filter(field, op, int(value), negated)
+
+
+def parse_query(text: str) -> SearchQuery:
+    query = SearchQuery()
+    for negation, phrase, word in _CLAUSE_RE.findall(text.lower()):
+        negated = bool(negation)
+        if not word:
+            if phrase.strip():
+                (query.excluded if negated else query.terms).append(phrase)
+            continue
+
+        if word.startswith("#") and len(word) > 1:
+            (query.excluded_tags if negated else query.tags).append(word)
+            continue
+
+        query_filter = _parse_filter(word, negated)
+        if query_filter is not None:
+            query.filters.append(query_filter)
+        else:
+            (query.excluded if negated else query.terms).append(word)
+    return query
@@ -0,0 +1,109 @@
+"""
+Unified, cached settings store.
+
+User preferences are layered, lowest priority first:
+- built-in defaults
+- the JSON settings file (settings.app.settings_file)
+- the Setting table in the database (values saved from the UI)
+- environment / .env overrides (PROMPT_CLIPBOARD__PREFERENCES__<KEY>)
+
+All layers are read once and merged into a dict, so reads on hot paths are a
+dict lookup. Writes go through to SQLite and emit `changed` so components can
+react without polling.
+"""
+
+import json
+
+from PySide6.QtCore import QObject, Signal
+
+from prompt_clipboard.config import settings
+from prompt_clipboard.config.logging import logger
+from prompt_clipboard.database import DatabaseManager
+
+DEFAULTS = {
+    "hotkey": "Ctrl+Alt+I",
+    "search_limit": "50",
+    "similar_limit": "3",
+    "bundle_limit": "3",
+    "bundle_min_support": "3",
+    "quick_slots": "{}",
+}
+
+
+def _read_settings_file(path) -> dict[str, str]:
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        # Structured values such as quick_slots are kept as JSON text
+        return {
+            str(key): value if isinstance(value, str) else json.dumps(value)
+            for key, value in data.items()
+        }
+    except Exception as e:
+        logger.error("Failed to read settings file", path=str(path), error=str(e))
+        return {}
+
+
+class SettingsStore(QObject):
+    """In-memory view of all settings layers with write-through to the database."""
+
+    changed = Signal(str, str)  # key, new effective value
+
+    def __init__(self, db_manager: DatabaseManager):
+        super().__init__()
+        self.db_manager = db_manager
+        self._file_values = {}
+        self._db_values = {}
+        self._env_values = {}
+        self._values = {}
+        self.reload()
+
+    def _merge(self) -> dict[str, str]:
+        return {
+            **DEFAULTS,
+            **self._file_values,
+            **self._db_values,
+            **self._env_values,
+        }
+
+    def reload(self):
+        """Re-read all layers and notify about values that changed."""
+        self._file_values = _read_settings_file(settings.app.settings_file)
+        self._db_values = self.db_manager.get_all_settings()
+        self._env_values = {
+            key.lower(): value for key, value in settings.preferences.items()
+        }
+        old_values, self._values = self._values, self._merge()
+        logger.debug("Settings loaded", keys_count=len(self._values))
+
+        for key, value in self._values.items():
+            if old_values and old_values.get(key) != value:
+                self.changed.emit(key, value)
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        return self._values.get(key, default)
+
+    def get_int(self, key: str, default: int = 0) -> int:
+        try:
+            return int(self._values.get(key, default))
+        except (TypeError, ValueError):
+            logger.warning("Invalid integer setting", key=key, value=self._values[key])
+            return default
+
+    def set(self, key: str, value: str):
+        """Persist a value and notify listeners if the effective value changed."""
+        self.db_manager.set_setting(key, value)
+        self._db_values[key] = value
+
+        if key in self._env_values:
+            logger.warning(
+                "Setting saved but overridden by environment",
+                key=key,
+                effective=self._env_values[key],
+            )
+            return
+
+        if self._values.get(key) != value:
+            self._values[key] = value
+            self.changed.emit(key, value)
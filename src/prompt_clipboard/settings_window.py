@@ -1,4 +1,4 @@
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QDialog,
     QFormLayout,
@@ -8,17 +8,19 @@ from PySide6.QtWidgets import (
 )
 
 from prompt_clipboard.config.logging import logger
-from prompt_clipboard.database import DatabaseManager
+from prompt_clipboard.settings_store import SettingsStore
 
 
 class SettingsWindow(QDialog):
-    """Settings window for configuring application preferences."""
+    """Settings window for configuring application preferences.
 
-    hotkey_changed = Signal(str)
+    Saved values go to the settings store, whose change notifications rebind
+    the hotkey listener without a restart.
+    """
 
-    def __init__(self, db_manager: DatabaseManager, parent=None):
+    def __init__(self, settings_store: SettingsStore, parent=None):
         super().__init__(parent)
-        self.db_manager = db_manager
+        self.settings_store = settings_store
         self._setup_ui()
         self._load_settings()
 
@@ -39,14 +41,12 @@ class SettingsWindow(QDialog):
         layout.addWidget(self.save_button)
 
     def _load_settings(self):
-        hotkey = self.db_manager.get_setting("hotkey", "Ctrl+Alt+I")
-        self.hotkey_edit.setKeySequence(hotkey or "Ctrl+Alt+I")
+        self.hotkey_edit.setKeySequence(self.settings_store.get("hotkey"))
 
     def _save_settings(self):
         hotkey = self.hotkey_edit.keySequence().toString()
         try:
-            self.db_manager.set_setting("hotkey", hotkey)
-            self.hotkey_changed.emit(hotkey)
+            self.settings_store.set("hotkey", hotkey)
             logger.info("Settings saved", hotkey=hotkey)
             self.accept()
         except Exception as e:
@@ -0,0 +1,224 @@
+"""
+Offline "similar prompts" suggestions based on TF-IDF cosine similarity.
+
+Prompt bodies are kept as sparse term-frequency vectors with an inverted index
+(term -> {prompt_id: tf}). Neighbors of a batch of prompts are scored by
+walking only the postings of their terms, so the cost depends on how many
+prompts share vocabulary rather than on library size. Very common terms are
+skipped since they carry almost no weight.
+
+The index is built and then updated per prompt from DatabaseManager change
+notifications, all on the index's own ChangeQueue thread rather than the
+writer's; changes made while a rebuild reads the library are applied after it. Neighbors are cached per prompt;
+a change drops the cached lists it could affect: those of prompts sharing a
+term with the changed prompt or listing it as a neighbor.
+"""
+
+import heapq
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+
+from prompt_clipboard.change_queue import ChangeQueue
+from prompt_clipboard.config.logging import logger
+from prompt_clipboard.database import DatabaseManager
+
+_TOKEN_RE = re.compile(r"\w{2,}")
+
+# Terms present in more than this share of prompts are ignored when scoring
+MAX_DF_RATIO = 0.5
+# Libraries smaller than this are scored with every term
+MAX_DF_MIN_PROMPTS = 100
+# Rebuild norms once the library size drifts this much since the last build
+REBUILD_DRIFT = 0.2
+# Prompts whose neighbor lists are cached
+NEIGHBOR_CACHE_SIZE = 2000
+
+
+def _term_counts(body: str) -> Counter:
+    return Counter(_TOKEN_RE.findall(body.lower()))
+
+
+class SimilarityIndex:
+    """Sparse TF-IDF index answering top-K nearest neighbor queries."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+        self._lock = threading.Lock()
+        self._vectors = {}  # {prompt_id: Counter(term -> tf)}
+        self._postings = defaultdict(dict)  # {term: {prompt_id: tf}}
+        self._norms = {}  # {prompt_id: vector norm}
+        self._built_size = 0
+        self._neighbors = {}  # {prompt_id: [(prompt_id, score)]}, by recent use
+        self._neighbors_params = None  # (k, min_score) of the cached lists
+        self.ready = False
+        self._changes = ChangeQueue("similarity-changes", self._apply_changes)
+        db_manager.add_listener(self._changes.put)
+
+    def start(self):
+        """Build the index on its change queue thread."""
+        self._changes.put("reset", None)
+
+    def rebuild(self):
+        try:
+            rows = self.db_manager.get_prompt_bodies()
+            with self._lock:
+                self._vectors.clear()
+                self._postings.clear()
+                for pid, body in rows:
+                    self._add(pid, body)
+                self._recompute_norms()
+                self._neighbors.clear()
+                self.ready = True
+            logger.info("Similarity index built", prompts_count=len(rows))
+        except Exception as e:
+            logger.error("Failed to build similarity index", error=str(e))
+
+    def _idf(self, term: str) -> float:
+        df = len(self._postings.get(term, ()))
+        return math.log((1 + len(self._vectors)) / (1 + df)) + 1
+
+    def _norm(self, vector: Counter) -> float:
+        return math.sqrt(
+            sum((tf * self._idf(term)) ** 2 for term, tf in vector.items())
+        )
+
+    def _recompute_norms(self):
+        self._norms = {pid: self._norm(vec) for pid, vec in self._vectors.items()}
+        self._built_size = len(self._vectors)
+
+    def _add(self, pid: str, body: str):
+        vector = _term_counts(body)
+        self._vectors[pid] = vector
+        for term, tf in vector.items():
+            self._postings[term][pid] = tf
+
+    def _remove(self, pid: str):
+        vector = self._vectors.pop(pid, None)
+        self._norms.pop(pid, None)
+        if not vector:
+            return
+        for term in vector:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(pid, None)
+                if not postings:
+                    del self._postings[term]
+
+    def _apply_changes(self, changes):
+        """Re-read the bodies of changed prompts; runs on the change queue."""
+        resets = [i for i, (event, _) in enumerate(changes) if event == "reset"]
+        if resets:
+            # Earlier changes are in the rebuilt index; later ones still apply
+            self.rebuild()
+            changes = changes[resets[-1] + 1 :]
+        if not self.ready:
+            return
+        ids = list(
+            dict.fromkeys(
+                pid
+                for event, pid in changes
+                if event in ("added", "updated", "deleted")
+            )
+        )
+        if not ids:
+            return
+
+        # Deleted prompts are simply missing
+        bodies = {prompt.id: prompt.body for prompt in self.db_manager.get_prompts(ids)}
+        with self._lock:
+            for pid in ids:
+                terms = set(self._vectors.get(pid, ()))
+                self._remove(pid)
+                if pid in bodies:
+                    self._add(pid, bodies[pid])
+                    self._norms[pid] = self._norm(self._vectors[pid])
+                    terms.update(self._vectors[pid])
+                self._invalidate(pid, terms)
+            size = len(self._vectors)
+            if abs(size - self._built_size) > REBUILD_DRIFT * max(self._built_size, 1):
+                # IDF weights drifted; refresh all norms
+                self._recompute_norms()
+                self._neighbors.clear()
+
+    def _max_df(self) -> float:
+        """Get the document frequency above which terms are not scored."""
+        size = len(self._vectors)
+        return MAX_DF_RATIO * size if size >= MAX_DF_MIN_PROMPTS else size
+
+    def _invalidate(self, pid: str, terms: set[str]):
+        """Drop cached neighbor lists a change to pid's terms could alter."""
+        max_df = self._max_df()
+        terms = {term for term in terms if len(self._postings.get(term, ())) <= max_df}
+        stale = [
+            other
+            for other, neighbors in self._neighbors.items()
+            if other == pid
+            or any(neighbor == pid for neighbor, _ in neighbors)
+            or not terms.isdisjoint(self._vectors.get(other, ()))
+        ]
+        for other in stale:
+            del self._neighbors[other]
+
+    def similar(
+        self, pids: list[str], k: int = 3, min_score: float = 0.2
+    ) -> dict[str, list[tuple[str, float]]]:
+        """Get up to k most similar prompts for each prompt in a batch."""
+        if not self.ready or k <= 0:
+            return {}
+
+        result = {}
+        with self._lock:
+            if self._neighbors_params != (k, min_score):
+                self._neighbors.clear()
+                self._neighbors_params = (k, min_score)
+            max_df = self._max_df()
+            idf_cache = {}
+            for pid in pids:
+                neighbors = self._neighbors.pop(pid, None)
+                if neighbors is None:
+                    neighbors = self._score(pid, k, min_score, max_df, idf_cache)
+                    if neighbors is None:
+                        continue
+                    if len(self._neighbors) >= NEIGHBOR_CACHE_SIZE:
+                        del self._neighbors[next(iter(self._neighbors))]
+                # Reinserted last, so the least recently used list goes first
+                self._neighbors[pid] = neighbors
+                if neighbors:
+                    result[pid] = neighbors
+        return result
+
+    def _score(
+        self, pid: str, k: int, min_score: float, max_df: float, idf_cache: dict
+    ) -> list[tuple[str, float]] | None:
+        """Score pid's neighbors; None if it is not indexed or has no terms."""
+        vector = self._vectors.get(pid)
+        norm = self._norms.get(pid)
+        if not vector or not norm:
+            return None
+
+        scores = defaultdict(float)
+        for term, tf in vector.items():
+            postings = self._postings.get(term)
+            if not postings or len(postings) > max_df:
+                continue
+            idf = idf_cache.get(term)
+            if idf is None:
+                idf = idf_cache[term] = self._idf(term)
+            weight = tf * idf * idf
+            for other, other_tf in postings.items():
+                scores[other] += weight * other_tf
+        scores.pop(pid, None)
+
+        norms = self._norms
+        top = heapq.nlargest(
+            k,
+            (
+                (other, dot / (norm * norms[other]))
+                for other, dot in scores.items()
+                if norms.get(other)
+            ),
+            key=lambda item: item[1],
+        )
+        return [(other, score) for other, score in top if score >= min_score]
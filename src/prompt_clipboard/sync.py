@@ -0,0 +1,63 @@
+"""
+Incremental sync between prompt database files.
+
+Every DatabaseManager mutation is journaled in ChangeLog with its origin node
+and Lamport clock. Syncing exchanges only the entries each side has not seen
+yet, so its cost scales with the number of changes rather than library size.
+"""
+
+from pathlib import Path
+
+from prompt_clipboard.config.logging import logger
+from prompt_clipboard.database import DatabaseManager
+
+
+def pull_changes(target: DatabaseManager, source: DatabaseManager) -> int:
+    """Replay changes from source that target hasn't seen. Returns the count."""
+    changes = source.get_changes_since(target.get_journal_clocks())
+    return target.apply_changes(changes)
+
+
+def _check_rolled_back(db: DatabaseManager, peer: DatabaseManager):
+    """Move db to a new node if peer has seen more of its node than it has.
+
+    That happens when db was restored from a backup or an older copy: changes
+    journaled under the old node's clocks would be skipped by the peer.
+    """
+    seen = peer.get_journal_clocks().get(db.node_id, 0)
+    own = db.get_journal_clocks().get(db.node_id, 0)
+    if seen > own:
+        logger.warning(
+            "Database is behind its own journal on the peer; starting a new node",
+            db_path=str(db.db_path),
+            clock=own,
+            peer_clock=seen,
+        )
+        db.start_new_node(seen)
+
+
+def sync_databases(local: DatabaseManager, other_path: Path) -> tuple[int, int]:
+    """Merge another database file with the local one in both directions.
+
+    Returns the number of changes pulled and pushed.
+    """
+    other = DatabaseManager(other_path)
+    try:
+        if other.node_id == local.node_id:
+            raise ValueError(
+                "Both databases share the same node id; "
+                "was the file copied instead of synced?"
+            )
+        for db, peer in ((local, other), (other, local)):
+            _check_rolled_back(db, peer)
+        pulled = pull_changes(local, other)
+        pushed = pull_changes(other, local)
+        logger.info(
+            "Databases synced",
+            other_path=str(other_path),
+            pulled=pulled,
+            pushed=pushed,
+        )
+        return pulled, pushed
+    finally:
+        other.engine.dispose()
@@ -0,0 +1,80 @@
+"""
+In-memory bitmap index of prompt tags.
+
+Every tagged prompt gets a bit position and every tag a Python int used as a
+bitset. Filtering by several tags is a chain of bitwise ANDs done in C over
+the whole library, followed by a single decode of the surviving positions.
+"""
+
+
+class TagIndex:
+    """Bitsets of prompt positions, one per tag."""
+
+    def __init__(self):
+        self._positions = {}  # {prompt_id: bit position}
+        self._ids = []  # bit position -> prompt_id
+        self._bitmaps = {}  # {tag name: int bitset}
+        self._tags = {}  # {prompt_id: set of tag names}
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Lower-case a tag name, dropping '#', commas and inner whitespace."""
+        return "-".join(name.replace(",", " ").replace("#", " ").split()).lower()
+
+    def _position(self, pid: str) -> int:
+        position = self._positions.get(pid)
+        if position is None:
+            position = len(self._ids)
+            self._positions[pid] = position
+            self._ids.append(pid)
+        return position
+
+    def set_tags(self, pid: str, tags):
+        """Replace the tags of a prompt."""
+        self.remove(pid)
+        tags = {self.normalize(tag) for tag in tags} - {""}
+        if not tags:
+            return
+        bit = 1 << self._position(pid)
+        for tag in tags:
+            self._bitmaps[tag] = self._bitmaps.get(tag, 0) | bit
+        self._tags[pid] = tags
+
+    def remove(self, pid: str):
+        tags = self._tags.pop(pid, None)
+        if not tags:
+            return
+        bit = 1 << self._positions[pid]
+        for tag in tags:
+            bitmap = self._bitmaps[tag] & ~bit
+            if bitmap:
+                self._bitmaps[tag] = bitmap
+            else:
+                del self._bitmaps[tag]
+
+    def tags_of(self, pid: str) -> list[str]:
+        return sorted(self._tags.get(pid, ()))
+
+    def all_tags(self) -> list[str]:
+        return sorted(self._bitmaps)
+
+    def ids_with_all(self, tags) -> set[str]:
+        """Get ids of prompts carrying every tag."""
+        bitmap = None
+        for tag in tags:
+            tag_bitmap = self._bitmaps.get(self.normalize(tag), 0)
+            bitmap = tag_bitmap if bitmap is None else bitmap & tag_bitmap
+            if not bitmap:
+                return set()
+        if bitmap is None:
+            return set()
+
+        # Decode set bits once; bin() walks the int in C
+        ids = self._ids
+        bits = bin(bitmap)[:1:-1]
+        result = set()
+        position = bits.find("1")
+        while position != -1:
+            result.add(ids[position])
+            position = bits.find("1", position + 1)
+        return result
@@ -0,0 +1,40 @@
+from PySide6.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QFormLayout,
+    QLineEdit,
+)
+
+
+class TemplateFillDialog(QDialog):
+    """Quick-fill dialog for template variables."""
+
+    def __init__(self, names: list[str], default: str = "", parent=None):
+        super().__init__(parent)
+        self._edits = {}
+        self._setup_ui(names, default)
+
+    def _setup_ui(self, names: list[str], default: str):
+        self.setWindowTitle("Fill Template")
+        self.setModal(True)
+        self.setMinimumWidth(400)
+
+        layout = QFormLayout(self)
+        for name in names:
+            edit = QLineEdit(self)
+            # Prefill with the clipboard so the common case is a single Enter
+            edit.setText(default)
+            edit.selectAll()
+            layout.addRow(f"{name}:", edit)
+            self._edits[name] = edit
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel,
+            self,
+        )
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def values(self) -> dict[str, str]:
+        return {name: edit.text() for name, edit in self._edits.items()}
@@ -0,0 +1,97 @@
+"""
+Prompt templates with {{variable}} placeholders.
+
+Prompt bodies are parsed once into a CompiledTemplate (a list of literal and
+variable parts) and cached per prompt id. Rendering only joins the parts, so
+copying large or many prompts never re-scans their bodies.
+"""
+
+import os
+import re
+
+from prompt_clipboard.config.logging import logger
+
+_VARIABLE_RE = re.compile(r"\{\{\s*([\w.-]+)\s*\}\}")
+
+# Variable filled with the current clipboard text
+CLIPBOARD_VARIABLE = "clipboard"
+# Prefix for variables filled from the environment, e.g. {{env.USER}}
+ENV_PREFIX = "env."
+
+
+class CompiledTemplate:
+    """Prompt body split into literal text and variable parts."""
+
+    __slots__ = ("parts", "variables")
+
+    def __init__(self, body: str):
+        # Even indexes hold literal text, odd indexes hold variable names
+        self.parts = _VARIABLE_RE.split(body)
+        self.variables = tuple(dict.fromkeys(self.parts[1::2]))
+
+    @property
+    def is_static(self) -> bool:
+        return not self.variables
+
+    def render(self, values: dict[str, str]) -> str:
+        if self.is_static:
+            return self.parts[0]
+        parts = self.parts.copy()
+        for i in range(1, len(parts), 2):
+            name = parts[i]
+            # Leave unknown placeholders untouched
+            parts[i] = values.get(name, f"{{{{{name}}}}}")
+        return "".join(parts)
+
+
+class TemplateCache:
+    """Compiled templates keyed by prompt id, invalidated on prompt changes."""
+
+    def __init__(self, db_manager=None):
+        self._compiled = {}
+        if db_manager is not None:
+            db_manager.add_listener(self._on_prompt_changed)
+
+    def get(self, pid: str, body: str) -> CompiledTemplate:
+        compiled = self._compiled.get(pid)
+        if compiled is None:
+            compiled = CompiledTemplate(body)
+            self._compiled[pid] = compiled
+        return compiled
+
+    def invalidate(self, pid: str | None = None):
+        if pid is None:
+            self._compiled.clear()
+        else:
+            self._compiled.pop(pid, None)
+
+    def shrink(self, keep_ids):
+        """Drop compiled templates except those of keep_ids."""
+        keep_ids = set(keep_ids)
+        # Copied in one step: invalidate() may run on a writer thread meanwhile
+        items = list(self._compiled.items())
+        self._compiled = {pid: compiled for pid, compiled in items if pid in keep_ids}
+
+    def _on_prompt_changed(self, event: str, pid: str | None):
+        if event in ("updated", "deleted", "reset"):
+            self.invalidate(pid)
+            logger.debug("Template cache invalidated", prompt_id=pid, event=event)
+
+
+def resolve_variables(
+    names, clipboard_text: str = ""
+) -> tuple[dict[str, str], list[str]]:
+    """Fill variables from the clipboard and environment.
+
+    Returns the resolved values and the names that still need user input.
+    """
+    values = {}
+    missing = []
+    for name in names:
+        if name == CLIPBOARD_VARIABLE:
+            values[name] = clipboard_text
+        elif name.startswith(ENV_PREFIX) and name[len(ENV_PREFIX) :] in os.environ:
+            values[name] = os.environ[name[len(ENV_PREFIX) :]]
+        else:
+            missing.append(name)
+    return values, missing
@@ -0,0 +1,113 @@
+import sqlite3
+
+import pytest
+
+from prompt_clipboard.database import COMPACT_JOURNAL_SQL, DatabaseManager
+from prompt_clipboard.sync import pull_changes
+
+
+def sync(a, b):
+    pull_changes(a, b)
+    pull_changes(b, a)
+
+
+@pytest.fixture
+def nodes(tmp_path):
+    """Two databases that have synced one shared prompt."""
+    a = DatabaseManager(tmp_path / "a.db")
+    b = DatabaseManager(tmp_path / "b.db")
+    pid = a.add_prompt("shared prompt")
+    sync(a, b)
+    yield a, b, pid
+    a.close()
+    b.close()
+
+
+def bodies(db):
+    return {p.id: p.body for p in db.get_all_prompts()}
+
+
+def usage(db, pid):
+    return db.get_prompt(pid).usage_count
+
+
+def test_concurrent_edits_converge_on_last_writer(nodes):
+    a, b, pid = nodes
+    a.update_prompt(pid, "edited on a")
+    b.update_prompt(pid, "edited on b")
+    a.set_prompt_tags(pid, ["from-a"])
+    b.set_prompt_tags(pid, ["from-b"])
+
+    sync(a, b)
+
+    # Both edits carry the same clock; the higher node id wins the tie
+    winner = "a" if a.node_id > b.node_id else "b"
+    assert bodies(a) == bodies(b) == {pid: f"edited on {winner}"}
+    assert a.get_prompt_tags(pid) == b.get_prompt_tags(pid) == [f"from-{winner}"]
+
+
+def test_delete_wins_over_concurrent_edit(nodes):
+    a, b, pid = nodes
+    a.delete_prompt(pid)
+    b.update_prompt(pid, "edited on b")
+
+    sync(a, b)
+
+    assert bodies(a) == bodies(b) == {}
+
+
+def test_usage_is_additive_and_idempotent(nodes):
+    a, b, pid = nodes
+    a.increment_usage_many({pid: 2})
+    b.increment_usage_many({pid: 3})
+
+    sync(a, b)
+    sync(a, b)
+
+    assert usage(a, pid) == usage(b, pid) == 5
+
+
+def test_resets_on_both_nodes_do_not_stack(nodes):
+    a, b, pid = nodes
+    a.increment_usage_many({pid: 5})
+    sync(a, b)
+    a.reset_usage([pid])
+    b.reset_usage([pid])
+    b.increment_usage_many({pid: 2})
+
+    sync(a, b)
+
+    assert usage(a, pid) == usage(b, pid) == 2
+
+
+def test_reset_keeps_concurrent_usage(nodes):
+    a, b, pid = nodes
+    a.increment_usage_many({pid: 4})
+    sync(a, b)
+    a.reset_usage([pid])
+    b.increment_usage_many({pid: 1})
+
+    sync(a, b)
+
+    assert usage(a, pid) == usage(b, pid) == 1
+
+
+def test_compacted_journal_syncs_same_usage(nodes, tmp_path):
+    a, b, pid = nodes
+    for _ in range(2):
+        a.increment_usage(pid)
+    sync(a, b)
+    for _ in range(3):
+        a.increment_usage(pid)
+    with sqlite3.connect(a.db_path) as connection:
+        removed = connection.execute(COMPACT_JOURNAL_SQL).rowcount
+    assert removed == 4
+
+    # b has seen two of the increments, c none of them
+    sync(a, b)
+    c = DatabaseManager(tmp_path / "c.db")
+    try:
+        pull_changes(c, a)
+        assert usage(a, pid) == usage(b, pid) == usage(c, pid) == 5
+    finally:
+        c.close()